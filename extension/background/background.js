@@ -15,7 +15,12 @@ const API_ENDPOINTS = {
   chat: '/api/v1/ai/chat',
   query: '/api/v1/ai/query',
   models: '/api/v1/ai/models',
-  health: '/api/v1/utils/health'
+  health: '/api/v1/utils/health',
+  summarize: '/api/v1/ai/summarize',
+  prefetch: '/api/v1/ai/prefetch',
+  commandParse: '/api/v1/command/parse',
+  commandPlan: '/api/v1/command/plan',
+  commandExtract: '/api/v1/command/extract'
 };
 
 console.log('VynceAI Background Service Worker initializing...');
@@ -272,6 +277,10 @@ chrome.runtime.onMessage.addListener((request, sender, sendResponse) => {
       handleSendPrompt(request.payload, sendResponse);
       return true; // Keep channel open for async response
       
+    case 'SUMMARIZE_PAGE':
+      handleSummarizePage(request.payload, sendResponse);
+      return true;
+      
     case 'EXECUTE_COMMAND':
       handleExecuteCommand(request.payload, sendResponse);
       return true;
@@ -304,12 +313,61 @@ chrome.runtime.onMessage.addListener((request, sender, sendResponse) => {
       handleParseAutomationCommand(request.command, sendResponse);
       return true;
       
+    case 'PLAN_AUTOMATION_COMMAND':
+      handlePlanAutomationCommand(request.instruction, sendResponse);
+      return true;
+      
+    case 'EXTRACT_PAGE_DATA':
+      handleExtractPageData(request.payload, sendResponse);
+      return true;
+      
     default:
       console.warn('Unknown message type:', request.type);
       sendResponse({ success: false, error: 'Unknown message type' });
   }
 });
 
+/**
+ * Handle page summarization via the dedicated endpoint
+ * (served from the server cache when the page was prefetched)
+ */
+async function handleSummarizePage(payload, sendResponse) {
+  const { model, context } = payload;
+  
+  try {
+    const response = await fetch(`${API_BASE_URL}${API_ENDPOINTS.summarize}`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json'
+      },
+      body: JSON.stringify({ prompt: 'Summarize this page', model: model, context: context })
+    });
+    
+    if (!response.ok) {
+      throw new Error(`API error: ${response.status} ${response.statusText}`);
+    }
+    
+    const data = await response.json();
+    sendResponse({
+      success: true,
+      data: {
+        response: data.response,
+        model: data.model || model,
+        cached: data.cached,
+        source: data.source,
+        timestamp: Date.now()
+      }
+    });
+    
+  } catch (error) {
+    console.error('Error in handleSummarizePage:', error);
+    sendResponse({
+      success: false,
+      error: error.message || 'Failed to summarize page'
+    });
+  }
+}
+
 /**
  * Handle sending prompt to AI backend with mode-based routing
  */
@@ -672,6 +730,33 @@ async function handleAutomationExecute(command, sendResponse) {
   }
 }
 
+/**
+ * Handle structured extraction for the automation engine's extract action
+ * (runs on the backend without an LLM call)
+ */
+async function handleExtractPageData(payload, sendResponse) {
+  try {
+    const response = await fetch(`${API_BASE_URL}${API_ENDPOINTS.commandExtract}`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json'
+      },
+      body: JSON.stringify({ pageContent: payload.pageContent, targets: [payload.target] })
+    });
+
+    if (!response.ok) {
+      throw new Error(`API error: ${response.status} ${response.statusText}`);
+    }
+
+    sendResponse(await response.json());
+  } catch (error) {
+    sendResponse({
+      success: false,
+      error: error.message
+    });
+  }
+}
+
 /**
  * Handle automation command parsing request
  */
@@ -691,46 +776,89 @@ async function handleParseAutomationCommand(command, sendResponse) {
 }
 
 /**
- * Parse automation command using AI
+ * Parse automation command on the backend
+ * (grammar first; the backend only falls back to the LLM when needed)
  */
 async function parseAutomationCommand(command) {
   try {
-    const prompt = `Parse this automation command into a JSON structure with 'action' and 'params' fields.
-
-Supported actions:
-- youtube_search: params should have 'query'
-- google_form_fill: params should have 'formData' object with key-value pairs
-- submit_form: no params needed
-- click: params should have 'selector' (element to click)
-- fill: params should have 'selector' and 'value'
-
-Command: "${command}"
-
-Respond ONLY with valid JSON, no explanation.`;
-
-    const response = await callBackend('general', prompt);
-    
-    if (response.success && response.text) {
-      try {
-        // Try to extract JSON from response
-        const jsonMatch = response.text.match(/\{[\s\S]*\}/);
-        if (jsonMatch) {
-          const parsed = JSON.parse(jsonMatch[0]);
-          return parsed;
-        }
-      } catch (e) {
-        console.error('Failed to parse AI response as JSON:', e);
-      }
+    const response = await fetch(`${API_BASE_URL}${API_ENDPOINTS.commandParse}`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json'
+      },
+      body: JSON.stringify({ command: command })
+    });
+
+    if (!response.ok) {
+      throw new Error(`API error: ${response.status} ${response.statusText}`);
+    }
+
+    const data = await response.json();
+    if (data.success && data.action) {
+      return {
+        action: data.action,
+        params: data.params || {},
+        originalCommand: command,
+        confidence: data.confidence
+      };
     }
 
     return null;
 
   } catch (error) {
-    console.error('AI command parsing error:', error);
+    console.error('Command parsing error:', error);
     return null;
   }
 }
 
+/**
+ * Handle multi-step automation planning request
+ */
+async function handlePlanAutomationCommand(instruction, sendResponse) {
+  try {
+    const plan = await planAutomationCommand(instruction);
+    sendResponse(plan);
+  } catch (error) {
+    sendResponse({
+      success: false,
+      error: error.message
+    });
+  }
+}
+
+/**
+ * Plan a compound instruction (or list of instructions) on the backend
+ * in one round trip; returns ordered, validated steps
+ */
+async function planAutomationCommand(instruction) {
+  const response = await fetch(`${API_BASE_URL}${API_ENDPOINTS.commandPlan}`, {
+    method: 'POST',
+    headers: {
+      'Content-Type': 'application/json'
+    },
+    body: JSON.stringify({ instruction: instruction })
+  });
+
+  if (!response.ok) {
+    throw new Error(`API error: ${response.status} ${response.statusText}`);
+  }
+
+  const data = await response.json();
+  return {
+    success: data.success,
+    steps: (data.steps || []).map(step => ({
+      action: step.action,
+      params: step.params || {},
+      originalCommand: step.text,
+      confidence: step.confidence,
+      valid: step.valid,
+      error: step.error
+    })),
+    cached: data.cached,
+    error: data.error
+  };
+}
+
 /**
  * Execute automation command on active tab
  */
@@ -840,3 +968,57 @@ chrome.commands.onCommand.addListener((command) => {
 
 console.log('✅ Keyboard shortcut listener registered (Alt+A)');
 
+// ============================================
+// PAGE PREFETCH
+// ============================================
+
+const PREFETCH_MIN_INTERVAL_MS = 30000;
+const PREFETCH_SUMMARIES_KEY = 'vynceai_prefetch_summaries';
+const lastPrefetch = new Map(); // url -> timestamp
+
+/**
+ * Report loaded pages to the backend so their summary is ready before
+ * the user asks (fire-and-forget; the server queues it at low priority).
+ * Off unless enabled in settings: page content leaves the browser.
+ */
+chrome.tabs.onUpdated.addListener(async (tabId, changeInfo, tab) => {
+  if (changeInfo.status !== 'complete' || !tab.url || !tab.url.startsWith('http')) {
+    return;
+  }
+  
+  const result = await chrome.storage.local.get([PREFETCH_SUMMARIES_KEY]);
+  if (!result[PREFETCH_SUMMARIES_KEY]) {
+    return;
+  }
+  
+  const now = Date.now();
+  if (now - (lastPrefetch.get(tab.url) || 0) < PREFETCH_MIN_INTERVAL_MS) {
+    return;
+  }
+  if (lastPrefetch.size > 500) {
+    lastPrefetch.clear();
+  }
+  lastPrefetch.set(tab.url, now);
+  
+  // Same extraction as the summarize button, so the content hashes match
+  chrome.tabs.sendMessage(tabId, { action: 'summarizePage' }, (pageData) => {
+    if (chrome.runtime.lastError || !pageData || !pageData.content) {
+      return;
+    }
+    
+    fetch(`${API_BASE_URL}${API_ENDPOINTS.prefetch}`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json'
+      },
+      body: JSON.stringify({
+        context: {
+          url: pageData.url,
+          title: pageData.title,
+          pageContent: pageData.content
+        },
+        summarize: true
+      })
+    }).catch((error) => console.debug('Prefetch skipped:', error.message));
+  });
+});
@@ -526,6 +526,122 @@ class AutomationEngine {
       };
     }
   }
+
+  /**
+   * Scroll the page by direction, to the top/bottom or to an element
+   * @param {Object} params - {direction: 'up'|'down', amount?: number} | {to: 'top'|'bottom'} | {selector}
+   * @returns {Promise<Object>}
+   */
+  async scrollAction(params) {
+    try {
+      console.log('[Automation] Scrolling:', params);
+
+      if (params.to) {
+        const top = params.to === 'top' ? 0 : document.documentElement.scrollHeight;
+        window.scrollTo({ top: top, behavior: 'smooth' });
+        return { success: true, message: `Scrolled to ${params.to}`, action: 'scroll' };
+      }
+
+      if (params.direction) {
+        const amount = params.amount || Math.round(window.innerHeight * 0.8);
+        window.scrollBy({ top: params.direction === 'up' ? -amount : amount, behavior: 'smooth' });
+        return { success: true, message: `Scrolled ${params.direction}`, action: 'scroll' };
+      }
+
+      let element = null;
+      try {
+        element = document.querySelector(params.selector);
+      } catch (selectorError) {
+        // Not a CSS selector, match by text below
+      }
+
+      // Try finding a heading or landmark by text content
+      if (!element) {
+        const candidates = Array.from(document.querySelectorAll('h1, h2, h3, h4, section, [id]'));
+        element = candidates.find(el =>
+          (el.textContent || el.id || '').toLowerCase().includes(params.selector.toLowerCase())
+        );
+      }
+
+      if (element) {
+        element.scrollIntoView({ behavior: 'smooth', block: 'start' });
+        return { success: true, message: `Scrolled to ${params.selector}`, action: 'scroll' };
+      }
+
+      return { success: false, message: `Element not found: ${params.selector}`, action: 'scroll' };
+
+    } catch (error) {
+      console.error('[Automation] Scroll action failed:', error);
+      return {
+        success: false,
+        message: `Failed to scroll: ${error.message}`,
+        error: error.message
+      };
+    }
+  }
+
+  /**
+   * Navigate back/forward, reload, or open a URL in this tab
+   * @param {Object} params - {direction: 'back'|'forward'|'reload'} | {url}
+   * @returns {Promise<Object>}
+   */
+  async navigateAction(params) {
+    console.log('[Automation] Navigating:', params);
+
+    // Navigate after responding: the page (and this script) goes away
+    const go = {
+      back: () => window.history.back(),
+      forward: () => window.history.forward(),
+      reload: () => window.location.reload()
+    }[params.direction] || (() => { window.location.href = params.url; });
+    setTimeout(go, 100);
+
+    return {
+      success: true,
+      message: params.url ? `Opening ${params.url}` : `Navigating ${params.direction}`,
+      action: 'navigate'
+    };
+  }
+
+  /**
+   * Extract emails, phones, links, dates, prices or tables from the page
+   * (extracted on the backend, without an LLM call)
+   * @param {string} target - Extract target
+   * @returns {Promise<Object>}
+   */
+  async extractAction(target) {
+    try {
+      console.log('[Automation] Extracting:', target);
+
+      const response = await chrome.runtime.sendMessage({
+        type: 'EXTRACT_PAGE_DATA',
+        payload: { target: target, pageContent: document.body.innerText }
+      });
+
+      if (!response || !response.success) {
+        return {
+          success: false,
+          message: `Failed to extract ${target}: ${response?.error || 'Unknown error'}`,
+          action: 'extract'
+        };
+      }
+
+      return {
+        success: true,
+        message: `Found ${response.counts[target] || 0} ${target}`,
+        action: 'extract',
+        results: response.results[target] || []
+      };
+
+    } catch (error) {
+      console.error('[Automation] Extract action failed:', error);
+      return {
+        success: false,
+        message: `Failed to extract: ${error.message}`,
+        error: error.message
+      };
+    }
+  }
 }
 
 // Store in window to prevent re-declaration
@@ -577,6 +693,15 @@ if (typeof window.automationEngine === 'undefined') {
       case 'fill':
         return await window.automationEngine.fillAction(params.selector, params.value);
 
+      case 'scroll':
+        return await window.automationEngine.scrollAction(params);
+
+      case 'navigate':
+        return await window.automationEngine.navigateAction(params);
+
+      case 'extract':
+        return await window.automationEngine.extractAction(params.target);
+
       default:
         return {
           success: false,
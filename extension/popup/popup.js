@@ -1922,25 +1922,12 @@ async function handleSummarizePage(event) {
     // Show loading message
     const loadingId = addLoadingMessage();
 
-    // Create prompt for summarization
-    const prompt = `Please provide a comprehensive summary of the following web page content:
-
-Title: ${pageData.title}
-URL: ${pageData.url}
-Words: ${pageData.wordCount}
-
-Content:
-${pageData.content}
-
-Please summarize the main points, key information, and overall theme of this content in a clear and organized manner.`;
-
-    // Send to AI backend
+    // Send to the summarize endpoint (instant when the page was prefetched)
     try {
       const response = await chrome.runtime.sendMessage({
-        type: 'SEND_PROMPT',
+        type: 'SUMMARIZE_PAGE',
         payload: {
           model: FIXED_MODEL,
-          prompt: prompt,
           context: {
             url: pageData.url,
             title: pageData.title,
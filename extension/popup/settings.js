@@ -8,6 +8,7 @@ const MODE_SELECTED_KEY = 'vynceai_mode_selected';
 const PREFERRED_MODE_KEY = 'vynceai_preferred_mode';
 const AUTO_SPEAK_KEY = 'vynceai_auto_speak';
 const COMPACT_MODE_KEY = 'vynceai_compact_mode';
+const PREFETCH_SUMMARIES_KEY = 'vynceai_prefetch_summaries';
 const MEMORY_KEY = 'vynceai_memory';
 
 // DOM Elements
@@ -15,6 +16,7 @@ let backBtn;
 let modeOptions;
 let autoSpeakToggle;
 let compactModeToggle;
+let prefetchSummariesToggle;
 let viewMemoryBtn;
 let clearMemoryBtn;
 let rateExtensionBtn;
@@ -38,6 +40,7 @@ async function init() {
   modeOptions = document.querySelectorAll('input[name="ai-mode"]');
   autoSpeakToggle = document.getElementById('auto-speak-toggle');
   compactModeToggle = document.getElementById('compact-mode-toggle');
+  prefetchSummariesToggle = document.getElementById('prefetch-summaries-toggle');
   viewMemoryBtn = document.getElementById('view-memory-btn');
   clearMemoryBtn = document.getElementById('clear-memory-btn');
   rateExtensionBtn = document.getElementById('rate-extension-btn');
@@ -68,7 +71,8 @@ async function loadSettings() {
     const result = await chrome.storage.local.get([
       PREFERRED_MODE_KEY,
       AUTO_SPEAK_KEY,
-      COMPACT_MODE_KEY
+      COMPACT_MODE_KEY,
+      PREFETCH_SUMMARIES_KEY
     ]);
     
     // Set mode
@@ -81,6 +85,7 @@ async function loadSettings() {
     // Set toggles
     autoSpeakToggle.checked = result[AUTO_SPEAK_KEY] || false;
     compactModeToggle.checked = result[COMPACT_MODE_KEY] || false;
+    prefetchSummariesToggle.checked = result[PREFETCH_SUMMARIES_KEY] || false;
     
     console.log('Settings loaded:', result);
   } catch (error) {
@@ -105,6 +110,7 @@ function setupEventListeners() {
   // Toggles
   autoSpeakToggle.addEventListener('change', handleAutoSpeakChange);
   compactModeToggle.addEventListener('change', handleCompactModeChange);
+  prefetchSummariesToggle.addEventListener('change', handlePrefetchSummariesChange);
   
   // Memory buttons
   viewMemoryBtn.addEventListener('click', handleViewMemory);
@@ -181,6 +187,24 @@ async function handleCompactModeChange(event) {
   }
 }
 
+/**
+ * Handle page summary prefetch toggle
+ */
+async function handlePrefetchSummariesChange(event) {
+  const enabled = event.target.checked;
+  
+  try {
+    await chrome.storage.local.set({
+      [PREFETCH_SUMMARIES_KEY]: enabled
+    });
+    
+    console.log('Prefetch summaries:', enabled);
+    showSuccessMessage(`Page summary preparation ${enabled ? 'enabled' : 'disabled'}`);
+  } catch (error) {
+    console.error('Error saving prefetch setting:', error);
+  }
+}
+
 /**
  * Update memory statistics
  */
@@ -2,6 +2,6 @@
 API v1 routes
 """
 
-from . import routes_ai, routes_utils, routes_command
+from . import routes_ai, routes_utils, routes_command, routes_debug
 
-__all__ = ["routes_ai", "routes_utils", "routes_command"]
+__all__ = ["routes_ai", "routes_utils", "routes_command", "routes_debug"]
@@ -3,15 +3,34 @@ VynceAI Backend - AI Routes
 Endpoints for AI chat and query processing
 """
 
-from fastapi import APIRouter, HTTPException
-from app.models.schemas import AIRequest, AIResponse
-from app.services.ai_service import process_ai_query, process_ai_query_advanced, get_available_models
+import json
+
+from fastapi import APIRouter, Depends, HTTPException, WebSocket
+from fastapi.responses import StreamingResponse
+from app.models.schemas import AIRequest, AIResponse, PrefetchRequest, TabsIndexRequest
+from app.services.ai_service import (
+    analyze_page_content,
+    process_ai_query,
+    process_ai_query_advanced,
+    summarize_page_content,
+    get_available_models
+)
+from app.services.job_service import QueueFullError, job_store
+from app.services.prefetch_service import submit_prefetch
+from app.services.summarizer_service import extractive_summary
+from app.services.session_service import session_store
+from app.services.retrieval_service import retrieval_store
+from app.services.channel_service import ChatChannel
+from app.core.admission import admission_check
+from app.core.config import settings
 from app.core.logger import get_logger
+from app.core.serialization import FastJSONRoute, respond
+from app.core.tracing import stage
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 logger = get_logger(__name__)
 
-@router.post("/chat", response_model=AIResponse)
+@router.post("/chat", response_model=AIResponse, dependencies=[Depends(admission_check)])
 async def ai_chat(req: AIRequest):
     """
     AI chat endpoint - process user queries with AI, context, and memory
@@ -22,9 +41,9 @@ async def ai_chat(req: AIRequest):
     Returns:
         AIResponse with generated text
     """
-    logger.info(f"AI chat request - Model: {req.model}, Prompt length: {len(req.prompt)}")
+    logger.info("AI chat request - Model: %s, Prompt length: %s", req.model, len(req.prompt))
     if req.memory:
-        logger.info(f"Memory provided: {len(req.memory)} interactions")
+        logger.info("Memory provided: %s interactions", len(req.memory))
     
     try:
         # Convert memory items to dicts if provided
@@ -32,27 +51,162 @@ async def ai_chat(req: AIRequest):
         if req.memory:
             memory_list = [{"user": m.user, "bot": m.bot, "timestamp": m.timestamp} for m in req.memory]
         
-        # Use advanced processing if context or memory provided
-        if req.context or req.memory:
+        # Server-side session replaces client-sent memory
+        summary = None
+        if req.session_id:
+            summary, memory_list = session_store.history_for_request(req.session_id, memory_list)
+        
+        # Use advanced processing if context, memory or session history provided
+        if req.context or memory_list or summary:
             result = await process_ai_query_advanced(
                 prompt=req.prompt,
                 context=req.context,
                 memory=memory_list,
-                model=req.model or "gemini-2.5-flash"
+                model=req.model or "gemini-2.5-flash",
+                summary=summary
             )
-            return AIResponse(**result)
         else:
             # Simple processing without context
             response = await process_ai_query(
                 prompt=req.prompt,
                 model=req.model or "gemini-2.5-flash"
             )
-            return AIResponse(response=response, model=req.model)
+            result = {"response": response, "model": req.model}
+        
+        if req.session_id:
+            session_store.record_turn(req.session_id, req.prompt, result["response"])
+            result["session_id"] = req.session_id
+        if req.context and req.context.truncated:
+            result["truncated"] = True
+        
+        return respond(result, AIResponse)
+    
+    except Exception as e:
+        logger.error("Error in ai_chat: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.websocket("/ws")
+async def ai_ws(websocket: WebSocket):
+    """
+    Persistent chat channel - multiplexes concurrent requests by ID and
+    streams tokens back (see app.services.channel_service for the protocol)
+    
+    Args:
+        websocket: Client WebSocket connection
+    """
+    await ChatChannel(websocket).run()
+
+@router.delete("/session/{session_id}")
+async def clear_session(session_id: str):
+    """
+    Clear a server-side conversation session
+    
+    Args:
+        session_id: Session ID to clear
+        
+    Returns:
+        Whether the session existed
+    """
+    logger.info("Clearing session: %s", session_id)
+    
+    return {
+        "session_id": session_id,
+        "cleared": session_store.clear(session_id)
+    }
+
+@router.post("/tabs/index")
+async def index_tabs(req: TabsIndexRequest):
+    """
+    Index several open tabs for cross-tab questions
+    
+    Args:
+        req: TabsIndexRequest with session ID and pages
+        
+    Returns:
+        Pages currently indexed for the session
+    """
+    logger.info("Tab index request - Session: %s, Pages: %s", req.session_id, len(req.pages))
+    
+    index = retrieval_store.get_or_create(req.session_id)
+    for page in req.pages:
+        if page.url and page.page_content:
+            index.add(page.url, page.title, page.page_content)
+    
+    return {
+        "session_id": req.session_id,
+        "pages": index.pages()
+    }
+
+@router.post("/tabs/chat", dependencies=[Depends(admission_check)])
+async def tabs_chat(req: AIRequest):
+    """
+    Answer a question spanning all indexed tabs with a single LLM call
+    
+    Args:
+        req: AIRequest with session ID and optional pages to index first
+        
+    Returns:
+        AI-generated response with the passages used as sources
+    """
+    if not req.session_id:
+        raise HTTPException(status_code=400, detail="sessionId is required for cross-tab questions")
+    
+    index = retrieval_store.get_or_create(req.session_id)
+    with stage("index"):
+        for page in req.pages or []:
+            if page.url and page.page_content:
+                index.add(page.url, page.title, page.page_content)
+    
+    if not len(index):
+        raise HTTPException(status_code=400, detail="No tabs indexed for this session")
+    
+    logger.info("Cross-tab chat request - Session: %s, Tabs: %s", req.session_id, len(index))
+    
+    try:
+        with stage("retrieval"):
+            passages = index.search(req.prompt, settings.RETRIEVAL_TOP_K)
+        summary, memory_list = session_store.get_history(req.session_id)
+        
+        result = await process_ai_query_advanced(
+            prompt=req.prompt,
+            memory=memory_list,
+            model=req.model or "gemini-2.5-flash",
+            summary=summary,
+            passages=passages
+        )
+        session_store.record_turn(req.session_id, req.prompt, result["response"])
+        
+        return respond({
+            **result,
+            "session_id": req.session_id,
+            "sources": [
+                {"tab": p["tab"], "url": p["url"], "title": p["title"], "score": p["score"]}
+                for p in passages
+            ]
+        })
     
     except Exception as e:
-        logger.error(f"Error in ai_chat: {str(e)}")
+        logger.error("Error in tabs_chat: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.delete("/tabs/{session_id}")
+async def clear_tabs(session_id: str):
+    """
+    Clear the tab index of a session
+    
+    Args:
+        session_id: Session ID to clear
+        
+    Returns:
+        Whether an index existed
+    """
+    logger.info("Clearing tab index: %s", session_id)
+    
+    return {
+        "session_id": session_id,
+        "cleared": retrieval_store.clear(session_id)
+    }
+
 @router.get("/models")
 async def list_models():
     """
@@ -71,10 +225,10 @@ async def list_models():
         }
     
     except Exception as e:
-        logger.error(f"Error fetching models: {str(e)}")
+        logger.error("Error fetching models: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/query")
+@router.post("/query", dependencies=[Depends(admission_check)])
 async def ai_query(req: AIRequest):
     """
     Simple AI query endpoint (alias for /chat)
@@ -85,14 +239,14 @@ async def ai_query(req: AIRequest):
     Returns:
         AI-generated response
     """
-    logger.info(f"AI query request - Prompt: {req.prompt[:50]}...")
+    logger.info("AI query request - Prompt: %s...", req.prompt[:50])
     
     try:
         response = await process_ai_query(req.prompt, req.model or "gemini-2.5-flash")
-        return {"response": response}
+        return respond({"response": response})
     
     except Exception as e:
-        logger.error(f"Error in ai_query: {str(e)}")
+        logger.error("Error in ai_query: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/summarize")
@@ -106,45 +260,100 @@ async def summarize_page(req: AIRequest):
     Returns:
         AI-generated summary
     """
-    logger.info(f"Page summarization request for: {req.context.url if req.context else 'Unknown URL'}")
+    logger.info("Page summarization request for: %s", req.context.url if req.context else 'Unknown URL')
     
     try:
-        if not req.context or not req.context.pageContent:
+        if not req.context or not req.context.page_content:
             raise HTTPException(status_code=400, detail="Page content is required for summarization")
         
-        # Build strict summarization prompt
-        prompt = f"""Analyze and summarize the following webpage. Be precise and factual.
-
-Page URL: {req.context.url if req.context.url else 'Unknown'}
-Page Title: {req.context.title if req.context.title else 'Unknown'}
-
-Page Content:
-{req.context.pageContent[:3000]}
-
-Provide a clear, structured summary covering:
-1. Main topic and purpose
-2. Key points (3-5 bullet points)
-3. Target audience or use case
-4. Type of content (article, documentation, product page, etc.)
-
-Be concise and factual. Do not add information not present in the content."""
-        
-        response = await process_ai_query(prompt, req.model or "gemini-2.5-flash")
+        # LLM summary, or the extractive one if the LLM errors or is too slow
+        result = await summarize_page_content(
+            req.context.page_content,
+            req.context.url,
+            req.context.title,
+            req.model or "gemini-2.5-flash"
+        )
         
-        return {
-            "response": response,
+        return respond({
+            "response": result["response"],
             "model": req.model,
             "url": req.context.url,
-            "title": req.context.title
-        }
+            "title": req.context.title,
+            "truncated": req.context.truncated,
+            "cached": result["cached"],
+            "source": result["source"],
+            "fallback": result["fallback_reason"] is not None
+        })
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in summarize_page: {str(e)}")
+        logger.error("Error in summarize_page: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/summarize/preview")
+async def summarize_preview(req: AIRequest):
+    """
+    Instant extractive summary of webpage content (no LLM call)
+    
+    Meant to be shown while the LLM summary is on its way.
+    
+    Args:
+        req: AIRequest with page content in context
+        
+    Returns:
+        Key sentences of the page
+    """
+    if not req.context or not req.context.page_content:
+        raise HTTPException(status_code=400, detail="Page content is required for summarization")
+    
+    try:
+        with stage("extractive"):
+            summary = extractive_summary(req.context.page_content, req.context.title)
+        
+        return respond({
+            "response": summary["response"],
+            "sentences": summary["sentences"],
+            "url": req.context.url,
+            "title": req.context.title,
+            "source": "extractive"
+        })
+    
+    except Exception as e:
+        logger.error("Error in summarize_preview: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
-@router.post("/analyze")
+@router.post("/prefetch", status_code=202, dependencies=[Depends(admission_check)])
+async def prefetch_page(req: PrefetchRequest):
+    """
+    Queue a freshly loaded page for background warming (fire-and-forget)
+    
+    Returns immediately. The page is later indexed for the session and
+    pre-summarized into the response cache, without delaying interactive
+    requests, so a later /summarize of the same content is instant.
+    
+    Args:
+        req: PrefetchRequest with the page context
+        
+    Returns:
+        Queue status and the page's content hash
+    """
+    if not req.context.page_content:
+        raise HTTPException(status_code=400, detail="Page content is required for prefetch")
+    
+    result = submit_prefetch(
+        req.context.page_content,
+        req.context.url,
+        req.context.title,
+        req.model or "gemini-2.5-flash",
+        req.session_id,
+        req.summarize
+    )
+    logger.debug("Prefetch %s for %s", result["status"], req.context.url)
+    # Plain dict so the 202 status applies on the FAST_JSON path too
+    return result
+
+@router.post("/analyze", dependencies=[Depends(admission_check)])
 async def analyze_page(req: AIRequest):
     """
     Analyze webpage content in depth
@@ -155,42 +364,138 @@ async def analyze_page(req: AIRequest):
     Returns:
         AI-generated analysis
     """
-    logger.info(f"Page analysis request for: {req.context.url if req.context else 'Unknown URL'}")
+    logger.info("Page analysis request for: %s", req.context.url if req.context else 'Unknown URL')
     
     try:
-        if not req.context or not req.context.pageContent:
+        if not req.context or not req.context.page_content:
             raise HTTPException(status_code=400, detail="Page content is required for analysis")
         
-        # Build strict analysis prompt
-        prompt = f"""Perform a detailed analysis of this webpage based ONLY on the provided content.
-
-Page URL: {req.context.url if req.context.url else 'Unknown'}
-Page Title: {req.context.title if req.context.title else 'Unknown'}
-
-Page Content:
-{req.context.pageContent[:3000]}
-
-Analyze and provide:
-1. Content quality and structure
-2. Main topics and key information
-3. Purpose and intended audience
-4. Content organization and readability
-5. Notable features or elements
-6. Any calls-to-action or next steps mentioned
-
-Base your analysis strictly on the content provided. Be factual and precise."""
-        
-        response = await process_ai_query(prompt, req.model or "gemini-2.5-flash")
+        result = await analyze_page_content(
+            req.context.page_content,
+            req.context.url,
+            req.context.title,
+            req.model or "gemini-2.5-flash"
+        )
+        response, cached = result["response"], result["cached"]
         
-        return {
+        return respond({
             "response": response,
             "model": req.model,
             "url": req.context.url,
-            "title": req.context.title
-        }
+            "title": req.context.title,
+            "truncated": req.context.truncated,
+            "cached": cached
+        })
     
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in analyze_page: {str(e)}")
+        logger.error("Error in analyze_page: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/analyze/jobs", status_code=202, dependencies=[Depends(admission_check)])
+async def submit_analysis_job(req: AIRequest):
+    """
+    Queue an in-depth page analysis as a background job
+    
+    Returns immediately with a job ID. Poll /jobs/{job_id} or subscribe to
+    /jobs/{job_id}/events (Server-Sent Events) for partial output and the
+    result; results are kept for JOB_RESULT_TTL_SECONDS after finishing.
+    
+    Args:
+        req: AIRequest with page content in context
+        
+    Returns:
+        Job ID, status and the URLs to follow it
+    """
+    if not req.context or not req.context.page_content:
+        raise HTTPException(status_code=400, detail="Page content is required for analysis")
+    
+    context = req.context
+    model = req.model or "gemini-2.5-flash"
+    
+    async def run(job):
+        result = await analyze_page_content(context.page_content, context.url, context.title, model, on_delta=job.emit)
+        return {
+            **result,
+            "model": req.model,
+            "url": context.url,
+            "title": context.title,
+            "truncated": context.truncated
+        }
+    
+    try:
+        job = job_store.submit("analyze", run)
+    except QueueFullError as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "5"})
+    
+    logger.info("Analysis job %s queued for: %s", job.id, context.url or "Unknown URL")
+    # Plain dict so the 202 status applies on the FAST_JSON path too
+    return {
+        "job_id": job.id,
+        "status": job.status,
+        "poll_url": f"/api/v1/ai/jobs/{job.id}",
+        "events_url": f"/api/v1/ai/jobs/{job.id}/events"
+    }
+
+@router.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """
+    Poll a background job
+    
+    Args:
+        job_id: Job ID from the submit response
+        
+    Returns:
+        Job status with the partial output so far, or the result/error once finished
+    """
+    snapshot = job_store.snapshot(job_id)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    return respond(snapshot)
+
+@router.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """
+    Subscribe to a background job as Server-Sent Events
+    
+    Sends "status" events on state changes, "delta" events with new partial
+    output and comment heartbeats; the stream ends after the final status.
+    
+    Args:
+        job_id: Job ID from the submit response
+    """
+    if job_store.snapshot(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired")
+    
+    async def events():
+        async for event in job_store.subscribe(job_id):
+            kind = event.pop("type")
+            if kind == "heartbeat":
+                yield ": heartbeat\n\n"
+            else:
+                yield f"event: {kind}\ndata: {json.dumps(event)}\n\n"
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """
+    Cancel a queued or running background job
+    
+    Args:
+        job_id: Job ID to cancel
+        
+    Returns:
+        Whether a live job was cancelled
+    """
+    logger.info("Cancelling job: %s", job_id)
+    
+    return {
+        "job_id": job_id,
+        "cancelled": job_store.cancel(job_id)
+    }
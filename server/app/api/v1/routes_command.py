@@ -4,9 +4,19 @@ Endpoints for browser command execution and automation
 """
 
 from fastapi import APIRouter, HTTPException
-from app.models.schemas import CommandRequest, CommandResponse
+from app.models.schemas import (
+    CommandRequest,
+    CommandResponse,
+    CommandPlanRequest,
+    CommandPlanResponse,
+    ExtractRequest,
+    ExtractResponse
+)
 from app.services.command_service import (
     execute_command,
+    run_extract,
+    parse_command_with_fallback,
+    plan_commands,
     validate_command,
     get_supported_commands
 )
@@ -26,14 +36,14 @@ async def run_command(req: CommandRequest):
     Returns:
         CommandResponse with execution result
     """
-    logger.info(f"Command execution request: {req.command}")
+    logger.info("Command execution request: %s", req.command)
     
     try:
         # Validate command
         is_valid = await validate_command(req.command)
         
         if not is_valid:
-            logger.warning(f"Invalid command: {req.command}")
+            logger.warning("Invalid command: %s", req.command)
             supported = await get_supported_commands()
             return CommandResponse(
                 result=f"Invalid command: {req.command}",
@@ -41,9 +51,20 @@ async def run_command(req: CommandRequest):
                 error=f"Supported commands: {', '.join(supported)}"
             )
         
+        # Extraction runs locally and returns structured data
+        if req.command == "extract":
+            extracted = await run_extract(req.params or {})
+            summary = ", ".join(f"{count} {name}" for name, count in extracted["counts"].items())
+            return CommandResponse(
+                result=f"Extracted {summary}",
+                success=True,
+                action="extract",
+                data=extracted
+            )
+        
         # Execute command
         result = await execute_command(req.command, req.params)
-        logger.info(f"Command executed successfully: {req.command}")
+        logger.info("Command executed successfully: %s", req.command)
         
         return CommandResponse(
             result=result,
@@ -52,13 +73,107 @@ async def run_command(req: CommandRequest):
         )
     
     except Exception as e:
-        logger.error(f"Error executing command {req.command}: {str(e)}")
+        logger.error("Error executing command %s: %s", req.command, e)
         return CommandResponse(
             result="Command execution failed",
             success=False,
             error=str(e)
         )
 
+@router.post("/parse", response_model=CommandResponse)
+async def parse_command_endpoint(req: CommandRequest):
+    """
+    Parse a natural-language automation command into a structured action
+    
+    The grammar handles supported phrasings without an LLM call; the LLM
+    is only used (and its result cached) when no rule matches.
+    
+    Args:
+        req: CommandRequest with the natural-language command
+        
+    Returns:
+        CommandResponse with action, params, confidence and parser source
+    """
+    logger.info("Command parse request: %s", req.command[:80])
+    
+    try:
+        parsed = await parse_command_with_fallback(req.command)
+        
+        if not parsed:
+            return CommandResponse(
+                result=f"Could not parse command: {req.command}",
+                success=False,
+                error="Could not parse command"
+            )
+        
+        logger.info("Command parsed by %s: %s", parsed["source"], parsed["action"])
+        return CommandResponse(
+            result=f"Parsed command: {parsed['action']}",
+            success=True,
+            **parsed
+        )
+    
+    except Exception as e:
+        logger.error("Error parsing command: %s", e)
+        return CommandResponse(
+            result="Command parsing failed",
+            success=False,
+            error=str(e)
+        )
+
+@router.post("/plan", response_model=CommandPlanResponse)
+async def plan_commands_endpoint(req: CommandPlanRequest):
+    """
+    Turn one or more instructions into an ordered, validated action plan
+    
+    Compound instructions ("open the form, fill name, then submit") are
+    split into steps and parsed in a single round trip, so the extension
+    can start executing without one request per step.
+    
+    Args:
+        req: CommandPlanRequest with an instruction or list of instructions
+        
+    Returns:
+        CommandPlanResponse with the ordered steps
+    """
+    instructions = [req.instruction] if isinstance(req.instruction, str) else req.instruction
+    logger.info("Command plan request: %s instruction(s)", len(instructions))
+    
+    try:
+        plan = await plan_commands(instructions)
+        logger.info("Planned %s steps (success=%s, cached=%s)", len(plan["steps"]), plan["success"], plan["cached"])
+        return CommandPlanResponse(**plan)
+    
+    except Exception as e:
+        logger.error("Error planning commands: %s", e)
+        return CommandPlanResponse(steps=[], success=False, error=str(e))
+
+@router.post("/extract", response_model=ExtractResponse)
+async def extract_endpoint(req: ExtractRequest):
+    """
+    Extract emails, phones, links, dates, prices and tables from page text
+    
+    Runs precompiled extractors locally; no LLM call is made.
+    
+    Args:
+        req: ExtractRequest with pageContent and optional targets
+        
+    Returns:
+        ExtractResponse with typed results per target
+    """
+    logger.info("Extract request: %s chars, targets=%s", len(req.page_content), req.targets)
+    
+    try:
+        extracted = await run_extract({"pageContent": req.page_content, "targets": req.targets, "limit": req.limit})
+        return ExtractResponse(**extracted)
+    
+    except ValueError as e:
+        return ExtractResponse(success=False, error=str(e))
+    
+    except Exception as e:
+        logger.error("Error extracting from page: %s", e)
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/commands")
 async def list_commands():
     """
@@ -77,7 +192,7 @@ async def list_commands():
         }
     
     except Exception as e:
-        logger.error(f"Error fetching commands: {str(e)}")
+        logger.error("Error fetching commands: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @router.post("/validate")
@@ -91,7 +206,7 @@ async def validate_command_endpoint(command: str):
     Returns:
         Validation result
     """
-    logger.info(f"Validating command: {command}")
+    logger.info("Validating command: %s", command)
     
     is_valid = await validate_command(command)
     
@@ -0,0 +1,162 @@
+"""
+VynceAI Backend - Debug Routes
+Live diagnostics for on-call use, guarded by DEBUG_TOKEN
+"""
+
+import asyncio
+import secrets
+import tracemalloc
+from typing import Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import PlainTextResponse
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.loop_monitor import loop_monitor
+from app.core.memory import memory_budget, top_allocations_by_route
+from app.core.profiler import ProfilerBusy, render_collapsed, sample_profile
+from app.core.slowlog import slow_requests
+
+logger = get_logger(__name__)
+
+
+def require_debug_token(x_debug_token: Optional[str] = Header(default=None)) -> None:
+    """
+    Guard for debug endpoints
+    
+    The endpoints are hidden (404) unless DEBUG_TOKEN is configured, and
+    require a matching X-Debug-Token header otherwise.
+    """
+    if not settings.DEBUG_TOKEN:
+        raise HTTPException(status_code=404, detail="Not Found")
+    if not x_debug_token or not secrets.compare_digest(x_debug_token, settings.DEBUG_TOKEN):
+        raise HTTPException(status_code=403, detail="Invalid debug token")
+
+
+router = APIRouter(dependencies=[Depends(require_debug_token)])
+
+# tracemalloc is process-wide: one allocation trace at a time per worker
+_memory_profile_lock = asyncio.Lock()
+
+@router.get("/slow-requests")
+def get_slow_requests():
+    """
+    Slowest recent requests with their stage timings
+    
+    Returns:
+        Slow request entries (slowest first) and the log settings
+    """
+    entries = slow_requests.snapshot()
+    logger.info("Slow request log read - %s entries", len(entries))
+    
+    return {
+        "window_seconds": slow_requests.window,
+        "size": slow_requests.size,
+        "prompts_captured": settings.SLOWLOG_CAPTURE_PROMPTS,
+        "requests": entries
+    }
+
+@router.delete("/slow-requests")
+def clear_slow_requests():
+    """
+    Reset the slow request log
+    
+    Returns:
+        Confirmation message
+    """
+    slow_requests.clear()
+    return {"success": True, "message": "Slow request log cleared"}
+
+@router.get("/loop-lag")
+def get_loop_lag():
+    """
+    Recent event-loop stalls with the stack of the blocking code
+    
+    Returns:
+        Monitor status and blocking events (newest first)
+    """
+    return {
+        "enabled": loop_monitor.running,
+        "threshold_ms": int(loop_monitor.threshold * 1000),
+        "events": loop_monitor.snapshot()
+    }
+
+@router.get("/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(default=10.0, gt=0),
+    interval_ms: float = Query(default=5.0, ge=1.0, le=1000.0)
+):
+    """
+    Sample all thread stacks for a while and return collapsed stacks
+    
+    The output can be fed straight to flamegraph.pl or speedscope.
+    
+    Args:
+        seconds: Profile duration (capped at PROFILE_MAX_SECONDS)
+        interval_ms: Sampling interval in milliseconds
+        
+    Returns:
+        Collapsed-stack text, one `stack count` line per unique stack
+    """
+    seconds = min(seconds, settings.PROFILE_MAX_SECONDS)
+    logger.info("Sampling profile started - %ss at %sms", seconds, interval_ms)
+    
+    try:
+        # The sampler sleeps between samples, so run it off the event loop
+        stacks = await asyncio.to_thread(sample_profile, seconds, interval_ms / 1000)
+    except ProfilerBusy as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    logger.info("Sampling profile finished - %s unique stacks", len(stacks))
+    return PlainTextResponse(render_collapsed(stacks))
+
+@router.get("/memory")
+async def memory_profile(
+    request: Request,
+    seconds: float = Query(default=10.0, ge=0),
+    top: int = Query(default=10, ge=1, le=100)
+):
+    """
+    Top live allocation sites grouped by route
+    
+    Starts tracemalloc (unless already tracing), lets traffic run for the
+    given time, then snapshots and stops it again. Only one trace runs at
+    a time; concurrent calls get 409.
+    
+    Args:
+        seconds: How long to trace before the snapshot (capped at PROFILE_MAX_SECONDS)
+        top: Allocation sites reported per route
+        
+    Returns:
+        Memory budget status and allocation sites by route
+    """
+    if _memory_profile_lock.locked():
+        raise HTTPException(status_code=409, detail="An allocation trace is already running")
+    
+    async with _memory_profile_lock:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start(settings.MEMORY_PROFILE_FRAMES)
+        logger.info("Allocation tracing for %ss", seconds)
+        
+        try:
+            await asyncio.sleep(min(seconds, settings.PROFILE_MAX_SECONDS))
+            # Snapshotting copies every trace; keep it off the event loop
+            snapshot = await asyncio.to_thread(tracemalloc.take_snapshot)
+            traced_current, traced_peak = tracemalloc.get_traced_memory()
+        finally:
+            if started:
+                await asyncio.to_thread(tracemalloc.stop)
+    
+    # Grouping walks every trace; keep it off the event loop
+    routes = await asyncio.to_thread(top_allocations_by_route, snapshot, request.app.routes, top)
+    
+    return {
+        "budget": {
+            "limit_bytes": memory_budget.limit,
+            "in_flight_bytes": memory_budget.in_flight
+        },
+        "traced_bytes": traced_current,
+        "traced_peak_bytes": traced_peak,
+        "routes": routes
+    }
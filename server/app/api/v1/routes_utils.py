@@ -4,9 +4,12 @@ Health checks, status, and utility endpoints
 """
 
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse, PlainTextResponse
 from app.models.schemas import HealthResponse
+from app.services.warmup_service import is_ready, warmup_state
 from app.core.config import settings
 from app.core.logger import get_logger
+from app.core.metrics import metrics
 import time
 
 router = APIRouter()
@@ -43,6 +46,24 @@ def health_check():
         "version": settings.APP_VERSION
     }
 
+@router.get("/ready")
+def readiness_check():
+    """
+    Readiness endpoint for load balancers
+    
+    Unlike /health (process is up), this returns 503 until provider
+    clients are initialized and, with WARMUP_ENABLED, warmup has finished.
+    
+    Returns:
+        Readiness status and warmup progress
+    """
+    ready = is_ready()
+    body = {
+        "ready": ready,
+        "warmup": warmup_state.to_dict() if settings.WARMUP_ENABLED else None
+    }
+    return JSONResponse(body, status_code=200 if ready else 503)
+
 @router.get("/ping")
 def ping():
     """
@@ -102,3 +123,16 @@ def get_status():
         "available_models": [m["id"] for m in available_models],
         "total_models": len(available_models)
     }
+
+@router.get("/metrics", response_class=PlainTextResponse)
+def get_metrics():
+    """
+    Prometheus metrics endpoint
+    
+    Returns:
+        Metrics in Prometheus text exposition format
+    """
+    return PlainTextResponse(
+        metrics.render(),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
@@ -0,0 +1,125 @@
+"""
+VynceAI Backend - Admission Control
+Early load shedding for AI endpoints based on predicted queueing delay
+
+Each upstream call's duration feeds a moving average of upstream latency.
+Before an AI endpoint starts work, the completion time of its upstream
+call is predicted from the scheduler's running and waiting calls:
+
+    wait = (calls ahead - slots + 1) / slots x average latency
+    completion = wait + average latency
+
+If the call would have to queue and the prediction exceeds the request's
+deadline, the request is rejected at once with 503 and a Retry-After for
+when the backlog should have drained. The client can then retry (or fall
+back) right away instead of timing out after the work was paid for.
+Deadlines come from ADMISSION_DEADLINES per priority class (classes
+without one, interactive by default, are only shed on a client deadline)
+and may be shortened per request with the X-Deadline-Seconds header.
+"""
+
+import math
+from typing import Dict, Optional, Tuple
+
+from fastapi import Header, HTTPException
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import ADMISSION_DECISIONS, ADMISSION_LATENCY_ESTIMATE
+from app.core.scheduler import FairScheduler, current_priority, upstream_scheduler
+from app.core.tracing import annotate
+
+logger = get_logger(__name__)
+
+MAX_RETRY_AFTER_SECONDS = 120
+
+
+class AdmissionController:
+    """Predicts upstream completion times and decides whether to admit"""
+
+    def __init__(self, scheduler: FairScheduler, deadlines: Dict[str, float], initial_latency: float, alpha: float):
+        self.scheduler = scheduler
+        self.deadlines = deadlines
+        self.alpha = alpha
+        self.latency = initial_latency
+
+    def record_latency(self, seconds: float) -> None:
+        """Fold one upstream call duration into the moving average"""
+        self.latency += self.alpha * (seconds - self.latency)
+        ADMISSION_LATENCY_ESTIMATE.set(value=self.latency)
+
+    def predict(self, request_class: str) -> Tuple[float, float]:
+        """
+        Predicted (queue wait, completion time) in seconds for a new call
+
+        Without a slot limit nothing queues and the wait is 0.
+        """
+        capacity = self.scheduler.capacity
+        if capacity <= 0:
+            return 0.0, self.latency
+        queued = self.scheduler.calls_ahead(request_class) - capacity + 1
+        wait = max(0.0, queued) / capacity * self.latency
+        return wait, wait + self.latency
+
+    def check(self, request_class: str, deadline: Optional[float] = None) -> Optional[int]:
+        """
+        Decide on one request
+
+        Args:
+            request_class: Priority class of the request
+            deadline: Client deadline in seconds (shortens the class deadline)
+
+        Returns:
+            None to admit, or the Retry-After seconds for a rejection
+        """
+        limit = self.deadlines.get(request_class)
+        if deadline is not None:
+            limit = deadline if limit is None else min(limit, deadline)
+
+        wait, completion = self.predict(request_class)
+        # Never shed when the call would start at once: an idle server must
+        # keep admitting, or a stale latency estimate could never recover
+        if limit is None or wait <= 0 or completion <= limit:
+            ADMISSION_DECISIONS.inc(request_class, "admitted")
+            return None
+
+        ADMISSION_DECISIONS.inc(request_class, "shed")
+        # Time until the backlog ahead has shrunk enough to meet the deadline
+        retry_after = completion - max(limit, self.latency)
+        return min(MAX_RETRY_AFTER_SECONDS, max(1, math.ceil(retry_after)))
+
+
+# Global controller for this worker
+admission = AdmissionController(
+    upstream_scheduler,
+    settings.ADMISSION_DEADLINES,
+    settings.ADMISSION_INITIAL_LATENCY_SECONDS,
+    settings.ADMISSION_LATENCY_ALPHA
+)
+
+
+def admission_check(x_deadline_seconds: Optional[float] = Header(default=None)) -> None:
+    """
+    Dependency shedding requests that would miss their deadline
+
+    Raises 503 with Retry-After when the predicted completion time of the
+    request's upstream call exceeds its deadline.
+    """
+    if not settings.ADMISSION_ENABLED:
+        return
+    request_class = current_priority()[0]
+    retry_after = admission.check(request_class, x_deadline_seconds)
+    if retry_after is None:
+        return
+
+    wait, completion = admission.predict(request_class)
+    logger.warning(
+        "Shed %s request: predicted %.1fs (%.1fs queued), retry after %ss",
+        request_class, completion, wait, retry_after
+    )
+    annotate(shed=True, predicted_seconds=round(completion, 2))
+    raise HTTPException(
+        status_code=503,
+        detail="Server is busy, please retry shortly",
+        headers={"Retry-After": str(retry_after)}
+    )
@@ -0,0 +1,302 @@
+"""
+VynceAI Backend - Caching
+In-process LRU cache, a cross-worker SQLite cache, and a two-level cache
+combining them
+
+All caches share one small interface (get / set / delete / clear) so call
+sites do not care which tier they talk to:
+
+- LRUCache: per-process OrderedDict with TTL; microsecond lookups
+- SQLiteCache: one WAL-mode SQLite file shared by every worker on the
+  host; values are JSON, entries expire by TTL and the oldest entries are
+  evicted past max_entries
+- TieredCache: LRUCache in front of SQLiteCache; L2 hits are promoted to L1
+  until the L2 entry expires
+
+Use get_cache(name) to obtain the configured cache for a namespace, and
+get_cache(name, shared_only=True) for namespaces holding mutable state.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import record_cache
+
+logger = get_logger(__name__)
+
+_MISSING = object()
+
+
+class LRUCache:
+    """In-process LRU cache with per-entry TTL"""
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: "OrderedDict[str, Tuple[Any, Optional[float]]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        item = self._data.get(key, _MISSING)
+        if item is _MISSING:
+            return default
+        value, expires = item
+        if expires is not None and expires <= time.time():
+            del self._data[key]
+            return default
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        self._data[key] = (value, time.time() + ttl if ttl else None)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+
+class SQLiteCache:
+    """
+    Cache shared by all worker processes on a host
+
+    Uses one SQLite database in WAL mode, so readers never block the
+    single writer and each lookup is an indexed point query (tens of
+    microseconds on a local disk). Calls are synchronous and run on the
+    event loop, so a write waiting for another worker's write lock blocks
+    the loop for up to `busy_timeout` seconds before raising
+    sqlite3.OperationalError (TieredCache logs it and carries on with
+    its in-process tier). Expired
+    and excess entries are purged every `purge_every` writes. The
+    connection is reopened after a fork, since SQLite handles must not
+    cross processes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        namespace: str = "default",
+        ttl: Optional[float] = None,
+        max_entries: int = 10_000,
+        purge_every: int = 100,
+        busy_timeout: float = 0.1
+    ):
+        self.path = path
+        self.namespace = namespace
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.purge_every = purge_every
+        self.busy_timeout = busy_timeout
+        self._writes = 0
+        self._lock = threading.Lock()
+        self._pid = None
+        self._conn: Optional[sqlite3.Connection] = None
+        self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None and self._pid == os.getpid():
+            return self._conn
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " namespace TEXT NOT NULL, key TEXT NOT NULL, value TEXT NOT NULL,"
+            " expires REAL, created REAL NOT NULL,"
+            " PRIMARY KEY (namespace, key))"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS cache_created ON cache (namespace, created)")
+        self._conn, self._pid = conn, os.getpid()
+        return conn
+
+    def __len__(self) -> int:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT COUNT(*) FROM cache WHERE namespace = ? AND (expires IS NULL OR expires > ?)",
+                (self.namespace, time.time())
+            ).fetchone()
+        return row[0]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        entry = self.get_entry(key)
+        return default if entry is None else entry[0]
+
+    def get_entry(self, key: str) -> Optional[Tuple[Any, Optional[float]]]:
+        """(value, expiry timestamp or None) of a live entry, or None"""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT value, expires FROM cache WHERE namespace = ? AND key = ? AND (expires IS NULL OR expires > ?)",
+                (self.namespace, key, time.time())
+            ).fetchone()
+        return (json.loads(row[0]), row[1]) if row else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else ttl
+        now = time.time()
+        with self._lock:
+            self._connect().execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, expires, created) VALUES (?, ?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), now + ttl if ttl else None, now)
+            )
+            self._writes += 1
+            if self._writes % self.purge_every == 0:
+                self._purge(now)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connect().execute("DELETE FROM cache WHERE namespace = ?", (self.namespace,))
+
+    def _purge(self, now: float) -> None:
+        """Drop expired entries, then the oldest ones beyond max_entries"""
+        self._connect().execute("DELETE FROM cache WHERE namespace = ? AND expires <= ?", (self.namespace, now))
+        self._connect().execute(
+            "DELETE FROM cache WHERE namespace = ? AND key IN ("
+            " SELECT key FROM cache WHERE namespace = ? ORDER BY created DESC LIMIT -1 OFFSET ?)",
+            (self.namespace, self.namespace, self.max_entries)
+        )
+
+
+class TieredCache:
+    """
+    In-process LRU (L1) in front of a shared cache (L2)
+
+    L2 hits are promoted to L1 for the rest of their L2 lifetime. A copy in
+    L1 does not see later writes by other workers, so namespaces holding
+    mutable state pass l1=None and always read L2.
+    """
+
+    def __init__(self, l1: Optional[LRUCache], l2: SQLiteCache):
+        self.l1 = l1
+        self.l2 = l2
+
+    def __len__(self) -> int:
+        return len(self.l2)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if self.l1 is not None:
+            value = self.l1.get(key, _MISSING)
+            if value is not _MISSING:
+                return value
+        try:
+            entry = self.l2.get_entry(key)
+        except sqlite3.Error as e:
+            logger.warning("Shared cache read failed: %s", e)
+            return default
+        if entry is None:
+            return default
+        value, expires = entry
+        if self.l1 is not None:
+            # ttl=0 keeps entries without expiry in L1 until evicted
+            self.l1.set(key, value, ttl=0 if expires is None else max(expires - time.time(), 0.001))
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        if self.l1 is not None:
+            self.l1.set(key, value, ttl)
+        try:
+            self.l2.set(key, value, ttl)
+        except sqlite3.Error as e:
+            logger.warning("Shared cache write failed: %s", e)
+
+    def delete(self, key: str) -> None:
+        if self.l1 is not None:
+            self.l1.delete(key)
+        try:
+            self.l2.delete(key)
+        except sqlite3.Error as e:
+            logger.warning("Shared cache delete failed: %s", e)
+
+    def clear(self) -> None:
+        if self.l1 is not None:
+            self.l1.clear()
+        try:
+            self.l2.clear()
+        except sqlite3.Error as e:
+            logger.warning("Shared cache clear failed: %s", e)
+
+
+class InstrumentedCache:
+    """Wrapper counting hits and misses in vynce_cache_requests_total"""
+
+    def __init__(self, name: str, cache: Any):
+        self.name = name
+        self.cache = cache
+
+    def __len__(self) -> int:
+        return len(self.cache)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        value = self.cache.get(key, _MISSING)
+        record_cache(self.name, value is not _MISSING)
+        return default if value is _MISSING else value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        self.cache.set(key, value, ttl)
+
+    def delete(self, key: str) -> None:
+        self.cache.delete(key)
+
+    def clear(self) -> None:
+        self.cache.clear()
+
+
+_caches: Dict[str, InstrumentedCache] = {}
+
+
+def get_cache(name: str, maxsize: int = 1024, ttl: Optional[float] = None, shared_only: bool = False) -> InstrumentedCache:
+    """
+    Get (or create) the cache for a namespace
+
+    With CACHE_BACKEND="sqlite" the in-process LRU is backed by the shared
+    SQLite cache at CACHE_SQLITE_PATH; otherwise it is used on its own.
+    Values stored in the shared tier must be JSON-serializable.
+
+    Args:
+        name: Cache namespace (also the metrics label)
+        maxsize: Entries kept in the in-process tier
+        ttl: Default time-to-live in seconds (CACHE_TTL_SECONDS if None)
+        shared_only: Skip the in-process tier when the shared one is
+            configured, so values other workers update are never stale
+
+    Returns:
+        Cache with get / set / delete / clear
+    """
+    cache = _caches.get(name)
+    if cache is not None:
+        return cache
+
+    ttl = settings.CACHE_TTL_SECONDS if ttl is None else ttl
+    backend: Any = LRUCache(maxsize, ttl)
+    if settings.CACHE_BACKEND == "sqlite":
+        try:
+            directory = os.path.dirname(settings.CACHE_SQLITE_PATH)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            shared = SQLiteCache(
+                settings.CACHE_SQLITE_PATH, name, ttl, settings.CACHE_SQLITE_MAX_ENTRIES,
+                busy_timeout=settings.CACHE_SQLITE_BUSY_TIMEOUT_SECONDS
+            )
+            backend = TieredCache(None if shared_only else backend, shared)
+        except sqlite3.Error as e:
+            logger.error("Shared cache unavailable, using in-process cache only: %s", e)
+
+    cache = _caches[name] = InstrumentedCache(name, backend)
+    return cache
@@ -4,7 +4,7 @@ Centralized configuration management using environment variables
 """
 
 import os
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
@@ -65,6 +65,161 @@ class Settings(BaseSettings):
     # ============================================================================
     MAX_TOKENS: int = 1000
     TEMPERATURE: float = 0.7
+    LOCAL_ANSWERS_ENABLED: bool = True  # Answer greetings, identity and arithmetic without an LLM call
+    LOCAL_ANSWER_MIN_CONFIDENCE: float = 0.9  # Below this a local match defers to the LLM
+    SUMMARY_SENTENCES: int = 5  # Sentences in extractive (offline) summaries
+    SUMMARY_LLM_BUDGET_SECONDS: float = 10.0  # /summarize falls back to the extractive summary after this; 0 waits
+    
+    # ============================================================================
+    # Logging Settings
+    # ============================================================================
+    LOG_ASYNC: bool = True  # Queue records to a background writer thread
+    LOG_JSON: bool = False  # One JSON object per line instead of plain text
+    LOG_SAMPLING: Dict[str, float] = {}  # Logger prefix -> fraction of INFO/DEBUG kept
+    
+    # ============================================================================
+    # Request Limit Settings
+    # ============================================================================
+    MAX_BODY_BYTES: int = 2_000_000  # Default request body limit (bytes)
+    BODY_LIMITS: Dict[str, int] = {  # Per-route limits, longest path prefix wins
+        "/api/v1/ai/tabs": 4_000_000,
+        "/api/v1/ai": 1_000_000,
+        "/api/v1/command": 64_000
+    }
+    PAGE_CONTENT_MAX_CHARS: int = 40_000  # pageContent kept after decoding
+    PAGE_CONTENT_OVERFLOW: str = "truncate"  # truncate = trim and flag, reject = 422
+    
+    # ============================================================================
+    # Serialization Settings
+    # ============================================================================
+    FAST_JSON: bool = False  # orjson request decoding / response encoding on AI routes
+    
+    # ============================================================================
+    # WebSocket Chat Channel Settings
+    # ============================================================================
+    WS_MAX_INFLIGHT: int = 8  # Concurrent requests per connection
+    WS_REQUEST_TIMEOUT_SECONDS: float = 60.0  # Server cancels requests running longer
+    
+    # ============================================================================
+    # Conversation Session Settings
+    # ============================================================================
+    SESSION_MAX_SESSIONS: int = 1000  # LRU cap on live sessions per worker
+    SESSION_IDLE_TTL_SECONDS: int = 1800  # Evict sessions idle for 30 minutes
+    SESSION_RECENT_TURNS: int = 3  # Turns kept verbatim before older ones are batched for folding
+    SESSION_SUMMARY_BATCH: int = 3  # Older turns folded into the summary per pass
+    SESSION_MAX_TURN_CHARS: int = 2000  # Per-message cap for stored turns
+    SESSION_SUMMARY_MAX_CHARS: int = 1500  # Cap on the rolling summary
+    PROMPT_MEMORY_MAX_CHARS: int = 8000  # Budget for verbatim turns in a prompt (newest kept)
+    
+    # ============================================================================
+    # Cross-Tab Retrieval Settings
+    # ============================================================================
+    RETRIEVAL_FEATURES: int = 1024  # Hashing vectorizer dimensions
+    RETRIEVAL_MAX_DOCS: int = 8  # Pages kept per session (LRU)
+    RETRIEVAL_MAX_SESSIONS: int = 100  # Sessions with a page index (LRU)
+    RETRIEVAL_PASSAGE_CHARS: int = 600  # Target passage size
+    RETRIEVAL_MAX_PASSAGES_PER_DOC: int = 64  # Cap on indexed passages per page
+    RETRIEVAL_TOP_K: int = 6  # Passages sent to the LLM per question
+    
+    # ============================================================================
+    # Cache Settings
+    # ============================================================================
+    CACHE_BACKEND: str = "memory"  # "memory" (per worker) or "sqlite" (shared by workers on a host)
+    CACHE_SQLITE_PATH: str = "/tmp/vynceai/cache.sqlite3"
+    CACHE_SQLITE_MAX_ENTRIES: int = 10_000  # Per namespace, oldest evicted first
+    CACHE_SQLITE_BUSY_TIMEOUT_SECONDS: float = 0.1  # Max event loop stall waiting for another worker's write
+    CACHE_TTL_SECONDS: int = 3600  # Default entry lifetime
+    RESPONSE_CACHE_SIZE: int = 512  # In-process entries for cached AI responses
+    
+    # ============================================================================
+    # Page Prefetch
+    # ============================================================================
+    PREFETCH_ENABLED: bool = True  # Accept /ai/prefetch page-load hints
+    PREFETCH_QUEUE_SIZE: int = 32  # Pending pages; newer ones are dropped when full
+    PREFETCH_WORKERS: int = 1  # Background prefetch jobs run concurrently
+    PREFETCH_SUMMARIZE: bool = False  # Pre-summarize pages when a request does not say (clients opt in)
+    PREFETCH_IDLE_POLL_SECONDS: float = 0.05  # Recheck interval while interactive requests run
+    
+    # ============================================================================
+    # Upstream Scheduling
+    # ============================================================================
+    SCHEDULER_MAX_CONCURRENCY: int = 16  # Concurrent upstream LLM calls per worker; 0 disables queuing
+    SCHEDULER_MAX_WAIT_SECONDS: float = 10.0  # Calls waiting longer are served next regardless of weights
+    PRIORITY_WEIGHTS: Dict[str, float] = {  # Share of upstream slots per class under contention
+        "interactive": 8.0,
+        "bulk": 3.0,
+        "batch": 2.0,
+        "prefetch": 1.0
+    }
+    PRIORITY_ROUTES: Dict[str, str] = {  # Path prefix -> class, longest wins; default interactive
+        "/api/v1/ai/summarize": "bulk",
+        "/api/v1/ai/analyze": "bulk",
+        "/api/v1/ai/analyze/jobs": "batch",
+        "/api/v1/ai/prefetch": "prefetch"
+    }
+    PRIORITY_TRUST_CLIENT_ID: bool = False  # Key fairness on X-Client-Id; only enable behind a trusted proxy that sets it (default: peer address)
+    
+    # ============================================================================
+    # Speculative Routing
+    # ============================================================================
+    SPECULATIVE_ROUTING: bool = False  # Ask Gemini and Llama at once when routing is unsure
+    SPECULATIVE_CONFIDENCE_THRESHOLD: float = 0.7  # Routing confidence below which to speculate
+    SPECULATIVE_MAX_PER_MINUTE: int = 30  # Speculative dispatches per worker and minute
+    
+    # ============================================================================
+    # Admission Control
+    # ============================================================================
+    ADMISSION_ENABLED: bool = True  # Shed AI requests predicted to miss their deadline (503)
+    ADMISSION_DEADLINES: Dict[str, float] = {  # Seconds per class; classes without one are not shed
+        "bulk": 30.0,
+        "batch": 120.0,
+        "prefetch": 10.0
+    }
+    ADMISSION_INITIAL_LATENCY_SECONDS: float = 3.0  # Assumed upstream call time until measured
+    ADMISSION_LATENCY_ALPHA: float = 0.2  # Weight of the newest call in the latency average
+    
+    # ============================================================================
+    # Background Jobs
+    # ============================================================================
+    JOB_WORKERS: int = 4  # Jobs (e.g. page analysis) running concurrently per worker
+    JOB_QUEUE_SIZE: int = 100  # Waiting jobs; submissions beyond this get 503
+    JOB_TIMEOUT_SECONDS: float = 120.0  # A running job is failed after this
+    JOB_RESULT_TTL_SECONDS: int = 600  # Finished job results stay pollable this long
+    JOB_MAX_STORED: int = 1000  # Finished job results kept in process
+    
+    # ============================================================================
+    # Upstream Connections & Warmup
+    # ============================================================================
+    HTTP_POOL_SIZE: int = 100  # Max pooled connections to the Groq API
+    HTTP_KEEPALIVE_SECONDS: float = 60.0  # Idle keep-alive for pooled connections
+    WARMUP_ENABLED: bool = False  # Warm connections/model handles before reporting ready
+    WARMUP_PROBE: bool = False  # Also send one cheap metadata call per provider
+    WARMUP_TIMEOUT_SECONDS: float = 15.0  # Give up warming (and report ready) after this
+    
+    # ============================================================================
+    # Memory Budget
+    # ============================================================================
+    MEMORY_BUDGET_BYTES: int = 512_000_000  # In-flight request memory per worker; 0 disables
+    MEMORY_COPY_FACTOR: int = 5  # Estimated copies of the body held per request
+    MEMORY_ADMISSION_TIMEOUT_SECONDS: float = 5.0  # Max wait for budget before 503
+    MEMORY_PROFILE_FRAMES: int = 25  # Traceback depth for allocation snapshots
+    
+    # ============================================================================
+    # Event Loop Monitor
+    # ============================================================================
+    LOOP_MONITOR_ENABLED: bool = False  # Measure loop lag and capture blocking stacks
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.1  # Heartbeat interval
+    LOOP_LAG_THRESHOLD_SECONDS: float = 0.1  # Lag that counts as a blocking call
+    LOOP_MONITOR_MAX_EVENTS: int = 50  # Blocking events (with stacks) kept
+    
+    # ============================================================================
+    # Debug Endpoints
+    # ============================================================================
+    DEBUG_TOKEN: str = ""  # Required in X-Debug-Token for /api/v1/debug; empty disables them
+    SLOWLOG_SIZE: int = 50  # Slowest requests kept
+    SLOWLOG_WINDOW_SECONDS: int = 900  # Rolling window for the slow request log
+    SLOWLOG_CAPTURE_PROMPTS: bool = False  # Keep prompt text in slow request entries
+    PROFILE_MAX_SECONDS: int = 60  # Upper bound for one sampling profile
     
     class Config:
         """Pydantic configuration"""
@@ -0,0 +1,114 @@
+"""
+VynceAI Backend - Request Limits
+Per-route request body size limits enforced while the body streams in
+"""
+
+import json
+from typing import Dict, List, Optional, Tuple
+
+from starlette.requests import ClientDisconnect
+
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class BodyLimitMiddleware:
+    """
+    Pure ASGI middleware rejecting oversized request bodies with 413
+
+    - Requests announcing a Content-Length above the limit are rejected
+      before a single body byte is read
+    - Chunked/streamed bodies are counted as they arrive and cut off as
+      soon as they cross the limit, so they are never fully buffered: the
+      413 is sent right away and the app sees a client disconnect (its
+      own error response, if any, is dropped)
+
+    Limits come from BODY_LIMITS (longest matching path prefix wins) and
+    fall back to MAX_BODY_BYTES.
+    """
+
+    def __init__(self, app, limits: Optional[Dict[str, int]] = None, default: Optional[int] = None):
+        self.app = app
+        limits = settings.BODY_LIMITS if limits is None else limits
+        self.default = settings.MAX_BODY_BYTES if default is None else default
+        self.limits: List[Tuple[str, int]] = sorted(limits.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def limit_for(self, path: str) -> int:
+        """Body size limit for a request path"""
+        for prefix, limit in self.limits:
+            if path.startswith(prefix):
+                return limit
+        return self.default
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope["method"] in ("GET", "HEAD", "OPTIONS"):
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.limit_for(scope["path"])
+
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    break
+                if declared > limit:
+                    logger.warning("Rejected %s: Content-Length %s > %s", scope['path'], declared, limit)
+                    await self._reject(send, limit)
+                    return
+                break
+
+        received = 0
+        response_started = False
+        rejected = False
+
+        async def limited_receive():
+            nonlocal received, rejected
+            if rejected:
+                return {"type": "http.disconnect"}
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # Answer here: body parsers turn exceptions raised from
+                    # receive() into their own 400 responses
+                    logger.warning("Rejected %s: streamed body exceeded %s bytes", scope['path'], limit)
+                    rejected = True
+                    if not response_started:
+                        await self._reject(send, limit)
+                    return {"type": "http.disconnect"}
+            return message
+
+        async def tracking_send(message):
+            nonlocal response_started
+            if rejected:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except ClientDisconnect:
+            # Raised by handlers reading the body after the cut-off above
+            if not rejected:
+                raise
+
+    @staticmethod
+    async def _reject(send, limit: int) -> None:
+        body = json.dumps({
+            "detail": f"Request body too large (limit: {limit} bytes)"
+        }).encode("utf-8")
+        await send({
+            "type": "http.response.start",
+            "status": 413,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"connection", b"close"),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
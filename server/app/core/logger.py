@@ -1,12 +1,114 @@
 """
 VynceAI Backend - Logger
 Centralized logging configuration
+
+Module loggers hand records to a shared in-memory queue; a single
+QueueListener thread formats and writes them, so request handlers never
+block on stdout. Messages use %-style arguments and are only formatted by
+the listener, after level checks and sampling have passed.
 """
 
+import atexit
+import itertools
+import json
 import logging
+import queue
 import sys
+from logging.handlers import QueueHandler, QueueListener
 from typing import Optional
 
+from app.core.config import settings
+from app.core.tracing import RequestIdFilter
+
+_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - [%(request_id)s] %(message)s'
+_DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line (for log collectors)"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record, _DATE_FORMAT),
+            "level": record.levelname,
+            "logger": record.name,
+            "request_id": getattr(record, "request_id", "-"),
+            "msg": record.getMessage(),
+        }
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Keep one in every N records at INFO and below
+
+    WARNING and above always pass. Uses a shared counter instead of
+    random() so sampling is cheap and deterministic.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._counter = itertools.count()
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+        if not self.every:
+            return False
+        return next(self._counter) % self.every == 0
+
+
+class DeferredQueueHandler(QueueHandler):
+    """
+    QueueHandler that leaves formatting to the listener thread
+
+    The stock prepare() merges args into the message in the caller's
+    thread. The queue is in-process, so records can be passed as-is.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
+def _build_output_handler() -> logging.Handler:
+    """Handler that actually writes log lines to stdout"""
+    handler = logging.StreamHandler(sys.stdout)
+    if settings.LOG_JSON:
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(_LOG_FORMAT, datefmt=_DATE_FORMAT))
+    return handler
+
+
+def _get_queue_handler() -> QueueHandler:
+    """Shared queue handler, starting the listener thread on first use"""
+    global _queue_handler, _listener
+
+    if _queue_handler is None:
+        log_queue: queue.SimpleQueue = queue.SimpleQueue()
+        _queue_handler = DeferredQueueHandler(log_queue)
+        _listener = QueueListener(log_queue, _build_output_handler(), respect_handler_level=True)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+    return _queue_handler
+
+
+def shutdown_logging() -> None:
+    """Flush queued records and stop the listener thread"""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
 def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     """
     Setup and configure logger
@@ -25,19 +127,21 @@ def setup_logger(name: str, level: int = logging.INFO) -> logging.Logger:
     if logger.handlers:
         return logger
     
-    # Console handler
-    handler = logging.StreamHandler(sys.stdout)
+    if settings.LOG_ASYNC:
+        handler = _get_queue_handler()
+    else:
+        handler = _build_output_handler()
     handler.setLevel(level)
-    
-    # Formatter
-    formatter = logging.Formatter(
-        '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    handler.setFormatter(formatter)
-    
+    if not any(isinstance(f, RequestIdFilter) for f in handler.filters):
+        # Runs in the calling thread/task, where the request context is visible
+        handler.addFilter(RequestIdFilter())
     logger.addHandler(handler)
     
+    # Sample high-volume loggers (longest configured prefix wins)
+    prefixes = [p for p in settings.LOG_SAMPLING if name == p or name.startswith(p + ".")]
+    if prefixes:
+        logger.addFilter(SamplingFilter(settings.LOG_SAMPLING[max(prefixes, key=len)]))
+    
     return logger
 
 def get_logger(name: Optional[str] = None) -> logging.Logger:
@@ -0,0 +1,115 @@
+"""
+VynceAI Backend - Event Loop Monitor
+Measures event-loop scheduling lag and captures the code blocking it
+
+Two parts:
+- a heartbeat task on the loop sleeps for a fixed interval and records
+  how late it wakes up (vynce_event_loop_lag_seconds histogram)
+- a watchdog thread checks the heartbeat; when the loop has not run for
+  longer than the threshold it reads the loop thread's current stack,
+  i.e. the blocking call itself, not whatever runs after it
+
+Optional (LOOP_MONITOR_ENABLED), started from the app lifespan.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import LOOP_BLOCKED_TOTAL, LOOP_LAG
+
+logger = get_logger(__name__)
+
+
+class LoopMonitor:
+    """Event-loop lag histogram plus blocking-stack capture"""
+
+    def __init__(
+        self,
+        interval: Optional[float] = None,
+        threshold: Optional[float] = None,
+        max_events: Optional[int] = None
+    ):
+        self.interval = interval if interval is not None else settings.LOOP_MONITOR_INTERVAL_SECONDS
+        self.threshold = threshold if threshold is not None else settings.LOOP_LAG_THRESHOLD_SECONDS
+        self.events: Deque[Dict[str, Any]] = deque(maxlen=max_events or settings.LOOP_MONITOR_MAX_EVENTS)
+        self._beat = time.perf_counter()
+        self._loop_ident: Optional[int] = None
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        """Start monitoring the running event loop"""
+        if self.running:
+            return
+        self._loop_ident = threading.get_ident()
+        self._beat = time.perf_counter()
+        self._stop.clear()
+        self._task = asyncio.get_running_loop().create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._watchdog.start()
+        logger.info("Event loop monitor started (threshold %sms)", int(self.threshold * 1000))
+
+    async def stop(self) -> None:
+        """Stop the heartbeat task and the watchdog thread"""
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+            self._watchdog = None
+
+    async def _heartbeat(self) -> None:
+        while True:
+            start = time.perf_counter()
+            self._beat = start
+            await asyncio.sleep(self.interval)
+            LOOP_LAG.observe(max(0.0, time.perf_counter() - start - self.interval))
+
+    def _watch(self) -> None:
+        # Expected gap between beats is one interval; anything beyond that is lag
+        captured_beat = None
+        poll = min(self.interval, self.threshold) / 2
+        while not self._stop.wait(poll):
+            beat = self._beat
+            lag = time.perf_counter() - beat - self.interval
+            if lag > self.threshold and beat != captured_beat:
+                captured_beat = beat
+                self._capture(lag)
+
+    def _capture(self, lag: float) -> None:
+        frame = sys._current_frames().get(self._loop_ident)
+        if frame is None:
+            return
+        stack = traceback.format_list(traceback.extract_stack(frame))
+        LOOP_BLOCKED_TOTAL.inc()
+        self.events.append({
+            "timestamp": time.time(),
+            "lag_ms": round(lag * 1000, 1),
+            "stack": [line.rstrip() for line in stack]
+        })
+        logger.warning("Event loop blocked for >%sms at:\n%s", int(lag * 1000), "".join(stack[-3:]).rstrip())
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Recent blocking events, newest first"""
+        return list(reversed(self.events))
+
+
+# Global monitor (started from the app lifespan when enabled)
+loop_monitor = LoopMonitor()
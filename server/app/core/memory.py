@@ -0,0 +1,237 @@
+"""
+VynceAI Backend - Memory Accounting
+Global in-flight byte budget with admission backpressure, and tracemalloc
+snapshots grouped by route
+
+A chat request holds several copies of the page at once: the raw body,
+the PageContext model, the model_dump() dict, the joined prompt and the
+provider JSON payload. Each request therefore reserves
+Content-Length x MEMORY_COPY_FACTOR bytes from MEMORY_BUDGET_BYTES before
+it is read. When the budget is exhausted new requests wait (FIFO) up to
+MEMORY_ADMISSION_TIMEOUT_SECONDS and are then rejected with 503.
+"""
+
+import asyncio
+import json
+import linecache
+import math
+import os
+import tracemalloc
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import MEMORY_ADMISSIONS, MEMORY_IN_FLIGHT
+from app.core.tracing import annotate
+
+logger = get_logger(__name__)
+
+
+class MemoryBudget:
+    """
+    Byte budget shared by all in-flight requests of a worker
+
+    A request larger than the whole budget is still admitted once nothing
+    else is in flight, so oversized (but body-limit compliant) requests
+    are serialized rather than rejected forever.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_flight = 0
+        self._waiters: Deque[Tuple[int, asyncio.Future]] = deque()
+
+    def _fits(self, size: int) -> bool:
+        return self.in_flight == 0 or self.in_flight + size <= self.limit
+
+    def _take(self, size: int) -> None:
+        self.in_flight += size
+        MEMORY_IN_FLIGHT.set(value=self.in_flight)
+
+    async def acquire(self, size: int, timeout: float) -> bool:
+        """
+        Reserve bytes, waiting for capacity if needed
+
+        Args:
+            size: Bytes to reserve
+            timeout: Maximum time to wait for capacity
+
+        Returns:
+            True if reserved, False if the wait timed out
+        """
+        if not self._waiters and self._fits(size):
+            self._take(size)
+            MEMORY_ADMISSIONS.inc("admitted")
+            return True
+
+        future = asyncio.get_running_loop().create_future()
+        entry = (size, future)
+        self._waiters.append(entry)
+        try:
+            await asyncio.wait_for(future, timeout)
+            MEMORY_ADMISSIONS.inc("waited")
+            return True
+        except asyncio.TimeoutError:
+            MEMORY_ADMISSIONS.inc("rejected")
+            return False
+        finally:
+            if entry in self._waiters:
+                self._waiters.remove(entry)
+                # A smaller request queued behind this one may fit now
+                self._wake()
+
+    def release(self, size: int) -> None:
+        """Return bytes to the budget and admit waiting requests"""
+        self.in_flight = max(0, self.in_flight - size)
+        MEMORY_IN_FLIGHT.set(value=self.in_flight)
+        self._wake()
+
+    def _wake(self) -> None:
+        # FIFO: a large request at the head is not starved by smaller ones
+        while self._waiters:
+            size, future = self._waiters[0]
+            if future.done():
+                self._waiters.popleft()
+                continue
+            if not self._fits(size):
+                break
+            self._waiters.popleft()
+            self._take(size)
+            future.set_result(True)
+
+
+# Global budget for this worker
+memory_budget = MemoryBudget(settings.MEMORY_BUDGET_BYTES)
+
+
+class MemoryBudgetMiddleware:
+    """
+    Pure ASGI middleware reserving each request body's estimated memory
+    footprint from the global budget for the lifetime of the request
+
+    Requests without a Content-Length reserve as if they were MAX_BODY_BYTES.
+    """
+
+    def __init__(self, app, budget: Optional[MemoryBudget] = None):
+        self.app = app
+        self.budget = budget or memory_budget
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or self.budget.limit <= 0 or scope["method"] in ("GET", "HEAD", "OPTIONS"):
+            await self.app(scope, receive, send)
+            return
+
+        declared = settings.MAX_BODY_BYTES
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    pass
+                break
+
+        reserved = declared * settings.MEMORY_COPY_FACTOR
+        if not await self.budget.acquire(reserved, settings.MEMORY_ADMISSION_TIMEOUT_SECONDS):
+            logger.warning("Rejected %s: memory budget exhausted (%s bytes in flight)", scope["path"], self.budget.in_flight)
+            await self._reject(send)
+            return
+
+        annotate(reserved_bytes=reserved)
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            self.budget.release(reserved)
+
+    @staticmethod
+    async def _reject(send) -> None:
+        body = json.dumps({
+            "detail": "Server is busy, please retry shortly"
+        }).encode("utf-8")
+        retry_after = max(1, math.ceil(settings.MEMORY_ADMISSION_TIMEOUT_SECONDS))
+        await send({
+            "type": "http.response.start",
+            "status": 503,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(body)).encode("ascii")),
+                (b"retry-after", str(retry_after).encode("ascii")),
+            ],
+        })
+        await send({"type": "http.response.body", "body": body})
+
+
+# ============================================================================
+# Allocation profiling
+# ============================================================================
+
+def _endpoint_ranges(routes: List[Any]) -> List[Tuple[str, int, int, str]]:
+    """(filename, first line, last line, route path) for each endpoint function"""
+    ranges = []
+    for route in routes:
+        endpoint = getattr(route, "endpoint", None)
+        endpoint = getattr(endpoint, "__wrapped__", endpoint)
+        code = getattr(endpoint, "__code__", None)
+        if code is None:
+            continue
+        last_line = max((line for _, _, line in code.co_lines() if line is not None), default=code.co_firstlineno)
+        ranges.append((code.co_filename, code.co_firstlineno, last_line, route.path))
+    return ranges
+
+
+def _route_for(traceback: tracemalloc.Traceback, ranges: List[Tuple[str, int, int, str]]) -> str:
+    for frame in traceback:
+        for filename, first, last, path in ranges:
+            if first <= frame.lineno <= last and frame.filename == filename:
+                return path
+    return "unattributed"
+
+
+def top_allocations_by_route(snapshot: tracemalloc.Snapshot, routes: List[Any], limit: int = 10) -> Dict[str, Any]:
+    """
+    Group live allocations by the route whose endpoint is on their traceback
+
+    Coroutine frames are on the stack while the endpoint runs, so anything
+    allocated inside an endpoint (and the services it awaits) is attributed
+    to its route. Body parsing/validation before the endpoint and work in
+    worker threads shows up as "unattributed".
+
+    Args:
+        snapshot: tracemalloc snapshot taken with enough traceback frames
+        routes: Application routes (app.routes)
+        limit: Allocation sites reported per route
+
+    Returns:
+        Mapping of route -> total bytes and top allocation sites
+    """
+    ranges = _endpoint_ranges(routes)
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+    ))
+
+    sites: Dict[str, Dict[Tuple[str, int], List[int]]] = defaultdict(lambda: defaultdict(lambda: [0, 0]))
+    for trace in snapshot.traces:
+        route = _route_for(trace.traceback, ranges)
+        # Frames run oldest to newest; the newest is the allocation site
+        frame = trace.traceback[-1]
+        site = sites[route][(frame.filename, frame.lineno)]
+        site[0] += trace.size
+        site[1] += 1
+
+    report = {}
+    for route, route_sites in sites.items():
+        ranked = sorted(route_sites.items(), key=lambda item: -item[1][0])
+        report[route] = {
+            "total_bytes": sum(size for size, _ in route_sites.values()),
+            "top": [
+                {
+                    "site": f"{os.path.relpath(filename) if not filename.startswith('<') else filename}:{lineno}",
+                    "code": linecache.getline(filename, lineno).strip(),
+                    "bytes": size,
+                    "count": count
+                }
+                for (filename, lineno), (size, count) in ranked[:limit]
+            ]
+        }
+    return dict(sorted(report.items(), key=lambda item: -item[1]["total_bytes"]))
@@ -0,0 +1,279 @@
+"""
+VynceAI Backend - Metrics
+In-process metrics registry with Prometheus text exposition
+
+No external services or client library. Updates are plain dict/list
+operations without locks: every instrumented call site runs on the event
+loop thread (provider SDK calls return to the loop before being recorded),
+so there is a single writer per process.
+"""
+
+import time
+from bisect import bisect_left
+from typing import Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+from app.core.tracing import current_trace
+
+# Latency buckets in seconds (upstream LLM calls run from ~100 ms to tens of seconds)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    """Base class: name, help text and label names"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label set"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help_text, labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        self.values[labels] = self.values.get(labels, 0.0) + amount
+
+    def get(self, *labels: str) -> float:
+        return self.values.get(labels, 0.0)
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}"
+            for labels, value in self.values.items()
+        ]
+
+
+class Gauge(Counter):
+    """Value that can go up and down per label set"""
+
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.values[labels] = self.values.get(labels, 0.0) - amount
+
+    def set(self, *labels: str, value: float) -> None:
+        self.values[labels] = value
+
+
+class Histogram(_Metric):
+    """Cumulative bucket histogram per label set"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [per-bucket counts..., +Inf count, sum]
+        self.values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        series = self.values.get(labels)
+        if series is None:
+            series = self.values[labels] = [0] * (len(self.buckets) + 1) + [0.0]
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def count(self, *labels: str) -> int:
+        series = self.values.get(labels)
+        return int(sum(series[:-1])) if series else 0
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for labels, series in self.values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(self.labelnames, labels)} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{_format_labels(self.labelnames, labels)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Holds all metrics of the process and renders them"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, labelnames))
+
+    def gauge(self, name: str, help_text: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, help_text, labelnames))
+
+    def histogram(self, name: str, help_text: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, help_text, labelnames, buckets))
+
+    def render(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+# Global registry
+metrics = MetricsRegistry()
+
+# ============================================================================
+# Well-known metrics
+# ============================================================================
+
+REQUESTS_TOTAL = metrics.counter(
+    "vynce_http_requests_total", "HTTP requests by route, method and status", ("route", "method", "status"))
+REQUEST_LATENCY = metrics.histogram(
+    "vynce_http_request_duration_seconds", "HTTP request latency by route", ("route",))
+REQUESTS_IN_FLIGHT = metrics.gauge(
+    "vynce_http_requests_in_flight", "HTTP requests currently being served by path prefix", ("route",))
+WS_REQUESTS_IN_FLIGHT = metrics.gauge(
+    "vynce_ws_requests_in_flight", "WebSocket chat and summarize requests currently being served")
+UPSTREAM_LATENCY = metrics.histogram(
+    "vynce_upstream_duration_seconds", "LLM provider call latency", ("provider",))
+UPSTREAM_TTFT = metrics.histogram(
+    "vynce_upstream_time_to_first_token_seconds", "Time to first streamed token", ("provider",))
+ROUTING_DECISIONS = metrics.counter(
+    "vynce_routing_decisions_total", "Query routing decisions by provider", ("provider",))
+SPECULATIVE_DISPATCHES = metrics.counter(
+    "vynce_speculative_dispatches_total", "Dual-model dispatches by answering provider, or budget_exhausted", ("result",))
+CACHE_REQUESTS = metrics.counter(
+    "vynce_cache_requests_total", "Cache lookups by cache and result (hit/miss)", ("cache", "result"))
+ERRORS_TOTAL = metrics.counter(
+    "vynce_errors_total", "Errors by type", ("type",))
+MEMORY_IN_FLIGHT = metrics.gauge(
+    "vynce_memory_inflight_bytes", "Estimated request memory reserved from the budget")
+MEMORY_ADMISSIONS = metrics.counter(
+    "vynce_memory_admissions_total", "Memory budget admissions by result (admitted/waited/rejected)", ("result",))
+PREFETCH_JOBS = metrics.counter(
+    "vynce_prefetch_jobs_total", "Prefetch submissions and outcomes (queued/duplicate/cached/skipped/full/done/failed)", ("result",))
+SCHEDULER_QUEUE_WAIT = metrics.histogram(
+    "vynce_scheduler_queue_wait_seconds", "Time upstream calls waited for a slot", ("class",))
+SCHEDULER_QUEUED = metrics.gauge(
+    "vynce_scheduler_queued", "Upstream calls waiting for a slot", ("class",))
+SCHEDULER_GRANTS = metrics.counter(
+    "vynce_scheduler_grants_total", "Upstream slots granted by class and reason (immediate/fair/aged)", ("class", "reason"))
+ADMISSION_DECISIONS = metrics.counter(
+    "vynce_admission_decisions_total", "Admission decisions by class and result (admitted/shed)", ("class", "result"))
+ADMISSION_LATENCY_ESTIMATE = metrics.gauge(
+    "vynce_admission_latency_estimate_seconds", "Moving average of upstream call time used for admission")
+JOBS_TOTAL = metrics.counter(
+    "vynce_jobs_total", "Background jobs by kind and outcome (submitted/rejected/done/failed/cancelled)", ("kind", "result"))
+JOBS_RUNNING = metrics.gauge(
+    "vynce_jobs_running", "Background jobs currently running")
+LOOP_LAG = metrics.histogram(
+    "vynce_event_loop_lag_seconds", "Event loop scheduling lag",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0))
+LOOP_BLOCKED_TOTAL = metrics.counter(
+    "vynce_event_loop_blocked_total", "Event loop stalls above the lag threshold")
+
+
+def record_cache(cache: str, hit: bool) -> None:
+    """Count a cache lookup (and note it on the current request's trace)"""
+    result = "hit" if hit else "miss"
+    CACHE_REQUESTS.inc(cache, result)
+    trace = current_trace()
+    if trace is not None:
+        trace.attrs.setdefault("cache", {})[cache] = result
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording request count, latency and in-flight
+    requests per route template (e.g. /api/v1/ai/session/{session_id}),
+    keeping label cardinality bounded
+
+    In-flight requests are labelled by path prefix (/api/v1/ai/chat), since
+    route templates are only known after routing. Only prefixes of the
+    app's own routes are used; other /api/ paths count as "unmatched" and
+    everything else as "other".
+    """
+
+    def __init__(self, app):
+        self.app = app
+        self._prefixes: Optional[FrozenSet[str]] = None
+
+    def in_flight_route(self, scope) -> str:
+        """In-flight label: a known route prefix, "unmatched" (other /api/ paths) or "other" """
+        path = scope["path"]
+        if not path.startswith("/api/"):
+            return "other"
+        if self._prefixes is None:
+            routes = getattr(scope.get("app"), "routes", None)
+            if routes is None:
+                return "unmatched"
+            self._prefixes = frozenset(
+                prefix for prefix in ("/".join(route.path.split("/")[:5]) for route in routes if hasattr(route, "path"))
+                if prefix.startswith("/api/") and "{" not in prefix
+            )
+        prefix = "/".join(path.split("/")[:5])
+        return prefix if prefix in self._prefixes else "unmatched"
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = "500"
+        start = time.perf_counter()
+        in_flight_route = self.in_flight_route(scope)
+        REQUESTS_IN_FLIGHT.inc(in_flight_route)
+
+        async def tracking_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = str(message["status"])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, tracking_send)
+        except Exception as e:
+            ERRORS_TOTAL.inc(type(e).__name__)
+            raise
+        finally:
+            REQUESTS_IN_FLIGHT.dec(in_flight_route)
+            route = scope.get("route")
+            route_path = getattr(route, "path", None) or "unmatched"
+            REQUESTS_TOTAL.inc(route_path, scope["method"], status)
+            REQUEST_LATENCY.observe(time.perf_counter() - start, route_path)
+            if status.startswith("5"):
+                ERRORS_TOTAL.inc(f"http_{status}")
@@ -0,0 +1,80 @@
+"""
+VynceAI Backend - Sampling Profiler
+On-demand stack sampling of all threads, in collapsed-stack format
+
+A profile runs in its own daemon thread that wakes every interval and
+reads sys._current_frames(), so the event loop thread and the
+asyncio.to_thread workers (Gemini SDK calls) are all covered. Nothing
+runs between profiles, so leaving the endpoint enabled costs nothing when
+idle. Output is one `thread;outer;...;inner count` line per unique stack,
+the input format of flamegraph.pl, speedscope and inferno.
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from types import FrameType
+from typing import Dict, Optional
+
+_profile_lock = threading.Lock()
+
+
+class ProfilerBusy(Exception):
+    """Raised when a profile is already running"""
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _collapse(frame: Optional[FrameType], thread_name: str) -> str:
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.append(thread_name)
+    # Collapsed stacks are ordered root first; ';' is the frame separator
+    return ";".join(label.replace(";", ":") for label in reversed(labels))
+
+
+def sample_profile(seconds: float, interval: float = 0.005) -> Dict[str, int]:
+    """
+    Sample the stacks of all threads for a while (blocking)
+
+    Args:
+        seconds: How long to sample
+        interval: Delay between samples
+
+    Returns:
+        Mapping of collapsed stack -> sample count
+
+    Raises:
+        ProfilerBusy: If another profile is in progress
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy("A profile is already running")
+
+    try:
+        own_ident = threading.get_ident()
+        stacks: Counter = Counter()
+        deadline = time.monotonic() + seconds
+
+        while time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for ident, frame in sys._current_frames().items():
+                if ident != own_ident:
+                    stacks[_collapse(frame, names.get(ident, f"thread-{ident}"))] += 1
+            time.sleep(interval)
+
+        return dict(stacks)
+    finally:
+        _profile_lock.release()
+
+
+def render_collapsed(stacks: Dict[str, int]) -> str:
+    """Collapsed-stack text, most frequent stacks first"""
+    lines = [f"{stack} {count}" for stack, count in sorted(stacks.items(), key=lambda item: -item[1])]
+    return "\n".join(lines) + "\n"
@@ -0,0 +1,294 @@
+"""
+VynceAI Backend - Upstream Scheduler
+Priority classes and weighted fair queuing in front of provider calls
+
+Every upstream LLM call takes one of SCHEDULER_MAX_CONCURRENCY slots. While
+slots are free, calls start immediately. Once they are all taken, waiting
+calls are granted slots in two fair-queuing steps:
+
+- across priority classes (interactive, bulk, batch, prefetch) in
+  proportion to PRIORITY_WEIGHTS (stride scheduling), so chat keeps most of
+  the capacity without shutting the other classes out;
+- within a class, round-robin across client IDs (virtual finish tags), so
+  one heavy client only delays its own calls.
+
+A call that has waited longer than SCHEDULER_MAX_WAIT_SECONDS is served
+next regardless of weights (starvation protection). The class and client
+of the current request are set by PriorityMiddleware from PRIORITY_ROUTES
+and the client address.
+
+The X-Client-Id header is ignored by default: a client rotating it would
+get a fresh fair share per value. Set PRIORITY_TRUST_CLIENT_ID=True only
+behind a trusted proxy that sets (or strips) the header, where it
+identifies users better than the proxy's own address.
+"""
+
+import asyncio
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import SCHEDULER_GRANTS, SCHEDULER_QUEUED, SCHEDULER_QUEUE_WAIT
+from app.core.tracing import annotate, stage
+
+logger = get_logger(__name__)
+
+DEFAULT_CLASS = "interactive"
+DEFAULT_CLIENT = "anonymous"
+
+_priority: ContextVar[Tuple[str, str]] = ContextVar("vynce_priority", default=(DEFAULT_CLASS, DEFAULT_CLIENT))
+
+
+def current_priority() -> Tuple[str, str]:
+    """(priority class, client ID) of the current request or task"""
+    return _priority.get()
+
+
+@contextmanager
+def priority(request_class: str, client: Optional[str] = None) -> Iterator[None]:
+    """Run the enclosed code (and tasks it creates) as the given class and client"""
+    token = _priority.set((request_class, client or current_priority()[1]))
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+class _Waiter:
+    __slots__ = ("future", "enqueued")
+
+    def __init__(self, future: asyncio.Future):
+        self.future = future
+        self.enqueued = time.monotonic()
+
+
+class _ClassQueue:
+    """Waiting calls of one priority class, per client"""
+
+    def __init__(self, weight: float):
+        self.weight = weight
+        self.pass_value = 0.0  # stride scheduling position of the class
+        self.clock = 0.0  # virtual time of the last client served
+        self.clients: Dict[str, Deque[_Waiter]] = {}
+        self.finish: Dict[str, float] = {}  # client -> virtual finish tag
+
+    def __len__(self) -> int:
+        return sum(len(waiters) for waiters in self.clients.values())
+
+    def next_client(self) -> str:
+        return min(self.clients, key=lambda client: self.finish.get(client, self.clock))
+
+
+class FairScheduler:
+    """Concurrency slots granted by priority class and client"""
+
+    def __init__(self, capacity: int, weights: Dict[str, float], max_wait: float):
+        self.capacity = capacity
+        self.weights = weights
+        self.max_wait = max_wait
+        self.active = 0
+        self._queues: Dict[str, _ClassQueue] = {}
+        self._clock = 0.0  # pass value of the last class served
+
+    @property
+    def waiting(self) -> int:
+        return sum(len(queue) for queue in self._queues.values())
+
+    def weight(self, request_class: str) -> float:
+        """Fair-queuing weight of a priority class (higher is served sooner)"""
+        return max(self.weights.get(request_class, self.weights.get(DEFAULT_CLASS, 1.0)), 1e-3)
+
+    def queue_depths(self) -> Dict[str, int]:
+        """Waiting calls per priority class"""
+        return {name: len(queue) for name, queue in self._queues.items() if len(queue)}
+
+    def calls_ahead(self, request_class: str) -> float:
+        """
+        Calls that would start before a new call of this class
+
+        Running calls plus the waiting calls fair queuing would serve first:
+        all waiting calls of the same class, and of each other class about
+        its weight ratio's share of them.
+        """
+        weight = self._queue(request_class).weight
+        own = len(self._queues[request_class])
+        ahead = float(own)
+        for name, queue in self._queues.items():
+            if name != request_class:
+                ahead += min(len(queue), (own + 1) * queue.weight / weight)
+        return self.active + ahead
+
+    @asynccontextmanager
+    async def slot(self, request_class: Optional[str] = None, client: Optional[str] = None) -> AsyncIterator[None]:
+        """
+        Hold one upstream slot for the enclosed call
+
+        Args:
+            request_class: Priority class (defaults to the current request's)
+            client: Client ID (defaults to the current request's)
+        """
+        default_class, default_client = current_priority()
+        request_class = request_class or default_class
+        client = client or default_client
+        if self.capacity <= 0:
+            yield
+            return
+
+        await self.acquire(request_class, client)
+        try:
+            yield
+        finally:
+            self.release()
+
+    async def acquire(self, request_class: str, client: str) -> None:
+        """Wait for a slot (see slot(), which also releases it)"""
+        if self.active < self.capacity and not self.waiting:
+            self.active += 1
+            SCHEDULER_GRANTS.inc(request_class, "immediate")
+            SCHEDULER_QUEUE_WAIT.observe(0.0, request_class)
+            return
+
+        queue = self._queue(request_class)
+        if not len(queue):
+            # A class that was idle rejoins at the current position instead
+            # of spending credit saved up while it had nothing to send
+            queue.pass_value = max(queue.pass_value, self._clock)
+        if client not in queue.clients:
+            queue.clients[client] = deque()
+            queue.finish[client] = max(queue.finish.get(client, 0.0), queue.clock)
+        waiter = _Waiter(asyncio.get_running_loop().create_future())
+        queue.clients[client].append(waiter)
+        SCHEDULER_QUEUED.inc(request_class)
+
+        with stage("queue"):
+            try:
+                await waiter.future
+            except asyncio.CancelledError:
+                if waiter.future.done() and not waiter.future.cancelled():
+                    # Granted just as the caller gave up: pass the slot on
+                    self.release()
+                else:
+                    self._discard(request_class, client, waiter)
+                raise
+        waited = time.monotonic() - waiter.enqueued
+        SCHEDULER_QUEUE_WAIT.observe(waited, request_class)
+        annotate(queue_class=request_class, queue_wait_ms=round(waited * 1000, 1))
+
+    def release(self) -> None:
+        """Return a slot and grant it to the next waiting call"""
+        self.active -= 1
+        while self.active < self.capacity and self.waiting:
+            if self._grant_next():
+                self.active += 1
+
+    def _queue(self, request_class: str) -> _ClassQueue:
+        queue = self._queues.get(request_class)
+        if queue is None:
+            queue = self._queues[request_class] = _ClassQueue(self.weight(request_class))
+        return queue
+
+    def _discard(self, request_class: str, client: str, waiter: _Waiter) -> None:
+        queue = self._queues[request_class]
+        waiters = queue.clients.get(client)
+        if waiters is not None and waiter in waiters:
+            waiters.remove(waiter)
+            SCHEDULER_QUEUED.dec(request_class)
+            if not waiters:
+                del queue.clients[client]
+
+    def _overdue(self) -> Optional[Tuple[str, str]]:
+        """(class, client) of the longest-waiting call past max_wait, if any"""
+        if self.max_wait <= 0:
+            return None
+        deadline = time.monotonic() - self.max_wait
+        oldest: Optional[Tuple[float, str, str]] = None
+        for name, queue in self._queues.items():
+            for client, waiters in queue.clients.items():
+                enqueued = waiters[0].enqueued
+                if enqueued <= deadline and (oldest is None or enqueued < oldest[0]):
+                    oldest = (enqueued, name, client)
+        return oldest[1:] if oldest else None
+
+    def _grant_next(self) -> bool:
+        """Grant the next waiting call; False if it had already given up"""
+        overdue = self._overdue()
+        if overdue is not None:
+            name, client = overdue
+            reason = "aged"
+        else:
+            name = min((n for n, q in self._queues.items() if q.clients), key=lambda n: self._queues[n].pass_value)
+            client = self._queues[name].next_client()
+            reason = "fair"
+
+        queue = self._queues[name]
+        waiters = queue.clients[client]
+        waiter = waiters.popleft()
+        if not waiters:
+            del queue.clients[client]
+        SCHEDULER_QUEUED.dec(name)
+
+        # Advance the class and client positions
+        self._clock = queue.pass_value
+        queue.pass_value += 1.0 / queue.weight
+        queue.clock = queue.finish[client]
+        queue.finish[client] += 1.0
+        if len(queue.finish) > 4 * len(queue.clients) + 64:
+            # Forget idle clients; they rejoin at the current virtual time
+            queue.finish = {c: tag for c, tag in queue.finish.items() if c in queue.clients}
+
+        if waiter.future.done():
+            return False
+        waiter.future.set_result(True)
+        SCHEDULER_GRANTS.inc(name, reason)
+        return True
+
+
+# Global scheduler for this worker
+upstream_scheduler = FairScheduler(
+    settings.SCHEDULER_MAX_CONCURRENCY,
+    settings.PRIORITY_WEIGHTS,
+    settings.SCHEDULER_MAX_WAIT_SECONDS
+)
+
+
+class PriorityMiddleware:
+    """
+    Pure ASGI middleware tagging each request with its priority class and client
+
+    Classes come from PRIORITY_ROUTES (longest matching path prefix wins)
+    and default to "interactive"; the client is the client address, or the
+    X-Client-Id header when PRIORITY_TRUST_CLIENT_ID is enabled.
+    """
+
+    def __init__(self, app, routes: Optional[Dict[str, str]] = None, trust_client_id: Optional[bool] = None):
+        self.app = app
+        self.trust_client_id = settings.PRIORITY_TRUST_CLIENT_ID if trust_client_id is None else trust_client_id
+        routes = settings.PRIORITY_ROUTES if routes is None else routes
+        self.routes: List[Tuple[str, str]] = sorted(routes.items(), key=lambda item: len(item[0]), reverse=True)
+
+    def class_for(self, path: str) -> str:
+        """Priority class for a request path"""
+        for prefix, request_class in self.routes:
+            if path.startswith(prefix):
+                return request_class
+        return DEFAULT_CLASS
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            await self.app(scope, receive, send)
+            return
+
+        with priority(self.class_for(scope["path"]), self.client_for(scope)):
+            await self.app(scope, receive, send)
+
+    def client_for(self, scope) -> str:
+        """Client ID for fair queuing: X-Client-Id if trusted, else the peer address"""
+        if self.trust_client_id:
+            for name, value in scope["headers"]:
+                if name == b"x-client-id" and value:
+                    return value.decode("latin-1")[:64]
+        return scope["client"][0] if scope.get("client") else DEFAULT_CLIENT
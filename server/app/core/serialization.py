@@ -0,0 +1,87 @@
+"""
+VynceAI Backend - Serialization
+Optional orjson fast path for request decoding and response encoding
+
+Enabled with FAST_JSON=True. When orjson is not installed the standard
+FastAPI/Starlette JSON handling is used unchanged.
+"""
+
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Type
+
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+from pydantic import BaseModel
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.tracing import TimedRoute
+
+logger = get_logger(__name__)
+
+# Import orjson (optional)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+    logger.warning("orjson not installed, FAST_JSON disabled. Run: pip install orjson")
+
+
+def fast_json_enabled() -> bool:
+    """Whether the orjson fast path is active"""
+    return settings.FAST_JSON and ORJSON_AVAILABLE
+
+
+class FastJSONRequest(Request):
+    """Request that decodes JSON bodies with orjson"""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            # orjson.JSONDecodeError subclasses json.JSONDecodeError, so FastAPI
+            # still turns malformed bodies into 422 responses
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class FastJSONRoute(TimedRoute):
+    """Timed route that swaps in FastJSONRequest when the fast path is enabled"""
+
+    def get_route_handler(self) -> Callable:
+        original_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            if fast_json_enabled():
+                request = FastJSONRequest(request.scope, request.receive)
+            return await original_handler(request)
+
+        return route_handler
+
+
+@lru_cache(maxsize=None)
+def _model_defaults(model: Type[BaseModel]) -> Dict[str, Any]:
+    """Default values of a response model's optional fields"""
+    return {
+        name: field.default
+        for name, field in model.model_fields.items()
+        if not field.is_required()
+    }
+
+
+def respond(payload: Dict[str, Any], model: Optional[Type[BaseModel]] = None) -> Any:
+    """
+    Build an endpoint response, skipping Pydantic on the fast path
+
+    Args:
+        payload: Response data
+        model: Optional response model (used for validation or defaults)
+
+    Returns:
+        ORJSONResponse when FAST_JSON is active, otherwise the model
+        instance (or the payload itself) for FastAPI to serialize
+    """
+    if fast_json_enabled():
+        if model is not None:
+            payload = {**_model_defaults(model), **payload}
+        return ORJSONResponse(payload)
+    return model(**payload) if model is not None else payload
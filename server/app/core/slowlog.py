@@ -0,0 +1,114 @@
+"""
+VynceAI Backend - Slow Request Log
+Bounded buffer of the slowest recent requests with their full timing
+
+Keeps the SLOWLOG_SIZE slowest requests seen in the last
+SLOWLOG_WINDOW_SECONDS as a min-heap keyed by duration, so a request
+faster than the current minimum is rejected without scanning the buffer
+once it is full. Entries also sit in a deque in arrival order; expiry pops
+them from its front and the heap drops them lazily when they reach its
+top, so recording costs amortized O(log n). Entries hold sizes, routing
+and stage timings; prompt text is only kept when SLOWLOG_CAPTURE_PROMPTS
+is enabled.
+"""
+
+import heapq
+import itertools
+import time
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from app.core.config import settings
+
+
+class SlowRequestLog:
+    """Slowest N requests over a rolling time window"""
+
+    def __init__(self, size: Optional[int] = None, window_seconds: Optional[float] = None):
+        self.size = size if size is not None else settings.SLOWLOG_SIZE
+        self.window = window_seconds if window_seconds is not None else settings.SLOWLOG_WINDOW_SECONDS
+        # (duration, seq, entry); seq breaks ties so entries are never compared
+        self._heap: List[Tuple[float, int, Dict[str, Any]]] = []
+        # (seq, entry) in arrival order, i.e. by timestamp
+        self._order: Deque[Tuple[int, Dict[str, Any]]] = deque()
+        # Seqs of entries neither evicted nor expired; other heap items are dead
+        self._live: Set[int] = set()
+        self._seq = itertools.count()
+
+    def __len__(self) -> int:
+        return len(self._live)
+
+    def record(self, trace: Any, route: str, method: str, status: int) -> None:
+        """
+        Offer a finished request to the log
+
+        Args:
+            trace: The request's Trace (stages and attributes)
+            route: Route template, e.g. /api/v1/ai/chat
+            method: HTTP method
+            status: Response status code
+        """
+        if self.size <= 0:
+            return
+
+        duration = time.perf_counter() - trace.start
+        self._expire()
+        if len(self._live) >= self.size and duration <= self._heap[0][0]:
+            return
+
+        attrs = dict(trace.attrs)
+        if not settings.SLOWLOG_CAPTURE_PROMPTS:
+            attrs.pop("prompt", None)
+        # Per provider: concurrent speculative calls to two providers are not retries
+        upstream_calls = Counter(name for name, _ in trace.stages if name.startswith("upstream"))
+
+        entry = {
+            "request_id": trace.request_id,
+            "timestamp": time.time(),
+            "route": route,
+            "method": method,
+            "status": status,
+            "duration_ms": round(duration * 1000, 2),
+            "stages": [{"name": name, "ms": round(seconds * 1000, 2)} for name, seconds in trace.stages],
+            "retries": sum(calls - 1 for calls in upstream_calls.values()),
+            **attrs,
+        }
+
+        seq = next(self._seq)
+        if len(self._live) < self.size:
+            heapq.heappush(self._heap, (duration, seq, entry))
+        else:
+            _, evicted, _ = heapq.heapreplace(self._heap, (duration, seq, entry))
+            self._live.discard(evicted)
+        self._live.add(seq)
+        self._order.append((seq, entry))
+        # Evicted entries stay in the deque and dead ones deep in the heap
+        # surface slowly; rebuild both (amortized O(1)) before they pile up
+        if max(len(self._order), len(self._heap)) > 2 * self.size:
+            self._order = deque(item for item in self._order if item[0] in self._live)
+            self._heap = [item for item in self._heap if item[1] in self._live]
+            heapq.heapify(self._heap)
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """Entries in the current window, slowest first"""
+        self._expire()
+        live = [item for item in self._heap if item[1] in self._live]
+        return [entry for _, _, entry in sorted(live, key=lambda item: item[0], reverse=True)]
+
+    def clear(self) -> None:
+        self._heap.clear()
+        self._order.clear()
+        self._live.clear()
+
+    def _expire(self) -> None:
+        """Drop entries older than the window, oldest first"""
+        cutoff = time.time() - self.window
+        while self._order and self._order[0][1]["timestamp"] < cutoff:
+            self._live.discard(self._order.popleft()[0])
+        # Keep a live entry at the top of the heap for the minimum check
+        while self._heap and self._heap[0][1] not in self._live:
+            heapq.heappop(self._heap)
+
+
+# Global slow request log
+slow_requests = SlowRequestLog()
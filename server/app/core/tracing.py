@@ -0,0 +1,195 @@
+"""
+VynceAI Backend - Tracing
+Lightweight per-request stage timing and request IDs
+
+Each HTTP request gets a Trace stored in a context variable. Code on the
+request path wraps its stages in `with stage("name"):`, and the collected
+durations are returned in a Server-Timing header together with an
+X-Request-ID header. The request ID is also attached to every log record.
+Recording a stage costs two perf_counter() calls and a list append.
+Request attributes (provider, model, sizes) are attached with annotate()
+and end up in the slow-request log.
+"""
+
+import asyncio
+import functools
+import logging
+import re
+import secrets
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+from app.core.slowlog import slow_requests
+
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+class Trace:
+    """Stage timings collected for one request"""
+
+    __slots__ = ("request_id", "start", "stages", "attrs", "_mark")
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.start = time.perf_counter()
+        self.stages: List[Tuple[str, float]] = []
+        self.attrs: Dict[str, Any] = {}
+        self._mark = self.start
+
+    def add(self, name: str, seconds: float) -> None:
+        """Record a stage duration (stages may repeat, e.g. retries)"""
+        self.stages.append((name, seconds))
+
+    def server_timing(self) -> str:
+        """Server-Timing header value (durations in milliseconds)"""
+        total = time.perf_counter() - self.start
+        parts = [f"{name};dur={seconds * 1000:.2f}" for name, seconds in self.stages]
+        parts.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(parts)
+
+
+_current_trace: ContextVar[Optional[Trace]] = ContextVar("vynce_trace", default=None)
+
+
+def current_trace() -> Optional[Trace]:
+    """Trace of the request being handled, if any"""
+    return _current_trace.get()
+
+
+def current_request_id() -> str:
+    """Request ID of the request being handled, or '-'"""
+    trace = _current_trace.get()
+    return trace.request_id if trace is not None else "-"
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Time a block as a named stage of the current request
+
+    A no-op (apart from the context variable lookup) outside a request.
+    """
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        trace.add(name, time.perf_counter() - start)
+
+
+def annotate(**attrs: Any) -> None:
+    """Attach attributes to the current request's trace (no-op outside a request)"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.attrs.update(attrs)
+
+
+class RequestIdFilter(logging.Filter):
+    """Attach the current request ID to log records as record.request_id"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        record.request_id = current_request_id()
+        return True
+
+
+class TimedRoute(APIRoute):
+    """
+    APIRoute splitting handler time into validate / endpoint / serialize
+
+    - validate: body decoding and Pydantic validation before the endpoint
+    - serialize: response model validation and encoding after it
+    The endpoint itself records finer stages (routing, prompt, upstream).
+    """
+
+    def __init__(self, path: str, endpoint: Callable, **kwargs):
+        # Only async endpoints are wrapped; sync ones must stay sync so
+        # FastAPI keeps running them in the threadpool. include_router()
+        # re-creates routes from the already wrapped endpoint, so wrap once.
+        if asyncio.iscoroutinefunction(endpoint) and not getattr(endpoint, "_timed", False):
+            endpoint = self._timed(endpoint)
+        super().__init__(path, endpoint, **kwargs)
+
+    @staticmethod
+    def _timed(endpoint: Callable) -> Callable:
+        @functools.wraps(endpoint)
+        async def timed_endpoint(*args, **kwargs):
+            trace = _current_trace.get()
+            if trace is not None:
+                trace.add("validate", time.perf_counter() - trace._mark)
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                if trace is not None:
+                    trace._mark = time.perf_counter()
+
+        timed_endpoint._timed = True
+        return timed_endpoint
+
+    def get_route_handler(self) -> Callable:
+        original_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            trace = _current_trace.get()
+            if trace is not None:
+                trace._mark = time.perf_counter()
+            response = await original_handler(request)
+            if trace is not None:
+                trace.add("serialize", time.perf_counter() - trace._mark)
+            return response
+
+        return route_handler
+
+
+class TracingMiddleware:
+    """
+    Pure ASGI middleware creating the request Trace and adding
+    Server-Timing and X-Request-ID headers to the response
+
+    An incoming X-Request-ID header is reused when well-formed so IDs can
+    be correlated with the extension's own logs.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                candidate = value.decode("latin-1")
+                if _REQUEST_ID_RE.match(candidate):
+                    request_id = candidate
+                break
+
+        trace = Trace(request_id or secrets.token_hex(8))
+        token = _current_trace.set(trace)
+        status = 500
+
+        async def timing_send(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", trace.server_timing().encode("latin-1")))
+                headers.append((b"x-request-id", trace.request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, timing_send)
+        finally:
+            _current_trace.reset(token)
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            slow_requests.record(trace, route, scope["method"], status)
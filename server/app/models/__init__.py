@@ -5,8 +5,15 @@ Data models and schemas
 from .schemas import (
     AIRequest, 
     AIResponse, 
+    TabsIndexRequest,
+    PrefetchRequest,
     CommandRequest, 
     CommandResponse,
+    CommandPlanRequest,
+    CommandPlanResponse,
+    ExtractRequest,
+    ExtractResponse,
+    PlanStep,
     PageContext,
     MemoryItem,
     HealthResponse,
@@ -16,8 +23,15 @@ from .schemas import (
 __all__ = [
     "AIRequest", 
     "AIResponse", 
+    "TabsIndexRequest",
+    "PrefetchRequest",
     "CommandRequest", 
     "CommandResponse",
+    "CommandPlanRequest",
+    "CommandPlanResponse",
+    "ExtractRequest",
+    "ExtractResponse",
+    "PlanStep",
     "PageContext",
     "MemoryItem",
     "HealthResponse",
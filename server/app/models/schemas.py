@@ -3,10 +3,12 @@ VynceAI Backend - Pydantic Schemas
 Request and response models for API endpoints
 """
 
-from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, Dict, Any, List
+from pydantic import BaseModel, Field, ConfigDict, model_validator
+from typing import Optional, Dict, Any, List, Union
 from datetime import datetime
 
+from app.core.config import settings
+
 # ============================================================================
 # Context Schemas
 # ============================================================================
@@ -17,6 +19,38 @@ class PageContext(BaseModel):
     title: Optional[str] = Field(None, description="Page title")
     selected_text: Optional[str] = Field(None, description="User-selected text", alias="selectedText")
     page_content: Optional[str] = Field(None, description="Page content", alias="pageContent")
+    truncated: bool = Field(False, description="Whether pageContent was trimmed to PAGE_CONTENT_MAX_CHARS")
+    
+    model_config = ConfigDict(populate_by_name=True)
+    
+    @model_validator(mode="before")
+    @classmethod
+    def trim_page_content(cls, data: Any) -> Any:
+        """Trim overlong pageContent before field validation and any later copies"""
+        if not isinstance(data, dict):
+            return data
+        
+        key = "pageContent" if "pageContent" in data else "page_content"
+        content = data.get(key)
+        limit = settings.PAGE_CONTENT_MAX_CHARS
+        
+        if isinstance(content, str) and len(content) > limit:
+            if settings.PAGE_CONTENT_OVERFLOW == "reject":
+                raise ValueError(f"pageContent too long ({len(content)} chars, limit: {limit})")
+            data = {**data, key: content[:limit], "truncated": True}
+        return data
+
+class PrefetchRequest(BaseModel):
+    """Request schema for background page prefetch"""
+    context: PageContext = Field(..., description="Page that was just loaded")
+    model: Optional[str] = Field("gemini-2.5-flash", description="Model the summary will be requested with")
+    session_id: Optional[str] = Field(
+        None,
+        description="Also index the page for cross-tab questions in this session",
+        alias="sessionId",
+        max_length=128
+    )
+    summarize: Optional[bool] = Field(None, description="Pre-summarize into the response cache (default: PREFETCH_SUMMARIZE)")
     
     model_config = ConfigDict(populate_by_name=True)
 
@@ -40,6 +74,13 @@ class AIRequest(BaseModel):
     context: Optional[PageContext] = Field(None, description="Optional page context")
     memory: Optional[List[MemoryItem]] = Field(None, description="Recent conversation history")
     model: Optional[str] = Field("gemini-2.5-flash", description="AI model to use")
+    session_id: Optional[str] = Field(
+        None,
+        description="Server-side conversation session ID (replaces sending full memory)",
+        alias="sessionId",
+        max_length=128
+    )
+    pages: Optional[List[PageContext]] = Field(None, description="Open tabs to index for cross-tab questions")
     
     model_config = ConfigDict(populate_by_name=True, extra="ignore")
 
@@ -49,6 +90,19 @@ class AIResponse(BaseModel):
     model: Optional[str] = Field(None, description="Model used for generation")
     tokens: Optional[int] = Field(None, description="Tokens used")
     success: Optional[bool] = Field(True, description="Whether the request was successful")
+    session_id: Optional[str] = Field(None, description="Conversation session ID, if any")
+    truncated: Optional[bool] = Field(None, description="Whether the page content was trimmed")
+
+# ============================================================================
+# Cross-Tab Schemas
+# ============================================================================
+
+class TabsIndexRequest(BaseModel):
+    """Request schema for indexing several open tabs into a session"""
+    session_id: str = Field(..., description="Session ID owning the index", alias="sessionId", min_length=1, max_length=128)
+    pages: List[PageContext] = Field(..., description="Pages to index", min_length=1)
+    
+    model_config = ConfigDict(populate_by_name=True)
 
 # ============================================================================
 # Command Schemas
@@ -64,6 +118,49 @@ class CommandResponse(BaseModel):
     result: str = Field(..., description="Command execution result")
     success: bool = Field(True, description="Execution success status")
     error: Optional[str] = Field(None, description="Error message if failed")
+    action: Optional[str] = Field(None, description="Parsed action (for /parse)")
+    params: Optional[Dict[str, Any]] = Field(None, description="Parsed action parameters")
+    confidence: Optional[float] = Field(None, description="Parse confidence (1.0 for grammar matches)")
+    source: Optional[str] = Field(None, description="Parser used: grammar, cache or llm")
+    data: Optional[Dict[str, Any]] = Field(None, description="Structured command output (e.g. extract results)")
+
+class ExtractRequest(BaseModel):
+    """Request schema for structured extraction"""
+    page_content: str = Field(..., description="Page text to extract from", alias="pageContent")
+    targets: Optional[List[str]] = Field(None, description="emails, phones, links, dates, prices and/or tables (default: all)")
+    limit: int = Field(100, description="Maximum results per target", ge=1, le=1000)
+    
+    model_config = ConfigDict(populate_by_name=True)
+
+class ExtractResponse(BaseModel):
+    """Response schema for structured extraction"""
+    results: Dict[str, List[Any]] = Field(default_factory=dict, description="Typed results per target")
+    counts: Dict[str, int] = Field(default_factory=dict, description="Number of results per target")
+    elapsed_ms: float = Field(0.0, description="Extraction time in milliseconds")
+    success: bool = Field(True, description="Extraction success status")
+    error: Optional[str] = Field(None, description="Error message if failed")
+
+class CommandPlanRequest(BaseModel):
+    """Request schema for multi-step command planning"""
+    instruction: Union[str, List[str]] = Field(..., description="Instruction, or list of instructions executed in order")
+
+class PlanStep(BaseModel):
+    """One step of a command plan"""
+    step: int = Field(..., description="1-based position in the plan")
+    text: str = Field(..., description="Instruction clause this step came from")
+    action: Optional[str] = Field(None, description="Action to execute")
+    params: Dict[str, Any] = Field(default_factory=dict, description="Action parameters")
+    confidence: float = Field(0.0, description="Parse confidence")
+    source: Optional[str] = Field(None, description="Parser used: grammar, cache or llm")
+    valid: bool = Field(False, description="Whether the step passed validation")
+    error: Optional[str] = Field(None, description="Validation error")
+
+class CommandPlanResponse(BaseModel):
+    """Response schema for multi-step command planning"""
+    steps: List[PlanStep] = Field(default_factory=list, description="Ordered plan")
+    success: bool = Field(True, description="Whether every step is valid")
+    cached: bool = Field(False, description="Whether the plan came from the cache")
+    error: Optional[str] = Field(None, description="Validation errors, if any")
 
 # ============================================================================
 # Health Check Schema
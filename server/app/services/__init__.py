@@ -6,6 +6,9 @@ from .ai_service import process_ai_query, process_ai_query_advanced
 from .command_service import execute_command
 from .context_service import extract_context, format_context
 from .llm_client import llm_client
+from .session_service import session_store
+from .retrieval_service import retrieval_store
+from .warmup_service import is_ready, warmup_state
 
 __all__ = [
     "process_ai_query",
@@ -13,5 +16,9 @@ __all__ = [
     "execute_command",
     "extract_context",
     "format_context",
-    "llm_client"
+    "llm_client",
+    "session_store",
+    "retrieval_store",
+    "is_ready",
+    "warmup_state"
 ]
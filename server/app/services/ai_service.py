@@ -5,12 +5,58 @@ Now powered by the unified LLM client (Phase 4)
 """
 
 import asyncio
-from typing import Optional, Dict, Any
+import hashlib
+import re
+from typing import Optional, Dict, Any, AsyncIterator, Callable, List, Tuple
+from app.core.admission import admission
+from app.core.cache import get_cache
+from app.core.config import settings
 from app.core.logger import get_logger
-from app.services.llm_client import llm_client
+from app.core.scheduler import current_priority, upstream_scheduler
+from app.core.tracing import annotate, stage
+from app.services.llm_client import is_error_response, llm_client
+from app.services.summarizer_service import extractive_summary
 
 logger = get_logger(__name__)
 
+# Responses to stateless, page-derived prompts (summaries, analyses);
+# shared across workers when CACHE_BACKEND="sqlite"
+response_cache = get_cache("responses", settings.RESPONSE_CACHE_SIZE)
+
+class _InflightQuery:
+    """Upstream calls generating one cache key; every caller gets the first answer"""
+    
+    def __init__(self):
+        self.result = asyncio.get_running_loop().create_future()
+        self.calls: List[asyncio.Task] = []
+        self.request_class: Optional[str] = None
+    
+    def start(self, prompt: str, model: str, key: str) -> None:
+        """Start a call at the current request's priority class"""
+        self.request_class = current_priority()[0]
+        call = asyncio.ensure_future(_query_and_cache(prompt, model, key))
+        call.add_done_callback(self._settle)
+        self.calls.append(call)
+    
+    def _settle(self, call: asyncio.Task) -> None:
+        if call.cancelled() or self.result.done():
+            return
+        if call.exception() is not None:
+            # Another call for the key may still answer
+            if all(other.done() for other in self.calls):
+                self.result.set_exception(call.exception())
+            return
+        self.result.set_result(call.result())
+        for other in self.calls:
+            other.cancel()
+
+# Upstream calls for cache keys currently being generated
+_inflight_queries: Dict[str, _InflightQuery] = {}
+
+# Upstream summaries still running after the caller fell back; they finish
+# into the response cache (referenced here so they are not collected)
+_background_summaries: set = set()
+
 async def process_ai_query(prompt: str, model: str = "gemini-2.5-flash") -> str:
     """
     Process AI query with basic prompt using unified LLM client
@@ -22,21 +68,235 @@ async def process_ai_query(prompt: str, model: str = "gemini-2.5-flash") -> str:
     Returns:
         AI-generated response text
     """
-    logger.info(f"Processing AI query with model: {model}")
-    logger.debug(f"Prompt: {prompt[:100]}...")
+    logger.info("Processing AI query with model: %s", model)
+    logger.debug("Prompt: %s...", prompt[:100])
+    annotate(prompt=prompt, prompt_chars=len(prompt))
     
     # Use the unified LLM client
     response = await llm_client.generate(prompt=prompt, model=model)
     
-    logger.info(f"Generated response: {len(response)} characters")
+    logger.info("Generated response: %s characters", len(response))
+    
+    return response
+
+def response_cache_key(prompt: str, model: str) -> str:
+    """Cache key for a fully built prompt and model"""
+    return hashlib.sha256(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+async def cached_ai_query(prompt: str, model: str = "gemini-2.5-flash") -> Tuple[str, bool]:
+    """
+    Process a stateless AI query through the response cache
+    
+    Only for prompts whose answer depends on nothing but the prompt itself
+    (no memory or session state). Error responses are not cached. Callers
+    asking for a prompt that is already being generated (e.g. a summarize
+    click during its prefetch) join that upstream call; the call finishes
+    into the cache even if every caller gives up waiting. A caller of a
+    higher priority class does not wait in the lower class's queue: it
+    starts its own call, and whichever call answers first serves everyone.
     
+    Args:
+        prompt: Fully built prompt
+        model: AI model to use
+        
+    Returns:
+        Tuple of (response text, whether it came from the cache)
+    """
+    key = response_cache_key(prompt, model)
+    cached = response_cache.get(key)
+    if cached is not None:
+        logger.info("Response cache hit")
+        return cached, True
+    
+    inflight = _inflight_queries.get(key)
+    if inflight is None or inflight.result.get_loop() is not asyncio.get_running_loop():
+        inflight = _inflight_queries[key] = _InflightQuery()
+        inflight.result.add_done_callback(
+            lambda _, entry=inflight: _inflight_queries.pop(key, None) if _inflight_queries.get(key) is entry else None
+        )
+        inflight.start(prompt, model, key)
+    elif upstream_scheduler.weight(current_priority()[0]) > upstream_scheduler.weight(inflight.request_class):
+        logger.info("Racing in-flight %s query at %s priority", inflight.request_class, current_priority()[0])
+        inflight.start(prompt, model, key)
+    else:
+        logger.info("Joining in-flight query for the same prompt")
+    return await asyncio.shield(inflight.result), False
+
+async def _query_and_cache(prompt: str, model: str, key: str) -> str:
+    response = await process_ai_query(prompt, model)
+    if not is_error_response(response):
+        response_cache.set(key, response)
     return response
 
+_WHITESPACE_RE = re.compile(r"[ \t\r\f\v]+")
+_BLANK_LINES_RE = re.compile(r"\n\s*\n+")
+
+def normalize_page_content(page_content: str) -> str:
+    """Collapse whitespace so trivially different extractions of a page match"""
+    return _BLANK_LINES_RE.sub("\n\n", _WHITESPACE_RE.sub(" ", page_content)).strip()
+
+def build_summary_prompt(page_content: str, url: Optional[str] = None, title: Optional[str] = None) -> str:
+    """Strict page summarization prompt (shared by every summary path so they share cache entries)"""
+    page_content = normalize_page_content(page_content)
+    return f"""Analyze and summarize the following webpage. Be precise and factual.
+
+Page URL: {url if url else 'Unknown'}
+Page Title: {title if title else 'Unknown'}
+
+Page Content:
+{page_content[:3000]}
+
+Provide a clear, structured summary covering:
+1. Main topic and purpose
+2. Key points (3-5 bullet points)
+3. Target audience or use case
+4. Type of content (article, documentation, product page, etc.)
+
+Be concise and factual. Do not add information not present in the content."""
+
+def build_analysis_prompt(page_content: str, url: Optional[str] = None, title: Optional[str] = None) -> str:
+    """Strict page analysis prompt (shared by /analyze and analysis jobs so they share cache entries)"""
+    page_content = normalize_page_content(page_content)
+    return f"""Perform a detailed analysis of this webpage based ONLY on the provided content.
+
+Page URL: {url if url else 'Unknown'}
+Page Title: {title if title else 'Unknown'}
+
+Page Content:
+{page_content[:3000]}
+
+Analyze and provide:
+1. Content quality and structure
+2. Main topics and key information
+3. Purpose and intended audience
+4. Content organization and readability
+5. Notable features or elements
+6. Any calls-to-action or next steps mentioned
+
+Base your analysis strictly on the content provided. Be factual and precise."""
+
+async def analyze_page_content(
+    page_content: str,
+    url: Optional[str] = None,
+    title: Optional[str] = None,
+    model: str = "gemini-2.5-flash",
+    on_delta: Optional[Callable[[str], None]] = None
+) -> Dict[str, Any]:
+    """
+    Analyze a page through the response cache
+    
+    Args:
+        page_content: Page text
+        url: Optional page URL
+        title: Optional page title
+        model: AI model to use
+        on_delta: If given, the analysis is streamed and each chunk is passed
+                  to it as it arrives (a cached analysis arrives as one chunk)
+        
+    Returns:
+        {"response", "cached"}
+    """
+    prompt = build_analysis_prompt(page_content, url, title)
+    if on_delta is None:
+        response, cached = await cached_ai_query(prompt, model)
+        return {"response": response, "cached": cached}
+    
+    key = response_cache_key(prompt, model)
+    cached = response_cache.get(key)
+    if cached is not None:
+        on_delta(cached)
+        return {"response": cached, "cached": True}
+    
+    chunks, failed = [], False
+    async for delta in llm_client.generate_stream(prompt=prompt, model=model):
+        chunks.append(delta)
+        failed = failed or is_error_response(delta)
+        on_delta(delta)
+    response = "".join(chunks).strip()
+    if not failed:
+        response_cache.set(key, response)
+    return {"response": response, "cached": False}
+
+def _finish_background_summary(task: asyncio.Task) -> None:
+    _background_summaries.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logger.warning("Background summary failed: %s", task.exception())
+
+async def summarize_page_content(
+    page_content: str,
+    url: Optional[str] = None,
+    title: Optional[str] = None,
+    model: str = "gemini-2.5-flash"
+) -> Dict[str, Any]:
+    """
+    Summarize a page with the LLM, falling back to an extractive summary
+    
+    The extractive summary is returned when the LLM answers with an error or
+    misses SUMMARY_LLM_BUDGET_SECONDS. A timed-out LLM call keeps running and
+    fills the response cache, so a retry usually gets the LLM summary. When
+    admission control predicts the budget cannot be met, the LLM is not
+    called at all.
+    
+    Args:
+        page_content: Page text
+        url: Optional page URL
+        title: Optional page title
+        model: AI model to use
+        
+    Returns:
+        {"response", "cached", "source": "llm" | "extractive", "fallback_reason"}
+    """
+    prompt = build_summary_prompt(page_content, url, title)
+    budget = settings.SUMMARY_LLM_BUDGET_SECONDS
+    cached = response_cache.get(response_cache_key(prompt, model))
+    if cached is not None:
+        return {"response": cached, "cached": True, "source": "llm", "fallback_reason": None}
+    
+    # Predicted to miss the budget anyway: answer extractively without queuing
+    if settings.ADMISSION_ENABLED and admission.check(current_priority()[0], budget if budget > 0 else None) is not None:
+        with stage("extractive"):
+            summary = extractive_summary(page_content, title)
+        if summary["response"]:
+            logger.warning("Summary fell back to extractive (overloaded)")
+            annotate(summary_fallback="overloaded")
+            return {"response": summary["response"], "cached": False, "source": "extractive", "fallback_reason": "overloaded"}
+    
+    task = asyncio.ensure_future(cached_ai_query(prompt, model))
+    
+    reason = None
+    try:
+        if budget > 0:
+            response, cached = await asyncio.wait_for(asyncio.shield(task), timeout=budget)
+        else:
+            response, cached = await task
+        if is_error_response(response):
+            reason = "upstream_error"
+    except asyncio.TimeoutError:
+        reason = "timeout"
+        _background_summaries.add(task)
+        task.add_done_callback(_finish_background_summary)
+    
+    if reason is None:
+        return {"response": response, "cached": cached, "source": "llm", "fallback_reason": None}
+    
+    with stage("extractive"):
+        summary = extractive_summary(page_content, title)
+    if not summary["response"]:
+        if reason == "timeout":
+            return {"response": "Error: Summary timed out", "cached": False, "source": "llm", "fallback_reason": reason}
+        return {"response": response, "cached": False, "source": "llm", "fallback_reason": reason}
+    
+    logger.warning("Summary fell back to extractive (%s)", reason)
+    annotate(summary_fallback=reason)
+    return {"response": summary["response"], "cached": False, "source": "extractive", "fallback_reason": reason}
+
 async def process_ai_query_advanced(
     prompt: str,
     context: Optional[Any] = None,
     memory: Optional[list] = None,
-    model: str = "gemini-2.5-flash"
+    model: str = "gemini-2.5-flash",
+    summary: Optional[str] = None,
+    passages: Optional[list] = None
 ) -> Dict[str, Any]:
     """
     Process AI query with context, memory, and return detailed response
@@ -46,29 +306,44 @@ async def process_ai_query_advanced(
         context: Optional page context (PageContext model or dict)
         memory: Optional recent conversation history
         model: AI model to use
+        summary: Optional rolling summary of older conversation turns
+        passages: Optional passages retrieved across open tabs
         
     Returns:
         Dictionary with response, model info, tokens, etc.
     """
-    logger.info(f"Processing advanced AI query with model: {model}")
+    logger.info("Processing advanced AI query with model: %s", model)
     if memory:
-        logger.info(f"Using {len(memory)} memory items for context")
+        logger.info("Using %s memory items for context", len(memory))
     
-    # Convert PageContext model to dict if needed
-    context_dict = None
-    if context:
-        if hasattr(context, 'model_dump'):
-            context_dict = context.model_dump(by_alias=True)
-        elif isinstance(context, dict):
-            context_dict = context
+    # Greetings and arithmetic need neither the context nor a model
+    local = llm_client.local_answer(prompt)
+    if local is not None:
+        return {
+            "response": local,
+            "model": model,
+            "tokens": len(local.split()),
+            "success": True
+        }
     
     # Build enhanced prompt with memory and context
-    enhanced_prompt = _build_enhanced_prompt(prompt, context_dict, memory)
+    with stage("prompt"):
+        context_dict = _context_to_dict(context)
+        enhanced_prompt = _build_enhanced_prompt(prompt, context_dict, memory, summary, passages)
+    annotate(
+        prompt=prompt,
+        prompt_chars=len(prompt),
+        page_chars=len((context_dict or {}).get("pageContent") or ""),
+        enhanced_prompt_chars=len(enhanced_prompt),
+    )
     
-    # Use the unified LLM client
+    # Use the unified LLM client (routing looks at the question as typed,
+    # not at the enhanced prompt, which always reads as site-specific)
     response_text = await llm_client.generate(
         prompt=enhanced_prompt,
-        model=model
+        model=model,
+        route_prompt=prompt,
+        route_context=context_dict
     )
     
     return {
@@ -78,14 +353,82 @@ async def process_ai_query_advanced(
         "success": True
     }
 
-def _build_enhanced_prompt(prompt: str, context: Optional[Dict] = None, memory: Optional[list] = None) -> str:
+async def stream_ai_query(
+    prompt: str,
+    context: Optional[Any] = None,
+    memory: Optional[list] = None,
+    model: str = "gemini-2.5-flash",
+    summary: Optional[str] = None
+) -> AsyncIterator[str]:
+    """
+    Stream AI response chunks, building the prompt like the non-streaming path
+    
+    Args:
+        prompt: User's prompt/question
+        context: Optional page context (PageContext model or dict)
+        memory: Optional recent conversation history
+        model: AI model to use
+        summary: Optional rolling summary of older conversation turns
+        
+    Yields:
+        Response text chunks
+    """
+    logger.info("Streaming AI query with model: %s", model)
+    
+    if not (context or memory or summary):
+        async for chunk in llm_client.generate_stream(prompt=prompt, model=model):
+            yield chunk
+        return
+    
+    context_dict = _context_to_dict(context)
+    enhanced_prompt = _build_enhanced_prompt(prompt, context_dict, memory, summary)
+    async for chunk in llm_client.generate_stream(
+        prompt=enhanced_prompt,
+        model=model,
+        route_prompt=prompt,
+        route_context=context_dict
+    ):
+        yield chunk
+
+def _context_to_dict(context: Optional[Any]) -> Optional[Dict]:
+    """Convert PageContext model to dict if needed"""
+    if not context:
+        return None
+    if hasattr(context, 'model_dump'):
+        return context.model_dump(by_alias=True)
+    if isinstance(context, dict):
+        return context
+    return None
+
+def _memory_within_budget(memory: list, budget: int) -> list:
+    """Newest memory items whose text fits in budget characters, oldest first"""
+    kept = []
+    for item in reversed(memory):
+        size = len(item.get("user") or "") + len(item.get("bot") or "")
+        if size > budget:
+            break
+        budget -= size
+        kept.append(item)
+    kept.reverse()
+    return kept
+
+def _build_enhanced_prompt(
+    prompt: str,
+    context: Optional[Dict] = None,
+    memory: Optional[list] = None,
+    summary: Optional[str] = None,
+    passages: Optional[list] = None
+) -> str:
     """
     Build enhanced prompt with system instructions, memory, and context
     
     Args:
         prompt: User's current question
         context: Page context (url, title, snippet, etc.)
-        memory: Recent conversation history
+        memory: Conversation turns not covered by the summary, oldest first
+            (the newest ones within PROMPT_MEMORY_MAX_CHARS are used)
+        summary: Rolling summary of older turns (server-side sessions)
+        passages: Retrieved passages from several open tabs
         
     Returns:
         Enhanced prompt string
@@ -122,10 +465,17 @@ YOUR BEHAVIOR:
 - Always be factual and precise
 - Keep responses clear and well-structured""")
     
-    # Add memory if available
-    if memory and len(memory) > 0:
+    # Add rolling summary of older turns if available
+    if summary:
+        parts.append("\n=== Earlier Conversation Summary ===")
+        parts.append(summary)
+        parts.append("=== End Summary ===")
+    
+    # Add memory if available: every turn not in the summary, within the budget
+    memory = _memory_within_budget(memory or [], settings.PROMPT_MEMORY_MAX_CHARS)
+    if memory:
         parts.append("\n=== Recent Conversation ===")
-        for item in memory[-3:]:  # Only last 3 interactions
+        for item in memory:
             parts.append(f"User: {item.get('user', '')}")
             parts.append(f"Assistant: {item.get('bot', '')}")
         parts.append("=== End Conversation History ===\n")
@@ -154,6 +504,17 @@ YOUR BEHAVIOR:
             parts.extend(context_parts)
             parts.append("=== End Context ===\n")
     
+    # Add passages retrieved across open tabs if available
+    if passages:
+        parts.append("\n=== Open Tabs (most relevant passages) ===")
+        current_tab = None
+        for passage in passages:
+            if passage["tab"] != current_tab:
+                current_tab = passage["tab"]
+                parts.append(f"\n[Tab {current_tab}] {passage.get('title') or 'Untitled'} ({passage['url']})")
+            parts.append(f"- {passage['text']}")
+        parts.append("=== End Open Tabs ===\n")
+    
     # Add current question
     parts.append(f"\nUser Question: {prompt}")
     parts.append("\nProvide a clear, precise response:")
@@ -0,0 +1,233 @@
+"""
+VynceAI Backend - Chat Channel Service
+Multiplexed, streaming chat over a single WebSocket connection
+
+Protocol (JSON text frames):
+
+Client -> server
+    {"type": "chat", "id": "r1", "prompt": "...", ...AIRequest fields}
+    {"type": "summarize", "id": "r1", "context": {...}, "model": "..."}
+    {"type": "cancel", "id": "r1"}
+    {"type": "ping"}
+
+Server -> client
+    {"type": "preview", "id": "r1", "response": "..."}  (summarize only, sent first)
+    {"type": "token", "id": "r1", "delta": "..."}
+    {"type": "done", "id": "r1", "response": "...", "model": "...", ...}
+    {"type": "cancelled", "id": "r1", "reason": "client" | "timeout" | "unknown_id"}
+    {"type": "error", "id": "r1", "detail": "..."}
+    {"type": "pong"}
+"""
+
+import asyncio
+import json
+from typing import Any, Awaitable, Callable, Dict
+
+from fastapi import WebSocket, WebSocketDisconnect
+from pydantic import ValidationError
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import WS_REQUESTS_IN_FLIGHT
+from app.models.schemas import AIRequest
+from app.services.ai_service import build_summary_prompt, response_cache, response_cache_key, stream_ai_query
+from app.services.llm_client import is_error_response, llm_client
+from app.services.summarizer_service import extractive_summary
+from app.services.session_service import session_store
+
+logger = get_logger(__name__)
+
+MAX_REQUEST_ID_LENGTH = 64
+
+
+class ChatChannel:
+    """One WebSocket connection carrying several concurrent chat requests"""
+
+    def __init__(self, websocket: WebSocket):
+        self.websocket = websocket
+        self.tasks: Dict[str, asyncio.Task] = {}
+        self._send_lock = asyncio.Lock()
+        self._closed = False
+
+    async def run(self) -> None:
+        """Read frames until the client disconnects, then cancel in-flight work"""
+        await self.websocket.accept()
+        logger.info("WebSocket chat channel opened")
+
+        try:
+            while True:
+                text = await self.websocket.receive_text()
+                try:
+                    message = json.loads(text)
+                except ValueError:
+                    await self.send({"type": "error", "id": None, "detail": "Invalid JSON frame"})
+                    continue
+                if not isinstance(message, dict):
+                    await self.send({"type": "error", "id": None, "detail": "Frame must be a JSON object"})
+                    continue
+                await self.dispatch(message)
+        except WebSocketDisconnect:
+            pass
+        finally:
+            self._closed = True
+            for task in self.tasks.values():
+                task.cancel()
+            logger.info("WebSocket chat channel closed (%s requests cancelled)", len(self.tasks))
+
+    async def send(self, message: Dict[str, Any]) -> None:
+        """Send a frame; concurrent request tasks share one connection"""
+        if self._closed:
+            return
+        async with self._send_lock:
+            try:
+                await self.websocket.send_text(json.dumps(message))
+            except Exception as e:
+                logger.debug("WebSocket send failed: %s", e)
+                self._closed = True
+
+    async def dispatch(self, message: Dict[str, Any]) -> None:
+        """Handle one client frame"""
+        kind = message.get("type")
+        request_id = message.get("id")
+
+        if kind == "ping":
+            await self.send({"type": "pong"})
+            return
+
+        if not isinstance(request_id, str) or not 0 < len(request_id) <= MAX_REQUEST_ID_LENGTH:
+            await self.send({"type": "error", "id": request_id, "detail": "A string id (max 64 chars) is required"})
+            return
+
+        if kind == "cancel":
+            task = self.tasks.get(request_id)
+            if task is not None:
+                task.cancel()
+            await self.send({
+                "type": "cancelled",
+                "id": request_id,
+                "reason": "client" if task is not None else "unknown_id"
+            })
+            return
+
+        if kind not in ("chat", "summarize"):
+            await self.send({"type": "error", "id": request_id, "detail": f"Unknown frame type: {kind}"})
+            return
+
+        if request_id in self.tasks:
+            await self.send({"type": "error", "id": request_id, "detail": "Request id already in flight"})
+            return
+        if len(self.tasks) >= settings.WS_MAX_INFLIGHT:
+            await self.send({"type": "error", "id": request_id, "detail": "Too many requests in flight on this connection"})
+            return
+
+        if kind == "summarize":
+            message = {"prompt": "Summarize this page", **message}
+
+        try:
+            req = AIRequest.model_validate(message)
+        except ValidationError as e:
+            await self.send({"type": "error", "id": request_id, "detail": e.errors(include_url=False, include_context=False)})
+            return
+
+        if kind == "summarize" and not (req.context and req.context.page_content):
+            await self.send({"type": "error", "id": request_id, "detail": "Page content is required for summarization"})
+            return
+
+        stream = self._stream_summary if kind == "summarize" else self._stream_chat
+        task = asyncio.create_task(self._run_chat(request_id, req, stream))
+        self.tasks[request_id] = task
+        task.add_done_callback(lambda _: self.tasks.pop(request_id, None))
+
+    async def _run_chat(self, request_id: str, req: AIRequest, stream: Callable[..., Awaitable[Dict[str, Any]]]) -> None:
+        """Run one chat or summarize request, reporting completion, timeout or errors"""
+        WS_REQUESTS_IN_FLIGHT.inc()
+        try:
+            result = await asyncio.wait_for(
+                stream(request_id, req),
+                timeout=settings.WS_REQUEST_TIMEOUT_SECONDS
+            )
+            await self.send({"type": "done", "id": request_id, **result})
+        except asyncio.TimeoutError:
+            logger.warning("WebSocket request %s timed out", request_id)
+            await self.send({"type": "cancelled", "id": request_id, "reason": "timeout"})
+        except Exception as e:
+            logger.error("Error in WebSocket chat %s: %s", request_id, e)
+            await self.send({"type": "error", "id": request_id, "detail": str(e)})
+        finally:
+            WS_REQUESTS_IN_FLIGHT.dec()
+
+    async def _stream_chat(self, request_id: str, req: AIRequest) -> Dict[str, Any]:
+        """Stream tokens for one request and return the final payload"""
+        memory_list = None
+        if req.memory:
+            memory_list = [{"user": m.user, "bot": m.bot, "timestamp": m.timestamp} for m in req.memory]
+
+        summary = None
+        if req.session_id:
+            summary, memory_list = session_store.history_for_request(req.session_id, memory_list)
+
+        chunks = []
+        async for delta in stream_ai_query(
+            prompt=req.prompt,
+            context=req.context,
+            memory=memory_list,
+            model=req.model or "gemini-2.5-flash",
+            summary=summary
+        ):
+            chunks.append(delta)
+            await self.send({"type": "token", "id": request_id, "delta": delta})
+
+        response_text = "".join(chunks).strip()
+        if req.session_id:
+            session_store.record_turn(req.session_id, req.prompt, response_text)
+
+        return {
+            "response": response_text,
+            "model": req.model,
+            "tokens": len(response_text.split()),
+            "success": True,
+            "session_id": req.session_id,
+            "truncated": bool(req.context and req.context.truncated)
+        }
+
+    async def _stream_summary(self, request_id: str, req: AIRequest) -> Dict[str, Any]:
+        """
+        Send an instant extractive preview, then stream the LLM summary
+
+        If the LLM answers with an error, the preview becomes the final response.
+        """
+        context = req.context
+        model = req.model or "gemini-2.5-flash"
+        preview = extractive_summary(context.page_content, context.title)["response"]
+        await self.send({"type": "preview", "id": request_id, "response": preview})
+
+        prompt = build_summary_prompt(context.page_content, context.url, context.title)
+        key = response_cache_key(prompt, model)
+        cached = response_cache.get(key)
+        failed = False
+        if cached is not None:
+            await self.send({"type": "token", "id": request_id, "delta": cached})
+            chunks = [cached]
+        else:
+            chunks = []
+            async for delta in llm_client.generate_stream(prompt=prompt, model=model):
+                chunks.append(delta)
+                failed = failed or is_error_response(delta)
+                await self.send({"type": "token", "id": request_id, "delta": delta})
+
+        response_text = "".join(chunks).strip()
+        fallback = failed and bool(preview)
+        if fallback:
+            response_text = preview
+        elif cached is None and not failed:
+            response_cache.set(key, response_text)
+
+        return {
+            "response": response_text,
+            "model": req.model,
+            "tokens": len(response_text.split()),
+            "success": True,
+            "source": "extractive" if fallback else "llm",
+            "cached": cached is not None,
+            "truncated": bool(context.truncated)
+        }
@@ -2,25 +2,634 @@
 VynceAI Backend - Command Service
 Handles browser command execution and automation
 
-NOTE: This is a placeholder for future browser automation features.
-Currently returns mock responses for command structure testing.
+Natural-language automation commands ("search youtube for lofi", "fill
+name with Jane", "click submit") are parsed server-side by a compiled
+pattern grammar into structured {action, params} commands that the
+extension's automation engine executes. The LLM is only asked when the
+grammar cannot parse a command, and those parses are cached.
+
+The extract command runs locally: precompiled extractors pull emails,
+phone numbers, links, dates, prices and simple tables out of page text
+without an upstream call.
+
+NOTE: Command execution itself still happens in the extension;
+execute_command remains a placeholder.
 """
 
 import asyncio
-from typing import Dict, Any, Optional
+import json
+import re
+import time
+from datetime import date
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Pattern, Tuple
+from app.core.cache import get_cache
 from app.core.logger import get_logger
 
 logger = get_logger(__name__)
 
-# Supported command types (Future feature)
+# Supported command types
 SUPPORTED_COMMANDS = [
-    "scroll",
+    "youtube_search",
+    "google_form_fill",
+    "submit_form",
     "click",
+    "fill",
+    "scroll",
     "navigate",
     "extract",
     "screenshot"
 ]
 
+# Params each action needs to be executable (any one of a tuple suffices)
+REQUIRED_PARAMS: Dict[str, List[Any]] = {
+    "youtube_search": ["query"],
+    "google_form_fill": ["formData"],
+    "click": ["selector"],
+    "fill": ["selector", "value"],
+    "scroll": [("direction", "to", "selector")],
+    "navigate": [("url", "direction")],
+    "extract": ["target"],
+}
+
+# What run_extract can find; the grammar and plan validation use the same list
+EXTRACT_TARGETS = ("emails", "phones", "links", "dates", "prices", "tables")
+
+MAX_PLAN_STEPS = 20
+
+# Actions whose params hold typed field values (passwords, personal data).
+# They are never cached: with CACHE_BACKEND="sqlite" caches are written to disk
+UNCACHED_ACTIONS = ("fill", "google_form_fill")
+
+# Successful LLM fallback parses, keyed by normalized command
+_parse_cache = get_cache("command_parses", maxsize=1024)
+
+# Fully valid multi-step plans, keyed by normalized instruction
+_plan_cache = get_cache("command_plans", maxsize=256)
+
+
+# ============================================================================
+# Grammar
+# ============================================================================
+
+class CommandPattern(NamedTuple):
+    """One grammar rule: a compiled pattern and how to build params from it"""
+    action: str
+    regex: Pattern
+    extract: Callable[[re.Match], Dict[str, Any]]
+
+
+_POLITE_PREFIX = re.compile(r"^(?:(?:please|pls|can you|could you|would you|vynce|hey vynce)[\s,]+)+", re.I)
+
+_EXTRACT_TARGETS = {
+    "email": "emails", "e-mail": "emails", "phone": "phones", "phone number": "phones",
+    "number": "phones", "link": "links", "url": "links", "date": "dates", "price": "prices",
+    "table": "tables"
+}
+
+
+def parse_form_data(text: str) -> Dict[str, str]:
+    """
+    Parse form field values from natural language
+    
+    Supports "name: John, email: a@b.com", "name=John, email=a@b.com" and
+    "name John email a@b.com" (same formats as the extension's parser).
+    
+    Args:
+        text: Field/value text
+        
+    Returns:
+        Mapping of field name -> value
+    """
+    for separator in (":", "="):
+        pairs = re.findall(rf"(\w[\w ]*?)\s*{separator}\s*([^,;]+)", text)
+        if pairs:
+            return {key.strip(): value.strip() for key, value in pairs if key.strip() and value.strip()}
+    
+    words = text.replace(",", " ").split()
+    form_data = {}
+    for key, value in zip(words[::2], words[1::2]):
+        key = re.sub(r"[^a-z0-9]", "", key.lower())
+        if key:
+            form_data[key] = value
+    return form_data
+
+
+def _normalize_url(url: str) -> str:
+    return url if re.match(r"^[a-z][a-z0-9+.-]*://", url, re.I) else f"https://{url}"
+
+
+def _compile(action: str, pattern: str, extract: Callable[[re.Match], Dict[str, Any]]) -> CommandPattern:
+    return CommandPattern(action, re.compile(rf"^{pattern}$", re.I), extract)
+
+
+# Order matters: specific rules come before the generic click/fill/extract ones
+_PATTERNS: List[CommandPattern] = [
+    # YouTube search
+    _compile("youtube_search", r"(?:search|find|look\s+up|look\s+for|lookup)\s+(?:for\s+)?(?P<query>.+?)\s+on\s+(?:youtube|yt)",
+             lambda m: {"query": m["query"]}),
+    _compile("youtube_search", r"(?:search|find)\s+(?:on\s+)?(?:youtube|yt)\s+(?:for\s+)?(?P<query>.+)",
+             lambda m: {"query": m["query"]}),
+    _compile("youtube_search", r"(?:youtube|yt)\s+search[:\s]+(?P<query>.+)",
+             lambda m: {"query": m["query"]}),
+    _compile("youtube_search", r"(?:play|watch)\s+(?P<query>.+?)\s+on\s+(?:youtube|yt)",
+             lambda m: {"query": m["query"]}),
+
+    # Google form fill
+    _compile("google_form_fill", r"fill\s+(?:(?:this|the)\s+)?(?:google\s+)?form\s+with[:\s]+(?P<data>.+)",
+             lambda m: {"formData": parse_form_data(m["data"])}),
+    _compile("google_form_fill", r"complete\s+(?:(?:this|the)\s+)?form(?:\s+with)?[:\s]+(?P<data>.+)",
+             lambda m: {"formData": parse_form_data(m["data"])}),
+    _compile("google_form_fill", r"autofill\s+(?:(?:this|the)\s+)?(?:form\s+)?(?:with\s+)?[:\s]*(?P<data>.+)",
+             lambda m: {"formData": parse_form_data(m["data"])}),
+
+    # Submit
+    _compile("submit_form", r"(?:submit|send)(?:\s+(?:the|this))?(?:\s+form)?",
+             lambda m: {}),
+
+    # Scroll
+    _compile("scroll", r"scroll\s+(?P<direction>up|down)(?:\s+(?:by\s+)?(?P<amount>\d+)\s*(?:px|pixels)?)?",
+             lambda m: {"direction": m["direction"].lower(), **({"amount": int(m["amount"])} if m["amount"] else {})}),
+    _compile("scroll", r"scroll\s+to\s+(?:the\s+)?(?P<to>top|bottom)(?:\s+of\s+(?:the\s+)?page)?",
+             lambda m: {"to": m["to"].lower()}),
+    _compile("scroll", r"scroll\s+to\s+(?:the\s+)?(?P<selector>.+?)(?:\s+section)?",
+             lambda m: {"selector": m["selector"]}),
+
+    # Navigate
+    _compile("navigate", r"(?:go|navigate|browse)\s+(?P<direction>back|forward)",
+             lambda m: {"direction": m["direction"].lower()}),
+    _compile("navigate", r"(?:reload|refresh)(?:\s+(?:the|this))?(?:\s+page)?",
+             lambda m: {"direction": "reload"}),
+    _compile("navigate", r"(?:go\s+to|open|navigate\s+to|visit|browse\s+to)\s+(?P<url>[a-z][a-z0-9+.-]*://\S+|[\w-]+(?:\.[\w-]+)+(?:/\S*)?)",
+             lambda m: {"url": _normalize_url(m["url"])}),
+
+    # Extract
+    _compile("extract", r"(?:extract|get|find|list|show)\s+(?:me\s+)?(?:all\s+)?(?:the\s+)?"
+                        r"(?P<target>e-?mails?|phone\s+numbers?|phones?|numbers|links?|urls?|dates?|prices?|tables?)"
+                        r"(?:\s+(?:from|on|in)\s+(?:this|the)\s+page)?",
+             lambda m: {"target": _EXTRACT_TARGETS.get(m["target"].lower().rstrip("s"), m["target"].lower())}),
+
+    # Click
+    _compile("click", r"(?:click|press|tap)\s+(?:on\s+)?(?:the\s+)?(?P<selector>.+?)\s+(?:button|link)",
+             lambda m: {"selector": m["selector"]}),
+    _compile("click", r"(?:click|press|tap)\s+(?:on\s+)?(?:the\s+)?(?P<selector>.+)",
+             lambda m: {"selector": m["selector"]}),
+
+    # Fill a single field
+    _compile("fill", r"fill\s+(?:in\s+)?(?:the\s+)?(?P<selector>.+?)(?:\s+(?:field|box|input))?\s+with\s+(?P<value>.+)",
+             lambda m: {"selector": m["selector"], "value": m["value"]}),
+    _compile("fill", r"(?:type|enter|write|put)\s+(?P<value>.+?)\s+(?:in|into)\s+(?:the\s+)?(?P<selector>.+?)(?:\s+(?:field|box|input))?",
+             lambda m: {"selector": m["selector"], "value": m["value"]}),
+    _compile("fill", r"set\s+(?:the\s+)?(?P<selector>.+?)(?:\s+(?:field|box|input))?\s+to\s+(?P<value>.+)",
+             lambda m: {"selector": m["selector"], "value": m["value"]}),
+]
+
+
+def normalize_command(command: str) -> str:
+    """Collapse whitespace, drop polite prefixes and trailing punctuation"""
+    text = " ".join(command.split())
+    text = _POLITE_PREFIX.sub("", text)
+    return text.rstrip(".!? ")
+
+
+@lru_cache(maxsize=2048)
+def _parse_normalized(text: str) -> Optional[tuple]:
+    for pattern in _PATTERNS:
+        match = pattern.regex.match(text)
+        if match:
+            params = pattern.extract(match)
+            return pattern.action, json.dumps(params)
+    return None
+
+
+def parse_command(command: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a natural-language command with the grammar only
+    
+    Args:
+        command: Natural-language automation command
+        
+    Returns:
+        {"action", "params", "confidence", "source"} or None if no rule matches
+    """
+    parsed = _parse_normalized(normalize_command(command))
+    if parsed is None:
+        return None
+    action, params = parsed
+    # Params are cached as JSON so callers never share (and mutate) one dict
+    return {"action": action, "params": json.loads(params), "confidence": 1.0, "source": "grammar"}
+
+
+def _coerce_command(parsed: Any) -> Optional[Dict[str, Any]]:
+    """Keep an LLM-produced object only if it is a supported {action, params} command"""
+    if not isinstance(parsed, dict) or parsed.get("action") not in SUPPORTED_COMMANDS:
+        return None
+    params = parsed.get("params")
+    return {"action": parsed["action"], "params": params if isinstance(params, dict) else {}}
+
+
+def _extract_json_command(text: str) -> Optional[Dict[str, Any]]:
+    """Pull a valid {action, params} object out of an LLM answer"""
+    match = re.search(r"\{[\s\S]*\}", text)
+    if not match:
+        return None
+    try:
+        return _coerce_command(json.loads(match.group(0)))
+    except json.JSONDecodeError:
+        return None
+
+
+async def parse_command_with_fallback(command: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a command with the grammar, falling back to cached or fresh LLM parses
+    
+    Args:
+        command: Natural-language automation command
+        
+    Returns:
+        {"action", "params", "confidence", "source"} or None if unparseable
+    """
+    parsed = parse_command(command)
+    if parsed:
+        return parsed
+    
+    key = normalize_command(command)
+    cached = _parse_cache.get(key)
+    if cached is not None:
+        return {**cached, "params": dict(cached["params"]), "source": "cache"}
+    
+    # Imported lazily: the grammar path must not depend on the LLM client
+    from app.services.llm_client import is_error_response, llm_client
+    
+    logger.info("Grammar could not parse command, asking LLM: %s", command[:80])
+    prompt = f"""Parse this automation command into a JSON structure with 'action' and 'params' fields.
+
+Supported actions:
+- youtube_search: params should have 'query'
+- google_form_fill: params should have 'formData' object with key-value pairs
+- submit_form: no params needed
+- click: params should have 'selector' (element to click)
+- fill: params should have 'selector' and 'value'
+- scroll: params should have 'direction' (up/down) or 'to' (top/bottom) or 'selector'
+- navigate: params should have 'url' or 'direction' (back/forward/reload)
+- extract: params should have 'target' ({', '.join(EXTRACT_TARGETS)})
+
+Command: "{command}"
+
+Respond ONLY with valid JSON, no explanation."""
+    
+    response = await llm_client.generate(prompt=prompt)
+    if is_error_response(response):
+        return None
+    
+    parsed = _extract_json_command(response)
+    if parsed is None:
+        logger.warning("LLM returned no valid command for: %s", command[:80])
+        return None
+    
+    parsed["confidence"] = 0.8
+    if parsed["action"] not in UNCACHED_ACTIONS:
+        _parse_cache.set(key, parsed)
+    return {**parsed, "source": "llm"}
+
+
+# ============================================================================
+# Multi-step planning
+# ============================================================================
+
+_CLAUSE_SPLIT = re.compile(r"\s*(?:;|\n|,?\s+and\s+then\s+|,?\s+then\s+|,\s*and\s+|,)\s*", re.I)
+_LEADING_JOINER = re.compile(r"^(?:(?:and|then|next|finally|after\s+that)[\s,]+)+", re.I)
+_FORM_PAIR = re.compile(r"^\w[\w ]*?\s*[:=]\s*\S")
+
+
+def split_instruction(instruction: str) -> List[str]:
+    """
+    Split a compound instruction into clauses
+    
+    Splits on commas, semicolons, new lines and "then"; a bare "and" is
+    kept ("search youtube for rock and roll"). Form pairs split off by a
+    comma ("fill form with name: A, email: B") are merged back later.
+    """
+    clauses = []
+    for clause in _CLAUSE_SPLIT.split(instruction):
+        clause = _LEADING_JOINER.sub("", clause.strip())
+        if clause:
+            clauses.append(clause)
+    return clauses
+
+
+def validate_step(action: Optional[str], params: Dict[str, Any]) -> Optional[str]:
+    """
+    Check a planned step is executable
+    
+    Returns:
+        None if valid, otherwise the reason it is not
+    """
+    if action not in SUPPORTED_COMMANDS:
+        return f"Unsupported action: {action}"
+    for required in REQUIRED_PARAMS.get(action, []):
+        options = required if isinstance(required, tuple) else (required,)
+        if not any(params.get(name) not in (None, "", {}) for name in options):
+            return f"Missing parameter for {action}: {' or '.join(options)}"
+    if action == "extract" and params["target"] not in EXTRACT_TARGETS:
+        return f"Unsupported extract target: {params['target']}"
+    return None
+
+
+def _grammar_steps(clauses: List[str]) -> List[Dict[str, Any]]:
+    """Parse clauses with the grammar; unparsed clauses keep action None"""
+    steps: List[Dict[str, Any]] = []
+    for clause in clauses:
+        previous = steps[-1] if steps else None
+        if previous and previous["action"] == "google_form_fill" and _FORM_PAIR.match(clause):
+            previous["params"]["formData"].update(parse_form_data(clause))
+            previous["text"] += f", {clause}"
+            continue
+        parsed = parse_command(clause)
+        if parsed is None:
+            cached = _parse_cache.get(normalize_command(clause))
+            if cached is not None:
+                parsed = {**cached, "params": dict(cached["params"]), "source": "cache"}
+        steps.append({"text": clause, **(parsed or {"action": None, "params": {}, "confidence": 0.0, "source": None})})
+    return steps
+
+
+async def _llm_steps(clauses: List[str]) -> List[Optional[Dict[str, Any]]]:
+    """Parse several clauses with a single LLM call (aligned with the input)"""
+    from app.services.llm_client import is_error_response, llm_client
+    
+    numbered = "\n".join(f"{i + 1}. {clause}" for i, clause in enumerate(clauses))
+    prompt = f"""Convert each numbered browser automation step into a JSON object with 'action' and 'params' fields.
+
+Supported actions: {', '.join(SUPPORTED_COMMANDS)}
+- youtube_search: 'query'; google_form_fill: 'formData' object; submit_form: no params
+- click: 'selector'; fill: 'selector' and 'value'
+- scroll: 'direction' (up/down), 'to' (top/bottom) or 'selector'
+- navigate: 'url' or 'direction' (back/forward/reload); extract: 'target' ({', '.join(EXTRACT_TARGETS)})
+
+Steps:
+{numbered}
+
+Respond ONLY with a JSON array of exactly {len(clauses)} objects, in the same order, no explanation."""
+    
+    response = await llm_client.generate(prompt=prompt)
+    if is_error_response(response):
+        return [None] * len(clauses)
+    
+    match = re.search(r"\[[\s\S]*\]", response)
+    try:
+        items = json.loads(match.group(0)) if match else []
+    except json.JSONDecodeError:
+        items = []
+    if not isinstance(items, list) or len(items) != len(clauses):
+        logger.warning("LLM plan did not match the %s requested steps", len(clauses))
+        return [None] * len(clauses)
+    return [_coerce_command(item) for item in items]
+
+
+async def plan_commands(instructions: List[str]) -> Dict[str, Any]:
+    """
+    Turn one or more instructions into an ordered, validated action plan
+    
+    Clauses the grammar understands cost no LLM call; all remaining ones
+    are resolved together in one batched LLM call. Fully valid plans are
+    cached by normalized instruction, unless a step types field values
+    (UNCACHED_ACTIONS).
+    
+    Args:
+        instructions: Natural-language instructions, executed in order
+        
+    Returns:
+        {"steps": [...], "success": bool, "cached": bool, "error": Optional[str]}
+    """
+    clauses = [clause for instruction in instructions for clause in split_instruction(instruction)]
+    if not clauses:
+        return {"steps": [], "success": False, "cached": False, "error": "Empty instruction"}
+    if len(clauses) > MAX_PLAN_STEPS:
+        return {"steps": [], "success": False, "cached": False, "error": f"Too many steps (max {MAX_PLAN_STEPS})"}
+    
+    key = "\n".join(normalize_command(clause) for clause in clauses)
+    cached = _plan_cache.get(key)
+    if cached is not None:
+        return {"steps": json.loads(json.dumps(cached)), "success": True, "cached": True, "error": None}
+    
+    steps = _grammar_steps(clauses)
+    unparsed = [step for step in steps if step["action"] is None]
+    if unparsed:
+        logger.info("Planning %s of %s steps with the LLM", len(unparsed), len(steps))
+        for step, parsed in zip(unparsed, await _llm_steps([step["text"] for step in unparsed])):
+            if parsed is not None:
+                step.update(parsed, confidence=0.8, source="llm")
+                if parsed["action"] not in UNCACHED_ACTIONS:
+                    _parse_cache.set(normalize_command(step["text"]), {**parsed, "confidence": 0.8})
+    
+    errors = []
+    for index, step in enumerate(steps, start=1):
+        step["step"] = index
+        step["error"] = validate_step(step["action"], step["params"]) if step["action"] else "Could not parse step"
+        step["valid"] = step["error"] is None
+        if not step["valid"]:
+            errors.append(f"step {index}: {step['error']}")
+    
+    if not errors and not any(step["action"] in UNCACHED_ACTIONS for step in steps):
+        _plan_cache.set(key, steps)
+    return {"steps": steps, "success": not errors, "cached": False, "error": "; ".join(errors) or None}
+
+
+# ============================================================================
+# Structured extraction
+# ============================================================================
+
+# Pages larger than this are scanned in a worker thread
+EXTRACT_THREAD_THRESHOLD = 200_000
+
+_MONTHS = {name: i for i, names in enumerate(
+    [("jan", "january"), ("feb", "february"), ("mar", "march"), ("apr", "april"), ("may",),
+     ("jun", "june"), ("jul", "july"), ("aug", "august"), ("sep", "sept", "september"),
+     ("oct", "october"), ("nov", "november"), ("dec", "december")], start=1) for name in names}
+_MONTH = r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)"
+_AMOUNT = r"\d{1,3}(?:,\d{3}){1,6}(?:\.\d{1,2})?|\d{1,12}(?:\.\d{1,2})?"
+_CURRENCY_SYMBOLS = {"$": "USD", "€": "EUR", "£": "GBP", "¥": "JPY", "₹": "INR"}
+
+# Every quantifier is bounded and alternatives are mutually exclusive at
+# their first characters, so a scan is linear in the page length. Order
+# matters: links before emails (mailto/userinfo), prices and dates before
+# phones (all are digit runs).
+_TOKEN_PATTERNS = {
+    "links": r"(?P<link>\bhttps?://[^\s<>\"'()\[\]{}]{1,2048})",
+    "emails": r"(?P<email>\b[A-Za-z0-9._%+-]{1,64}@[A-Za-z0-9-]{1,63}(?:\.[A-Za-z0-9-]{1,63}){0,6}\.[A-Za-z]{2,24}\b)",
+    "prices": rf"(?P<price>(?P<symbol>[$€£¥₹])\s?(?P<amount>{_AMOUNT})|(?P<amount2>{_AMOUNT})\s?(?P<code>USD|EUR|GBP|INR|JPY|Rs\.?)\b)",
+    "dates": (rf"(?P<date>\b(?P<iso>\d{{4}})-(?P<iso_m>\d{{1,2}})-(?P<iso_d>\d{{1,2}})\b"
+              rf"|\b(?P<num_a>\d{{1,2}})[/.](?P<num_b>\d{{1,2}})[/.](?P<num_y>\d{{4}}|\d{{2}})\b"
+              rf"|\b(?P<md_m>{_MONTH})\.?\s(?P<md_d>\d{{1,2}})(?:st|nd|rd|th)?,?\s(?P<md_y>\d{{4}})\b"
+              rf"|\b(?P<dm_d>\d{{1,2}})(?:st|nd|rd|th)?\s(?P<dm_m>{_MONTH})\.?,?\s(?P<dm_y>\d{{4}})\b)"),
+    "phones": r"(?P<phone>(?<![\w+])(?:\+\d{1,3}[\s.-]?)?(?:\(\d{1,4}\)[\s.-]?)?\d{2,5}(?:[\s.-]?\d{2,5}){1,4}(?![\w]))",
+}
+
+_TABLE_SEPARATOR = re.compile(r"^\|?\s*:?-{3,}:?\s*(?:\|\s*:?-{3,}:?\s*)*\|?$")
+
+
+@lru_cache(maxsize=None)
+def _scanner(targets: Tuple[str, ...]) -> Optional[Pattern]:
+    """One combined regex for the requested token targets (compiled once per set)"""
+    parts = [_TOKEN_PATTERNS[name] for name in _TOKEN_PATTERNS if name in targets]
+    # Tokens never start inside a word; rejecting those positions up front
+    # roughly halves scan time on prose-heavy pages
+    return re.compile(r"(?<![\w.%+-])(?:" + "|".join(parts) + ")", re.I) if parts else None
+
+
+def _iso_date(year: int, month: int, day: int) -> Optional[str]:
+    try:
+        return date(year, month, day).isoformat()
+    except ValueError:
+        return None
+
+
+def _parse_date(m: re.Match) -> Optional[Dict[str, Any]]:
+    """Typed date; numeric dates are read day-first only when month-first is impossible"""
+    if m["iso"]:
+        iso = _iso_date(int(m["iso"]), int(m["iso_m"]), int(m["iso_d"]))
+    elif m["num_a"]:
+        year = int(m["num_y"]) + (2000 if len(m["num_y"]) == 2 else 0)
+        first, second = int(m["num_a"]), int(m["num_b"])
+        iso = _iso_date(year, first, second) or _iso_date(year, second, first)
+    elif m["md_m"]:
+        iso = _iso_date(int(m["md_y"]), _MONTHS[m["md_m"].lower()], int(m["md_d"]))
+    else:
+        iso = _iso_date(int(m["dm_y"]), _MONTHS[m["dm_m"].lower()], int(m["dm_d"]))
+    return {"text": m["date"], "iso": iso} if iso else None
+
+
+def _parse_price(m: re.Match) -> Dict[str, Any]:
+    if m["symbol"]:
+        currency, amount = _CURRENCY_SYMBOLS[m["symbol"]], m["amount"]
+    else:
+        code = m["code"].upper().rstrip(".")
+        currency, amount = ("INR" if code == "RS" else code), m["amount2"]
+    return {"text": m["price"], "amount": float(amount.replace(",", "")), "currency": currency}
+
+
+def _parse_phone(m: re.Match) -> Optional[Dict[str, Any]]:
+    text = m["phone"]
+    digits = re.sub(r"\D", "", text)
+    if not 10 <= len(digits) <= 15:
+        return None
+    return {"text": text, "number": ("+" if text.startswith("+") else "") + digits}
+
+
+def _extract_tables(content: str, limit: int) -> List[Dict[str, Any]]:
+    """Pipe- or tab-separated runs of lines with a constant column count"""
+    tables: List[Dict[str, Any]] = []
+    rows: List[List[str]] = []
+    
+    def flush():
+        if len(rows) >= 2 and len(tables) < limit:
+            tables.append({"headers": rows[0], "rows": rows[1:]})
+        rows.clear()
+    
+    for line in content.splitlines():
+        line = line.strip()
+        if "|" in line:
+            if _TABLE_SEPARATOR.match(line):
+                continue
+            cells = [cell.strip() for cell in line.strip("|").split("|")]
+        elif "\t" in line:
+            cells = [cell.strip() for cell in line.split("\t")]
+        else:
+            flush()
+            continue
+        if len(cells) < 2 or (rows and len(cells) != len(rows[0])):
+            flush()
+            if len(cells) < 2:
+                continue
+        rows.append(cells)
+    flush()
+    return tables
+
+
+def extract_structured(content: str, targets: Optional[Iterable[str]] = None, limit: int = 100) -> Dict[str, List[Any]]:
+    """
+    Extract typed entities from page text without an LLM call
+    
+    All token targets are found in a single pass of one combined regex;
+    tables need a separate pass over the lines.
+    
+    Args:
+        content: Page text (e.g. the extension's pageContent)
+        targets: Subset of EXTRACT_TARGETS (defaults to all)
+        limit: Maximum unique results per target
+        
+    Returns:
+        Mapping of target to results: emails and links are strings, phones
+        {text, number}, dates {text, iso}, prices {text, amount, currency},
+        tables {headers, rows}
+    """
+    wanted = tuple(name for name in EXTRACT_TARGETS if targets is None or name in targets)
+    results: Dict[str, List[Any]] = {name: [] for name in wanted}
+    seen: Dict[str, set] = {name: set() for name in wanted}
+    
+    def add(target: str, key: str, value: Any) -> None:
+        if key not in seen[target] and len(results[target]) < limit:
+            seen[target].add(key)
+            results[target].append(value)
+    
+    scanner = _scanner(wanted)
+    if scanner is not None:
+        for m in scanner.finditer(content):
+            # Each alternative's outer group closes last, so it names the match
+            kind = m.lastgroup
+            if kind == "link":
+                link = m["link"].rstrip(".,;:!?")
+                add("links", link, link)
+            elif kind == "email":
+                add("emails", m["email"].lower(), m["email"].lower())
+            elif kind == "price":
+                price = _parse_price(m)
+                add("prices", f"{price['currency']}{price['amount']}", price)
+            elif kind == "phone":
+                phone = _parse_phone(m)
+                if phone:
+                    add("phones", phone["number"], phone)
+            else:
+                parsed = _parse_date(m)
+                if parsed:
+                    add("dates", parsed["iso"], parsed)
+    
+    if "tables" in results:
+        results["tables"] = _extract_tables(content, limit)
+    return results
+
+
+async def run_extract(params: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Execute the extract command against page content
+    
+    Args:
+        params: {"pageContent": str, "target": optional target, "targets": optional list, "limit": optional int}
+        
+    Returns:
+        {"results": {...}, "counts": {...}, "elapsed_ms": float}
+    """
+    content = params.get("pageContent") or params.get("page_content") or ""
+    targets = params.get("targets") or ([params["target"]] if params.get("target") else None)
+    if targets is not None:
+        unknown = [name for name in targets if name not in EXTRACT_TARGETS]
+        if unknown:
+            raise ValueError(f"Unsupported extract target(s): {', '.join(unknown)}. Supported: {', '.join(EXTRACT_TARGETS)}")
+    limit = int(params.get("limit") or 100)
+    
+    start = time.perf_counter()
+    if len(content) > EXTRACT_THREAD_THRESHOLD:
+        results = await asyncio.to_thread(extract_structured, content, targets, limit)
+    else:
+        results = extract_structured(content, targets, limit)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    counts = {name: len(items) for name, items in results.items()}
+    logger.info("Extracted %s from %s chars in %.1f ms", counts, len(content), elapsed_ms)
+    return {"results": results, "counts": counts, "elapsed_ms": round(elapsed_ms, 2)}
+
+
 async def execute_command(cmd: str, params: Optional[Dict[str, Any]] = None) -> str:
     """
     Execute browser command (Placeholder implementation)
@@ -34,11 +643,11 @@ async def execute_command(cmd: str, params: Optional[Dict[str, Any]] = None) ->
     Returns:
         Execution result message
     """
-    logger.info(f"[PLACEHOLDER] Command execution requested: {cmd}")
+    logger.info("[PLACEHOLDER] Command execution requested: %s", cmd)
     
     # Validate command
     if cmd not in SUPPORTED_COMMANDS:
-        logger.warning(f"Unknown command: {cmd}")
+        logger.warning("Unknown command: %s", cmd)
         return f"Unknown command: {cmd}. Supported commands: {', '.join(SUPPORTED_COMMANDS)}"
     
     # Return placeholder response
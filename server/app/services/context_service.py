@@ -47,7 +47,7 @@ async def extract_context(page_data: Dict[str, Any]) -> Dict[str, Any]:
     if "metadata" in page_data:
         context["metadata"] = page_data["metadata"]
     
-    logger.debug(f"Extracted context keys: {list(context.keys())}")
+    logger.debug("Extracted context keys: %s", list(context.keys()))
     
     return context
 
@@ -79,7 +79,7 @@ async def format_context(context: Dict[str, Any]) -> str:
         parts.append(f"Page Content: {content[:500]}..." if len(content) > 500 else f"Page Content: {content}")
     
     formatted = "\n".join(parts)
-    logger.debug(f"Formatted context: {len(formatted)} characters")
+    logger.debug("Formatted context: %s characters", len(formatted))
     
     return formatted
 
@@ -0,0 +1,281 @@
+"""
+VynceAI Backend - Job Service
+Background jobs for long-running analysis, with polling and subscriptions
+
+Submitting a job returns its ID immediately; a bounded pool of asyncio
+workers runs the jobs, so slow upstream calls no longer hold HTTP requests
+(and proxy connections) open for tens of seconds. While a job runs, its
+partial output is kept in process and pushed to subscribers. Job states
+are written to the "jobs" cache (JOB_RESULT_TTL_SECONDS) when a job is
+queued, starts and finishes; with CACHE_BACKEND="sqlite" any worker can
+answer a poll for them, though partial output and cancellation are only
+available on the worker running the job.
+"""
+
+import asyncio
+import contextvars
+import secrets
+import time
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from app.core.cache import get_cache
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import JOBS_RUNNING, JOBS_TOTAL
+from app.core.scheduler import current_priority, priority
+
+logger = get_logger(__name__)
+
+TERMINAL_STATUSES = ("done", "failed", "cancelled")
+
+# How often a subscriber re-reads the shared state of a job run elsewhere
+REMOTE_POLL_SECONDS = 1.0
+
+
+class QueueFullError(Exception):
+    """Raised when the job queue cannot take another job"""
+
+
+class Job:
+    """One background job and its progress"""
+
+    def __init__(self, kind: str, run: Callable[["Job"], Awaitable[Dict[str, Any]]]):
+        self.id = secrets.token_urlsafe(12)
+        self.kind = kind
+        self.status = "queued"  # queued -> running -> done | failed | cancelled
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.chunks: List[str] = []
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+        # Upstream calls of the job keep the submitting request's class and client
+        self.priority = current_priority()
+        self._run = run
+        self._changed = asyncio.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in TERMINAL_STATUSES
+
+    def emit(self, delta: str) -> None:
+        """Append partial output and wake subscribers"""
+        self.chunks.append(delta)
+        self._notify()
+
+    def _notify(self) -> None:
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    async def wait_changed(self, timeout: float) -> None:
+        """Wait for new output or a status change (or the timeout)"""
+        try:
+            await asyncio.wait_for(self._changed.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    def to_dict(self, partial: bool = True) -> Dict[str, Any]:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "partial": "".join(self.chunks) if partial and not self.finished else None,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class JobStore:
+    """Bounded job queue, worker pool and TTL result storage"""
+
+    def __init__(self, workers: int, queue_size: int, timeout: float, result_ttl: float):
+        self.workers = workers
+        self.queue_size = queue_size
+        self.timeout = timeout
+        self.result_ttl = result_ttl
+        self._jobs: Dict[str, Job] = {}
+        # Job state changes while other workers poll it: read it from the
+        # shared tier every time, never from a stale in-process copy
+        self._results = get_cache("jobs", settings.JOB_MAX_STORED, ttl=result_ttl, shared_only=True)
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+
+    @property
+    def running(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.status == "running")
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def submit(self, kind: str, run: Callable[[Job], Awaitable[Dict[str, Any]]]) -> Job:
+        """
+        Queue a job
+
+        Args:
+            kind: Job type (e.g. "analyze")
+            run: Coroutine function doing the work; it may call job.emit()
+                 with partial output and returns the result dict
+
+        Returns:
+            The queued Job
+
+        Raises:
+            QueueFullError: If JOB_QUEUE_SIZE jobs are already waiting
+        """
+        self._ensure_workers()
+        job = Job(kind, run)
+        try:
+            self._queue.put_nowait(job)
+        except asyncio.QueueFull:
+            JOBS_TOTAL.inc(kind, "rejected")
+            raise QueueFullError(f"Job queue is full ({self.queue_size} waiting)")
+        self._jobs[job.id] = job
+        self._publish(job)
+        JOBS_TOTAL.inc(kind, "submitted")
+        logger.info("Job %s (%s) queued, %s waiting", job.id, kind, self.queued)
+        return job
+
+    def get_live(self, job_id: str) -> Optional[Job]:
+        """Job still held by this worker (queued, running or just finished)"""
+        return self._jobs.get(job_id)
+
+    def snapshot(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Current state of a job, or None if unknown or expired"""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job.to_dict()
+        return self._results.get(job_id)
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job. Returns False if it is not live."""
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        if job.task is not None:
+            job.task.cancel()
+        else:
+            self._finish(job, "cancelled", error="Cancelled before start")
+        return True
+
+    async def subscribe(self, job_id: str, heartbeat: float = 15.0) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield events for a job until it finishes
+
+        Events: {"type": "status", ...snapshot}, {"type": "delta", "delta": str},
+        {"type": "heartbeat"}; the last event is a status event with a
+        terminal status.
+        """
+        job = self._jobs.get(job_id)
+        if job is None:
+            # Finished, or held by another worker: follow the shared state
+            status, quiet = None, 0.0
+            while True:
+                stored = self._results.get(job_id)
+                if stored is None:
+                    return
+                if stored["status"] != status:
+                    status, quiet = stored["status"], 0.0
+                    yield {"type": "status", **stored}
+                elif quiet >= heartbeat:
+                    quiet = 0.0
+                    yield {"type": "heartbeat"}
+                if status in TERMINAL_STATUSES:
+                    return
+                await asyncio.sleep(REMOTE_POLL_SECONDS)
+                quiet += REMOTE_POLL_SECONDS
+
+        status, sent = None, 0
+        while True:
+            if job.status != status and not job.finished:
+                status = job.status
+                yield {"type": "status", **job.to_dict(partial=False)}
+            if len(job.chunks) > sent:
+                delta = "".join(job.chunks[sent:])
+                sent = len(job.chunks)
+                yield {"type": "delta", "delta": delta}
+            if job.finished:
+                yield {"type": "status", **job.to_dict()}
+                return
+            changed = job._changed
+            await job.wait_changed(heartbeat)
+            if not changed.is_set():
+                yield {"type": "heartbeat"}
+
+    async def stop(self) -> None:
+        """Cancel workers and live jobs"""
+        for job in list(self._jobs.values()):
+            if job.task is not None:
+                job.task.cancel()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._tasks and self._tasks[0].get_loop() is loop:
+            return
+        # First use, or a new event loop (tests, reloads): start fresh
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        # Workers outlive the request that starts them: run them in an empty
+        # context so jobs never inherit its trace (request ID) or priority
+        self._tasks = [loop.create_task(self._worker(), context=contextvars.Context()) for _ in range(self.workers)]
+
+    def _publish(self, job: Job) -> None:
+        """Store the job's state for polls served by other workers"""
+        self._results.set(job.id, job.to_dict(partial=False), ttl=self.result_ttl)
+
+    def _finish(self, job: Job, status: str, result: Optional[Dict[str, Any]] = None, error: Optional[str] = None) -> None:
+        job.status, job.result, job.error = status, result, error
+        job.finished_at = time.time()
+        self._publish(job)
+        self._jobs.pop(job.id, None)
+        job._notify()
+        JOBS_TOTAL.inc(job.kind, status)
+        logger.info("Job %s %s after %.1fs", job.id, status, job.finished_at - job.created_at)
+
+    async def _worker(self) -> None:
+        queue = self._queue
+        while True:
+            job = await queue.get()
+            try:
+                if job.finished:
+                    continue
+                job.status, job.started_at = "running", time.time()
+                self._publish(job)
+                job._notify()
+                with priority(*job.priority):
+                    job.task = asyncio.get_running_loop().create_task(job._run(job))
+                JOBS_RUNNING.inc()
+                try:
+                    result = await asyncio.wait_for(asyncio.shield(job.task), self.timeout)
+                    self._finish(job, "done", result=result)
+                except asyncio.TimeoutError:
+                    job.task.cancel()
+                    self._finish(job, "failed", error=f"Timed out after {self.timeout:.0f}s")
+                except asyncio.CancelledError:
+                    if not job.task.cancelled():
+                        raise  # the worker itself is being stopped
+                    self._finish(job, "cancelled", error="Cancelled")
+                except Exception as e:
+                    logger.error("Job %s failed: %s", job.id, e)
+                    self._finish(job, "failed", error=str(e))
+                finally:
+                    JOBS_RUNNING.dec()
+            finally:
+                queue.task_done()
+
+
+# Singleton instance
+job_store = JobStore(
+    settings.JOB_WORKERS,
+    settings.JOB_QUEUE_SIZE,
+    settings.JOB_TIMEOUT_SECONDS,
+    settings.JOB_RESULT_TTL_SECONDS
+)
@@ -1,24 +1,102 @@
 """
 VynceAI Backend - LLM Client
 Dual-model implementation: Gemini (site-specific) + Llama (general)
+
+Provider SDKs (google.generativeai, aiohttp) are imported on first use,
+not at module load, so importing app.services stays cheap for tests, CLI
+tools and new workers. The app lifespan calls initialize() in a worker
+thread right after startup so the first request does not pay for it.
 """
 
 import asyncio
-import aiohttp
-from typing import Optional, Dict, Any
+import json
+import threading
+import time
+from collections import deque
+from typing import Optional, Dict, Any, AsyncIterator, Deque, Tuple
 
 from app.core.config import settings
 from app.core.logger import get_logger
+from app.core.metrics import ERRORS_TOTAL, ROUTING_DECISIONS, SPECULATIVE_DISPATCHES, UPSTREAM_LATENCY, UPSTREAM_TTFT
+from app.core.admission import admission
+from app.core.scheduler import upstream_scheduler
+from app.core.tracing import annotate, stage
+from app.services.local_answers import answer_locally
 
 logger = get_logger(__name__)
 
-# Import Gemini SDK
-try:
-    import google.generativeai as genai
-    GEMINI_AVAILABLE = True
-except ImportError:
-    GEMINI_AVAILABLE = False
-    logger.warning("Gemini SDK not installed. Run: pip install google-generativeai")
+
+# System prompt for Llama (general queries)
+LLAMA_SYSTEM_PROMPT = """You are VynceAI, a friendly and knowledgeable AI assistant integrated into a Chrome browser extension.
+
+STRICT RULES:
+- DO NOT use emojis in responses
+- Be friendly but professional
+- Provide accurate, helpful information
+- Keep responses concise and clear
+- Do not hallucinate or make up information
+
+ABOUT VYNCEAI:
+VynceAI is a Chrome browser extension that provides:
+- AI-powered web page analysis
+- Intelligent chat assistance while browsing
+- Context-aware responses based on page content
+- Dual AI system (Gemini for page analysis, Llama for general chat)
+
+YOUR ROLE:
+- Answer general questions conversationally
+- Help with product-related queries about VynceAI
+- Assist developers with technical questions
+- Provide friendly, accurate responses
+- Redirect site-specific questions to page content
+
+When users ask about you, identify as VynceAI, a Chrome extension assistant."""
+
+
+# Gemini's fixed answer to non-page questions (see _build_prompt)
+MODE_REDIRECT_MESSAGE = "I specialize in analyzing page content. Please switch to General Mode for general questions and conversations."
+MODE_REDIRECT_MARKER = "switch to general mode"
+
+# Appended for Gemini when a speculative prompt was built by the caller
+# (ai_service) and so lacks the strict rules of _build_prompt
+MODE_REDIRECT_RULE = f'\n\nIf the question is not about the page content above, respond EXACTLY with: "{MODE_REDIRECT_MESSAGE}"'
+
+
+def is_mode_redirect(text: str) -> bool:
+    """Detect Gemini declining a question as not being about the page"""
+    return MODE_REDIRECT_MARKER in text[:300].lower()
+
+
+class UpstreamError(str):
+    """
+    Error text the client returns (or yields) in place of a model answer
+
+    It is a str so callers can show it like an answer; tell the two apart
+    with is_error_response(), never by looking at the text.
+    """
+
+
+def is_error_response(text: str) -> bool:
+    """Whether the client returned an error instead of a model answer"""
+    return isinstance(text, UpstreamError)
+
+
+class SpeculationBudget:
+    """Caps speculative dispatches within any one-minute window"""
+    
+    def __init__(self, per_minute: int):
+        self.per_minute = per_minute
+        self._starts: Deque[float] = deque()
+    
+    def try_acquire(self) -> bool:
+        """Take one dispatch from the budget; False if the minute's budget is spent"""
+        now = time.monotonic()
+        while self._starts and now - self._starts[0] >= 60:
+            self._starts.popleft()
+        if len(self._starts) >= self.per_minute:
+            return False
+        self._starts.append(now)
+        return True
 
 
 class LLMClient:
@@ -29,24 +107,150 @@ class LLMClient:
     """
     
     def __init__(self):
-        """Initialize both Gemini and Llama clients"""
-        logger.info(f"Initializing VynceAI Dual-Model LLM Client")
-        self._init_gemini()
-        self._init_llama()
+        """Create the client (providers are set up lazily, see initialize)"""
+        self._genai = None
+        self._aiohttp = None
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        self._gemini_models: Dict[str, Any] = {}
+        self._session = None
+        self._session_loop = None
+        self._speculation_budget = SpeculationBudget(settings.SPECULATIVE_MAX_PER_MINUTE)
+    
+    @property
+    def initialized(self) -> bool:
+        return self._initialized
+    
+    def initialize(self) -> None:
+        """
+        Import provider SDKs and initialize both Gemini and Llama clients
+        
+        Idempotent and thread-safe. Blocking (the Gemini SDK takes about a
+        second to import), so call it from a worker thread.
+        """
+        if self._initialized:
+            return
+        with self._init_lock:
+            if self._initialized:
+                return
+            start = time.perf_counter()
+            logger.info("Initializing VynceAI Dual-Model LLM Client")
+            self._init_gemini()
+            self._init_llama()
+            self._initialized = True
+            logger.info("LLM client initialized in %.0f ms", (time.perf_counter() - start) * 1000)
+    
+    async def _ensure_initialized(self) -> None:
+        """Initialize on first use without blocking the event loop"""
+        if not self._initialized:
+            await asyncio.to_thread(self.initialize)
     
     def _init_gemini(self):
         """Initialize Gemini client"""
-        if GEMINI_AVAILABLE and settings.GEMINI_API_KEY:
+        try:
+            import google.generativeai as genai
+        except ImportError:
+            logger.warning("Gemini SDK not installed. Run: pip install google-generativeai")
+            genai = None
+        
+        if genai is not None and settings.GEMINI_API_KEY:
             genai.configure(api_key=settings.GEMINI_API_KEY)
             logger.info("✓ Gemini client initialized (site-specific queries)")
         else:
-            if not GEMINI_AVAILABLE:
+            if genai is None:
                 logger.error("✗ Gemini SDK not installed")
             elif not settings.GEMINI_API_KEY:
                 logger.error("✗ Gemini API key not configured")
+        self._genai = genai
+    
+    def _gemini_model(self, model_name: str) -> Any:
+        """Cached GenerativeModel handle for a model name"""
+        handle = self._gemini_models.get(model_name)
+        if handle is None:
+            handle = self._gemini_models[model_name] = self._genai.GenerativeModel(model_name)
+        return handle
+    
+    def _http_session(self) -> Any:
+        """
+        Shared aiohttp session for Groq calls
+        
+        Keeps a keep-alive connection pool instead of paying DNS and TLS on
+        every request. Recreated if the event loop changes (e.g. in tests).
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = self._aiohttp.TCPConnector(
+                limit=settings.HTTP_POOL_SIZE,
+                keepalive_timeout=settings.HTTP_KEEPALIVE_SECONDS,
+                ttl_dns_cache=300
+            )
+            self._session = self._aiohttp.ClientSession(connector=connector)
+            self._session_loop = loop
+        return self._session
+    
+    async def close(self) -> None:
+        """Close pooled upstream connections"""
+        if self._session is not None and not self._session.closed and self._session_loop is asyncio.get_running_loop():
+            await self._session.close()
+        self._session = None
+    
+    async def warmup(self, probe: bool = False) -> Dict[str, str]:
+        """
+        Prepare upstream connections and model handles before serving
+        
+        - imports the SDKs and configures providers
+        - builds the default Gemini model handle
+        - opens a pooled keep-alive connection to the Groq API
+        - with probe=True, makes one cheap metadata call per provider
+          (Gemini model lookup, Groq model list; no tokens are generated)
+        
+        Args:
+            probe: Whether to send the probe calls
+            
+        Returns:
+            Outcome per step ("ok", "skipped" or an error message)
+        """
+        await self._ensure_initialized()
+        steps: Dict[str, str] = {}
+        
+        if self._genai is not None and settings.GEMINI_API_KEY:
+            model_name = self._gemini_model_name(None)
+            try:
+                self._gemini_model(model_name)
+                if probe:
+                    await asyncio.to_thread(self._genai.get_model, f"models/{model_name}")
+                steps["gemini"] = "ok"
+            except Exception as e:
+                steps["gemini"] = f"error: {e}"
+        else:
+            steps["gemini"] = "skipped"
+        
+        if settings.LLM_API_KEY and settings.LLM_API_URL:
+            try:
+                session = self._http_session()
+                if probe:
+                    models_url = settings.LLM_API_URL.rsplit("/chat/completions", 1)[0] + "/models"
+                    async with session.get(models_url, headers=self._llama_headers()) as response:
+                        await response.read()
+                        steps["llama"] = "ok" if response.status == 200 else f"error: HTTP {response.status}"
+                else:
+                    # Any response (even 404/405) leaves a warm TLS connection in
+                    # the pool; GET rather than HEAD, which aiohttp does not reuse
+                    async with session.get(settings.LLM_API_URL) as response:
+                        await response.read()
+                    steps["llama"] = "ok"
+            except Exception as e:
+                steps["llama"] = f"error: {e}"
+        else:
+            steps["llama"] = "skipped"
+        
+        return steps
     
     def _init_llama(self):
         """Initialize Llama/Groq client"""
+        import aiohttp
+        self._aiohttp = aiohttp
+        
         if settings.LLM_API_KEY and settings.LLM_API_URL:
             logger.info("✓ Llama/Groq client initialized (general queries)")
         else:
@@ -57,7 +261,20 @@ class LLMClient:
     
     def _is_site_specific_query(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> bool:
         """
-        Determine if query is site-specific or general
+        Determine if query is site-specific or general (see _route_query)
+        
+        Args:
+            prompt: User's query
+            context: Optional page context
+            
+        Returns:
+            True if site-specific, False if general
+        """
+        return self._route_query(prompt, context)[0]
+    
+    def _route_query(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> Tuple[bool, float]:
+        """
+        Determine if query is site-specific or general, and how sure that is
         
         Site-specific queries include:
         - Questions about current page
@@ -71,14 +288,20 @@ class LLMClient:
         - General conversation
         - No page context
         
+        Confidence is lowest where page context is present but the query
+        does not clearly say whether it is about the page (short questions,
+        vague references such as "this" or "here").
+        
         Args:
             prompt: User's query
             context: Optional page context
             
         Returns:
-            True if site-specific, False if general
+            Tuple of (True if site-specific, confidence between 0 and 1)
         """
         prompt_lower = prompt.lower().strip()
+        has_context = bool(context and (context.get("pageContent") or context.get("snippet") or context.get("selectedText")))
+        references_page = any(word in prompt_lower for word in ["this", "here", "page", "content", "article"])
         
         # FIRST: Check for general patterns (these override context presence)
         general_patterns = [
@@ -92,13 +315,15 @@ class LLMClient:
         # Check if it starts with or matches general patterns
         for pattern in general_patterns:
             if prompt_lower.startswith(pattern) or prompt_lower == pattern:
-                logger.info(f"💬 General query detected (pattern: '{pattern}')")
-                return False
+                logger.info("💬 General query detected (pattern: '%s')", pattern)
+                if not has_context:
+                    return False, 0.9
+                return False, 0.55 if references_page else 0.75
         
         # SECOND: Check if query is very short and conversational (likely general)
         if len(prompt.split()) <= 3:
             logger.info("💬 General query detected (short conversational query)")
-            return False
+            return False, 0.5 if has_context else 0.85
         
         # THIRD: Check for site-specific keywords
         site_keywords = [
@@ -111,19 +336,40 @@ class LLMClient:
         
         for keyword in site_keywords:
             if keyword in prompt_lower:
-                logger.info(f"🎯 Site-specific query detected (keyword: '{keyword}')")
-                return True
+                logger.info("🎯 Site-specific query detected (keyword: '%s')", keyword)
+                return True, 0.9
         
         # FOURTH: Only if query references page content AND context exists
-        if context and (context.get("pageContent") or context.get("snippet") or context.get("selectedText")):
+        if has_context:
             # Query must explicitly reference the page content
-            if any(word in prompt_lower for word in ["this", "here", "page", "content", "article"]):
+            if references_page:
                 logger.info("🎯 Site-specific query detected (has context + references page)")
-                return True
+                return True, 0.6
         
         # Default to general for everything else
         logger.info("💬 Defaulting to general query")
-        return False
+        return False, 0.6 if has_context else 0.8
+    
+    def local_answer(self, prompt: str) -> Optional[str]:
+        """
+        Answer greetings, identity questions and arithmetic without an upstream call
+        
+        Args:
+            prompt: User's prompt/question (as typed, before prompt building)
+            
+        Returns:
+            Answer text, or None if the prompt should go to a model
+        """
+        if not settings.LOCAL_ANSWERS_ENABLED:
+            return None
+        with stage("local"):
+            answer = answer_locally(prompt)
+        if answer is None:
+            return None
+        logger.info("⚡ Answered locally (%s, confidence %.2f)", answer.kind, answer.confidence)
+        ROUTING_DECISIONS.inc("local")
+        annotate(provider="local", local_kind=answer.kind)
+        return answer.text
     
     async def generate(
         self,
@@ -131,14 +377,18 @@ class LLMClient:
         model: Optional[str] = None,
         context: Optional[Dict[str, Any]] = None,
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        route_prompt: Optional[str] = None,
+        route_context: Optional[Dict[str, Any]] = None
     ) -> str:
         """
         Generate AI response using intelligent model routing
         
         Automatically routes to:
+        - Local answers: for greetings, identity questions and arithmetic
         - Gemini: for site-specific queries
         - Llama: for general queries
+        - Both (SPECULATIVE_ROUTING): when routing with page context is unsure
         
         Args:
             prompt: User's prompt/question
@@ -146,21 +396,206 @@ class LLMClient:
             context: Optional page context
             temperature: Optional temperature override
             max_tokens: Optional max tokens override
+            route_prompt: The question as typed, when prompt is already a
+                built prompt (routing looks at this instead)
+            route_context: Page context for routing, when it is already
+                part of the built prompt
             
         Returns:
-            Generated text response
+            Generated text response, or an UpstreamError
         """
+        question = route_prompt or prompt
+        page = route_context if route_context is not None else context
+        local = self.local_answer(question)
+        if local is not None:
+            return local
+        
         # Determine which model to use
-        is_site_specific = self._is_site_specific_query(prompt, context)
+        with stage("routing"):
+            is_site_specific, confidence = self._route_query(question, page)
+        provider = "gemini" if is_site_specific else "llama"
         
+        if self._should_speculate(confidence, page):
+            return await self._generate_speculative(provider, prompt, model, context, temperature, max_tokens)
+        
+        ROUTING_DECISIONS.inc(provider)
+        annotate(provider=provider, model=model)
         if is_site_specific:
             # Use Gemini for site-specific queries
             logger.info("🎯 Routing to Gemini (site-specific)")
-            return await self._generate_with_gemini(prompt, model, context, temperature, max_tokens)
         else:
             # Use Llama for general queries
             logger.info("💬 Routing to Llama (general)")
-            return await self._generate_with_llama(prompt, model, context, temperature, max_tokens)
+        return await self._call_provider(provider, prompt, model, context, temperature, max_tokens)
+    
+    async def _call_provider(
+        self,
+        provider: str,
+        prompt: str,
+        model: Optional[str],
+        context: Optional[Dict[str, Any]],
+        temperature: Optional[float],
+        max_tokens: Optional[int]
+    ) -> str:
+        """Run one provider call in an upstream slot, recording latency and errors"""
+        generate = self._generate_with_gemini if provider == "gemini" else self._generate_with_llama
+        
+        # Wait for an upstream slot (priority class / fair share of this client)
+        async with upstream_scheduler.slot():
+            start = time.perf_counter()
+            with stage(f"upstream_{provider}"):
+                result = await generate(prompt, model, context, temperature, max_tokens)
+            elapsed = time.perf_counter() - start
+            UPSTREAM_LATENCY.observe(elapsed, provider)
+            admission.record_latency(elapsed)
+        
+        if is_error_response(result):
+            ERRORS_TOTAL.inc(f"upstream_{provider}")
+        return result
+    
+    def _should_speculate(self, confidence: float, context: Optional[Dict[str, Any]]) -> bool:
+        """Whether a routing decision is unsure enough to ask both models"""
+        if not settings.SPECULATIVE_ROUTING or confidence >= settings.SPECULATIVE_CONFIDENCE_THRESHOLD:
+            return False
+        # The acceptance check relies on Gemini's General Mode redirect, which
+        # it is only instructed to give when page context is passed
+        if not context:
+            return False
+        # No extra upstream calls while calls are already queuing
+        if upstream_scheduler.waiting:
+            return False
+        if not self._speculation_budget.try_acquire():
+            SPECULATIVE_DISPATCHES.inc("budget_exhausted")
+            return False
+        return True
+    
+    async def _generate_speculative(
+        self,
+        guess: str,
+        prompt: str,
+        model: Optional[str],
+        context: Optional[Dict[str, Any]],
+        temperature: Optional[float],
+        max_tokens: Optional[int]
+    ) -> str:
+        """
+        Ask Gemini and Llama concurrently and keep the acceptable answer
+        
+        Gemini's answer is used unless it is an error or the "switch to
+        General Mode" redirect (its own verdict that the question is not
+        about the page); then Llama's answer is used. When the routing guess
+        was Llama and Llama answers first, its answer is used without
+        waiting for Gemini. The other call is cancelled as soon as the
+        answer is chosen, so a wrong routing guess no longer costs a second
+        round trip.
+        """
+        logger.info("🔀 Unsure routing (guessed %s): asking Gemini and Llama", guess)
+        # Without context the page is already in the prompt, but not the redirect rule
+        gemini_prompt = prompt if context else prompt + MODE_REDIRECT_RULE
+        gemini = asyncio.ensure_future(self._call_provider("gemini", gemini_prompt, model, context, temperature, max_tokens))
+        llama = asyncio.ensure_future(self._call_provider("llama", prompt, model, context, temperature, max_tokens))
+        try:
+            done, _ = await asyncio.wait((gemini, llama), return_when=asyncio.FIRST_COMPLETED)
+            if (guess == "llama" and llama in done and llama.exception() is None
+                    and not is_error_response(llama.result())):
+                result, winner = llama.result(), "llama"
+            else:
+                result = await gemini
+                winner = "gemini"
+                if is_error_response(result) or is_mode_redirect(result):
+                    fallback = await llama
+                    # An error from Llama does not replace Gemini's redirect
+                    if not is_error_response(fallback) or is_error_response(result):
+                        result, winner = fallback, "llama"
+        finally:
+            for task in (gemini, llama):
+                if not task.done():
+                    task.cancel()
+        
+        SPECULATIVE_DISPATCHES.inc(winner)
+        ROUTING_DECISIONS.inc(winner)
+        annotate(provider=winner, model=model, speculative=True, routing_guess=guess)
+        logger.info("🔀 Speculative dispatch answered by %s", winner)
+        return result
+    
+    async def generate_stream(
+        self,
+        prompt: str,
+        model: Optional[str] = None,
+        context: Optional[Dict[str, Any]] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        route_prompt: Optional[str] = None,
+        route_context: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[str]:
+        """
+        Stream AI response chunks using the same routing as generate()
+        
+        Errors are yielded as an UpstreamError chunk (possibly after some
+        output), mirroring generate().
+        
+        Args:
+            prompt: User's prompt/question
+            model: Optional specific model override
+            context: Optional page context
+            temperature: Optional temperature override
+            max_tokens: Optional max tokens override
+            route_prompt: The question as typed, when prompt is already built
+            route_context: Page context for routing, when already in prompt
+            
+        Yields:
+            Response text chunks as they arrive
+        """
+        question = route_prompt or prompt
+        page = route_context if route_context is not None else context
+        local = self.local_answer(question)
+        if local is not None:
+            yield local
+            return
+        
+        with stage("routing"):
+            is_site_specific = self._is_site_specific_query(question, page)
+        provider = "gemini" if is_site_specific else "llama"
+        ROUTING_DECISIONS.inc(provider)
+        annotate(provider=provider, model=model, streaming=True)
+        
+        if is_site_specific:
+            logger.info("🎯 Routing to Gemini (site-specific, streaming)")
+            stream = self._gemini_stream(
+                self._build_prompt(prompt, context),
+                self._gemini_model_name(model)
+            )
+        else:
+            logger.info("💬 Routing to Llama (general, streaming)")
+            stream = self._llama_stream(
+                prompt,
+                LLAMA_SYSTEM_PROMPT,
+                self._llama_model_name(model),
+                temperature or 0.7,
+                max_tokens or 512
+            )
+        
+        # The slot is held until the stream ends (or the consumer stops reading)
+        try:
+            async with upstream_scheduler.slot():
+                start = time.perf_counter()
+                first = True
+                with stage(f"upstream_{provider}"):
+                    async for chunk in stream:
+                        if first:
+                            ttft = time.perf_counter() - start
+                            UPSTREAM_TTFT.observe(ttft, provider)
+                            annotate(ttft_ms=round(ttft * 1000, 1))
+                            first = False
+                        if is_error_response(chunk):
+                            ERRORS_TOTAL.inc(f"upstream_{provider}")
+                        yield chunk
+                elapsed = time.perf_counter() - start
+                UPSTREAM_LATENCY.observe(elapsed, provider)
+                admission.record_latency(elapsed)
+        finally:
+            # Stop the provider stream now, not when it is garbage collected
+            await stream.aclose()
     
     async def _generate_with_gemini(
         self,
@@ -173,15 +608,7 @@ class LLMClient:
         """Generate response using Gemini"""
         temp = temperature or settings.TEMPERATURE
         tokens = max_tokens or settings.MAX_TOKENS
-        
-        # Ensure we use a Gemini model (not Llama)
-        if model and "llama" in model.lower():
-            logger.warning(f"⚠️ Llama model requested for site-specific query, using default Gemini model")
-            model = None
-        
-        # Use default Gemini model if not specified
-        if not model:
-            model = settings.GEMINI_MODEL
+        model = self._gemini_model_name(model)
         
         # Build enhanced prompt with context
         enhanced_prompt = self._build_prompt(prompt, context)
@@ -191,7 +618,7 @@ class LLMClient:
         except Exception as e:
             error_msg = f"Gemini error: {str(e)}"
             logger.error(error_msg)
-            return error_msg
+            return UpstreamError(error_msg)
     
     async def _generate_with_llama(
         self,
@@ -204,48 +631,41 @@ class LLMClient:
         """Generate response using Llama via Groq"""
         temp = temperature or 0.7
         tokens = max_tokens or 512
-        
-        # Ensure we use a Llama model (not Gemini)
-        if model and "gemini" in model.lower():
-            logger.warning(f"⚠️ Gemini model requested for general query, using default Llama model")
-            model = None
-        
-        # Use default Llama model if not specified
-        if not model:
-            model = settings.LLAMA_MODEL
+        model = self._llama_model_name(model)
         
         # Build system prompt for Llama (general queries)
-        system_prompt = """You are VynceAI, a friendly and knowledgeable AI assistant integrated into a Chrome browser extension.
-
-STRICT RULES:
-- DO NOT use emojis in responses
-- Be friendly but professional
-- Provide accurate, helpful information
-- Keep responses concise and clear
-- Do not hallucinate or make up information
-
-ABOUT VYNCEAI:
-VynceAI is a Chrome browser extension that provides:
-- AI-powered web page analysis
-- Intelligent chat assistance while browsing
-- Context-aware responses based on page content
-- Dual AI system (Gemini for page analysis, Llama for general chat)
-
-YOUR ROLE:
-- Answer general questions conversationally
-- Help with product-related queries about VynceAI
-- Assist developers with technical questions
-- Provide friendly, accurate responses
-- Redirect site-specific questions to page content
-
-When users ask about you, identify as VynceAI, a Chrome extension assistant."""
+        system_prompt = LLAMA_SYSTEM_PROMPT
         
         try:
             return await self._llama_generate(prompt, system_prompt, model, temp, tokens)
         except Exception as e:
             error_msg = f"Llama error: {str(e)}"
             logger.error(error_msg)
-            return error_msg
+            return UpstreamError(error_msg)
+    
+    def _gemini_model_name(self, model: Optional[str]) -> str:
+        """Resolve the Gemini model to use for a site-specific query"""
+        # Ensure we use a Gemini model (not Llama)
+        if model and "llama" in model.lower():
+            logger.warning("⚠️ Llama model requested for site-specific query, using default Gemini model")
+            model = None
+        
+        # Use default Gemini model if not specified
+        model_name = model or settings.GEMINI_MODEL
+        # Remove 'models/' prefix if present
+        if model_name.startswith('models/'):
+            model_name = model_name.replace('models/', '')
+        return model_name
+    
+    def _llama_model_name(self, model: Optional[str]) -> str:
+        """Resolve the Llama model to use for a general query"""
+        # Ensure we use a Llama model (not Gemini)
+        if model and "gemini" in model.lower():
+            logger.warning("⚠️ Gemini model requested for general query, using default Llama model")
+            model = None
+        
+        # Use default Llama model if not specified
+        return model or settings.LLAMA_MODEL
     
     def _build_prompt(self, prompt: str, context: Optional[Dict[str, Any]] = None) -> str:
         """Build enhanced prompt for Gemini with strict site-specific focus"""
@@ -255,7 +675,7 @@ When users ask about you, identify as VynceAI, a Chrome extension assistant."""
         context_parts = []
         
         # Add strict system instructions for Gemini (site-specific)
-        context_parts.append("""You are VynceAI, a precise AI assistant specialized in analyzing web pages.
+        context_parts.append(f"""You are VynceAI, a precise AI assistant specialized in analyzing web pages.
 
 STRICT RULES - CRITICAL:
 - ONLY analyze and respond based on the provided page content below
@@ -274,7 +694,7 @@ If the user's question is:
 - Any topic NOT in the page content below
 
 YOU MUST respond EXACTLY with this message:
-"I specialize in analyzing page content. Please switch to General Mode for general questions and conversations."
+"{MODE_REDIRECT_MESSAGE}"
 
 DO NOT try to answer these questions. ONLY redirect to General Mode.
 
@@ -307,33 +727,66 @@ ONLY answer if the question is directly about the page content below.""")
         max_tokens: int = 1000
     ) -> str:
         """Generate response using Google Gemini API"""
-        if not GEMINI_AVAILABLE:
-            return "Error: Gemini SDK not installed. Run: pip install google-generativeai"
+        await self._ensure_initialized()
+        if self._genai is None:
+            return UpstreamError("Error: Gemini SDK not installed. Run: pip install google-generativeai")
         if not settings.GEMINI_API_KEY:
-            return "Error: Gemini API key not configured"
+            return UpstreamError("Error: Gemini API key not configured")
         
         try:
-            model_name = model or settings.GEMINI_MODEL
-            # Remove 'models/' prefix if present
-            if model_name.startswith('models/'):
-                model_name = model_name.replace('models/', '')
+            model_name = self._gemini_model_name(model)
             
-            logger.info(f"Calling Gemini API with model: {model_name}")
+            logger.info("Calling Gemini API with model: %s", model_name)
             
-            gemini_model = genai.GenerativeModel(model_name)
+            gemini_model = self._gemini_model(model_name)
             response = await asyncio.to_thread(
                 gemini_model.generate_content,
                 prompt
             )
             
             result = response.text.strip()
-            logger.info(f"Gemini response received: {len(result)} characters")
+            logger.info("Gemini response received: %s characters", len(result))
             return result
         
         except Exception as e:
             error_msg = f"Gemini API error: {str(e)}"
             logger.error(error_msg)
-            return error_msg
+            return UpstreamError(error_msg)
+    
+    def _llama_headers(self) -> Dict[str, str]:
+        """HTTP headers for the Groq API"""
+        return {
+            "Content-Type": "application/json",
+            "Authorization": f"Bearer {settings.LLM_API_KEY}"
+        }
+    
+    def _llama_payload(
+        self,
+        prompt: str,
+        system_prompt: str,
+        model_name: str,
+        temperature: float,
+        max_tokens: int
+    ) -> Dict[str, Any]:
+        """Request body for the Groq chat completions API"""
+        return {
+            "model": model_name,
+            "messages": [
+                {
+                    "role": "system",
+                    "content": system_prompt,
+                },
+                {
+                    "role": "user",
+                    "content": prompt,
+                }
+            ],
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "top_p": 0.95,
+            "frequency_penalty": 0.0,
+            "presence_penalty": 0.0,
+        }
     
     async def _llama_generate(
         self,
@@ -344,64 +797,142 @@ ONLY answer if the question is directly about the page content below.""")
         max_tokens: int = 512
     ) -> str:
         """Generate response using Llama via Groq API"""
+        await self._ensure_initialized()
         if not settings.LLM_API_KEY:
-            return "Error: Llama API key not configured"
+            return UpstreamError("Error: Llama API key not configured")
         if not settings.LLM_API_URL:
-            return "Error: Llama API URL not configured"
+            return UpstreamError("Error: Llama API URL not configured")
         
         try:
             model_name = model or settings.LLAMA_MODEL
+            headers = self._llama_headers()
+            data = self._llama_payload(prompt, system_prompt, model_name, temperature, max_tokens)
             
-            headers = {
-                "Content-Type": "application/json",
-                "Authorization": f"Bearer {settings.LLM_API_KEY}"
-            }
-            
-            data = {
-                "model": model_name,
-                "messages": [
-                    {
-                        "role": "system",
-                        "content": system_prompt,
-                    },
-                    {
-                        "role": "user",
-                        "content": prompt,
-                    }
-                ],
-                "max_tokens": max_tokens,
-                "temperature": temperature,
-                "top_p": 0.95,
-                "frequency_penalty": 0.0,
-                "presence_penalty": 0.0,
-            }
-            
-            logger.info(f"Calling Llama API via Groq: {model_name}")
+            logger.info("Calling Llama API via Groq: %s", model_name)
             
-            async with aiohttp.ClientSession() as session:
-                async with session.post(settings.LLM_API_URL, headers=headers, json=data) as response:
-                    if response.status != 200:
-                        error_text = await response.text()
-                        error_msg = f"Llama API error {response.status}: {error_text}"
-                        logger.error(error_msg)
-                        return error_msg
-                    
-                    result = await response.json()
-                    
-                    # Extract response from Groq/OpenAI format
-                    if "choices" in result and len(result["choices"]) > 0:
-                        content = result["choices"][0]["message"]["content"]
-                        logger.info(f"Llama response received: {len(content)} characters")
-                        return content.strip()
-                    else:
-                        error_msg = "Llama API returned unexpected format"
-                        logger.error(error_msg)
-                        return error_msg
+            session = self._http_session()
+            async with session.post(settings.LLM_API_URL, headers=headers, json=data) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    error_msg = f"Llama API error {response.status}: {error_text}"
+                    logger.error(error_msg)
+                    return UpstreamError(error_msg)
+                
+                result = await response.json()
+                
+                # Extract response from Groq/OpenAI format
+                if "choices" in result and len(result["choices"]) > 0:
+                    content = result["choices"][0]["message"]["content"]
+                    logger.info("Llama response received: %s characters", len(content))
+                    return content.strip()
+                else:
+                    error_msg = "Llama API returned unexpected format"
+                    logger.error(error_msg)
+                    return UpstreamError(error_msg)
+        
+        except Exception as e:
+            error_msg = f"Llama API error: {str(e)}"
+            logger.error(error_msg)
+            return UpstreamError(error_msg)
+    
+    async def _gemini_stream(self, prompt: str, model_name: str) -> AsyncIterator[str]:
+        """Stream response chunks from Gemini (SDK iteration runs in a worker thread)"""
+        await self._ensure_initialized()
+        if self._genai is None:
+            yield UpstreamError("Error: Gemini SDK not installed. Run: pip install google-generativeai")
+            return
+        if not settings.GEMINI_API_KEY:
+            yield UpstreamError("Error: Gemini API key not configured")
+            return
+        
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+        stop = threading.Event()
+        done = object()
+        
+        def produce():
+            try:
+                gemini_model = self._gemini_model(model_name)
+                for chunk in gemini_model.generate_content(prompt, stream=True):
+                    if stop.is_set():
+                        break
+                    if chunk.text:
+                        loop.call_soon_threadsafe(queue.put_nowait, chunk.text)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, e)
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, done)
+        
+        logger.info("Streaming from Gemini API with model: %s", model_name)
+        producer = asyncio.ensure_future(asyncio.to_thread(produce))
+        
+        try:
+            while True:
+                item = await queue.get()
+                if item is done:
+                    break
+                if isinstance(item, Exception):
+                    error_msg = f"Gemini API error: {str(item)}"
+                    logger.error(error_msg)
+                    yield UpstreamError(error_msg)
+                    break
+                yield item
+        finally:
+            # The SDK call cannot be interrupted; stop forwarding chunks instead
+            # and let the thread finish on its own
+            stop.set()
+            producer.cancel()
+            await asyncio.gather(producer, return_exceptions=True)
+    
+    async def _llama_stream(
+        self,
+        prompt: str,
+        system_prompt: str,
+        model_name: str,
+        temperature: float,
+        max_tokens: int
+    ) -> AsyncIterator[str]:
+        """Stream response chunks from Llama via Groq server-sent events"""
+        await self._ensure_initialized()
+        if not settings.LLM_API_KEY:
+            yield UpstreamError("Error: Llama API key not configured")
+            return
+        if not settings.LLM_API_URL:
+            yield UpstreamError("Error: Llama API URL not configured")
+            return
+        
+        data = self._llama_payload(prompt, system_prompt, model_name, temperature, max_tokens)
+        data["stream"] = True
+        
+        logger.info("Streaming from Llama API via Groq: %s", model_name)
+        
+        try:
+            session = self._http_session()
+            async with session.post(settings.LLM_API_URL, headers=self._llama_headers(), json=data) as response:
+                if response.status != 200:
+                    error_text = await response.text()
+                    error_msg = f"Llama API error {response.status}: {error_text}"
+                    logger.error(error_msg)
+                    yield UpstreamError(error_msg)
+                    return
+                
+                # Each event is a line of the form "data: {...}", ending with "data: [DONE]"
+                async for raw_line in response.content:
+                    line = raw_line.decode("utf-8").strip()
+                    if not line.startswith("data:"):
+                        continue
+                    event = line[5:].strip()
+                    if event == "[DONE]":
+                        break
+                    choices = json.loads(event).get("choices") or []
+                    delta = choices[0].get("delta", {}).get("content") if choices else None
+                    if delta:
+                        yield delta
         
         except Exception as e:
             error_msg = f"Llama API error: {str(e)}"
             logger.error(error_msg)
-            return error_msg
+            yield UpstreamError(error_msg)
     
     async def get_available_models(self) -> list:
         """Get list of available models"""
@@ -421,5 +952,5 @@ ONLY answer if the question is directly about the page content below.""")
         return models
 
 
-# Singleton instance
+# Singleton instance (cheap to create; providers initialize on first use)
 llm_client = LLMClient()
@@ -0,0 +1,199 @@
+"""
+VynceAI Backend - Local Answers
+Fast-path responder for greetings, identity questions and arithmetic
+
+Short conversational prompts ("hi", "who are you") and plain arithmetic
+("calculate 12 * (3 + 4)") are answered from templates and a safe
+expression evaluator instead of a Llama round trip. Every rule carries a
+confidence; matches below LOCAL_ANSWER_MIN_CONFIDENCE defer to the LLM.
+Only whole-prompt matches count, so anything longer or more specific
+("hi, summarize this page") still goes upstream.
+"""
+
+import ast
+import math
+import operator
+import re
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from app.core.config import settings
+
+# Longer prompts are never answered locally (and skip the regex work)
+MAX_LOCAL_PROMPT_CHARS = 200
+
+# Bounds keeping the evaluator cheap (no 9**9**9)
+MAX_EXPONENT = 1000
+MAX_RESULT_DIGITS = 50
+
+
+class LocalAnswer(NamedTuple):
+    """Answer produced without an LLM call"""
+    text: str
+    kind: str
+    confidence: float
+
+
+GREETING_RESPONSE = (
+    "Hello! I'm VynceAI, your browsing assistant. Ask me about the page you're on, "
+    "or anything else you'd like to know."
+)
+WELLBEING_RESPONSE = "I'm doing well, thanks for asking! How can I help you today?"
+THANKS_RESPONSE = "You're welcome! Let me know if there's anything else I can help with."
+IDENTITY_RESPONSE = (
+    "I'm VynceAI, an AI assistant built into your Chrome browser. I can summarize and analyze "
+    "the page you're on, answer questions about it, chat about general topics, and run browser "
+    "automations like searching YouTube, filling forms and extracting contacts."
+)
+HELP_RESPONSE = (
+    "Of course! You can ask me about the current page (\"summarize this page\"), ask general "
+    "questions, or give browser commands like \"search youtube for lofi\" or \"scroll down\"."
+)
+
+_NAME = r"(?:\s+(?:vynce(?:\s*ai)?|there|friend|buddy))?"
+
+# (kind, pattern, response, confidence); patterns must match the whole prompt
+_TEMPLATE_RULES: List[Tuple[str, str, str, float]] = [
+    ("greeting", rf"(?:hi+|hello|hey+|hiya|howdy|yo|greetings|good\s+(?:morning|afternoon|evening|day)){_NAME}",
+     GREETING_RESPONSE, 0.99),
+    ("greeting", rf"(?:(?:hi|hello|hey){_NAME}\s*,?\s*)?how\s+(?:are\s+you|are\s+things|is\s+it\s+going)(?:\s+doing)?(?:\s+today)?",
+     WELLBEING_RESPONSE, 0.95),
+    ("greeting", rf"(?:thanks|thank\s+you|thx|ty)(?:\s+(?:so|very)\s+much)?(?:\s+a\s+lot)?{_NAME}",
+     THANKS_RESPONSE, 0.97),
+    ("identity", r"(?:who|what)\s+are\s+you|what(?:'s|\s+is)\s+your\s+name|introduce\s+yourself"
+                 r"|who\s+(?:made|built|created|developed)\s+you|what\s+(?:can|do)\s+you\s+do|what\s+is\s+vynce\s*ai",
+     IDENTITY_RESPONSE, 0.95),
+    # Too vague to be sure the user is not about to ask something specific
+    ("help", r"help(?:\s+me)?|(?:can|could)\s+you\s+help(?:\s+me)?|i\s+need\s+help",
+     HELP_RESPONSE, 0.75),
+]
+
+_COMPILED_RULES = [(kind, re.compile(pattern, re.I), response, confidence)
+                   for kind, pattern, response, confidence in _TEMPLATE_RULES]
+
+_ARITHMETIC = re.compile(
+    r"(?:(?:please\s+)?(?:calculate|compute|evaluate|solve|what(?:'s|\s+is)|whats|how\s+much\s+is)\s+)?"
+    r"(?P<expr>[\d\s.,+\-*/×÷x^%()a-z]+?)(?:\s*=\s*\??)?",
+    re.I,
+)
+_PERCENT_OF = re.compile(r"(?P<pct>\d+(?:\.\d+)?)\s*%\s+of\s+(?P<base>\d+(?:\.\d+)?)", re.I)
+_THOUSANDS = re.compile(r"(?<=\d),(?=\d{3}(?!\d))")
+
+_BINARY_OPS: Dict[type, Callable] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY_OPS: Dict[type, Callable] = {ast.UAdd: operator.pos, ast.USub: operator.neg}
+_FUNCTIONS: Dict[str, Callable] = {"sqrt": math.sqrt, "abs": abs, "round": round}
+
+
+def safe_eval(expression: str) -> float:
+    """
+    Evaluate an arithmetic expression without eval()
+
+    Only numbers, + - * / // % ** (also ^, x, ×, ÷), parentheses and
+    sqrt/abs/round are allowed.
+
+    Args:
+        expression: Arithmetic expression
+
+    Returns:
+        The numeric result
+
+    Raises:
+        ValueError: If the expression is not plain arithmetic or is out of bounds
+        ZeroDivisionError: On division by zero
+    """
+    normalized = _THOUSANDS.sub("", expression.strip())
+    normalized = normalized.replace("^", "**").replace("×", "*").replace("÷", "/")
+    normalized = re.sub(r"(?<=[\d)\s])x(?=[\s\d(])", "*", normalized)
+    try:
+        tree = ast.parse(normalized, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"Not an arithmetic expression: {expression}") from e
+    return _eval_node(tree.body)
+
+
+def _eval_node(node: ast.AST) -> float:
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return node.value
+    if isinstance(node, ast.BinOp) and type(node.op) in _BINARY_OPS:
+        left, right = _eval_node(node.left), _eval_node(node.right)
+        if isinstance(node.op, ast.Pow) and (abs(right) > MAX_EXPONENT or abs(left) > 10 ** MAX_RESULT_DIGITS):
+            raise ValueError("Exponent out of range")
+        result = _BINARY_OPS[type(node.op)](left, right)
+        if isinstance(result, complex) or abs(result) > 10 ** MAX_RESULT_DIGITS:
+            raise ValueError("Result out of range")
+        return result
+    if isinstance(node, ast.UnaryOp) and type(node.op) in _UNARY_OPS:
+        return _UNARY_OPS[type(node.op)](_eval_node(node.operand))
+    if (isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in _FUNCTIONS
+            and len(node.args) == 1 and not node.keywords):
+        return _FUNCTIONS[node.func.id](_eval_node(node.args[0]))
+    raise ValueError(f"Unsupported expression element: {type(node).__name__}")
+
+
+def _format_number(value: float) -> str:
+    if isinstance(value, float) and value.is_integer() and abs(value) < 1e15:
+        value = int(value)
+    if isinstance(value, int):
+        return f"{value:,}" if abs(value) >= 10_000 else str(value)
+    return f"{value:.10g}"
+
+
+def _answer_arithmetic(text: str) -> Optional[LocalAnswer]:
+    """Arithmetic answer, or None if the prompt is not plain arithmetic"""
+    match = _ARITHMETIC.fullmatch(text)
+    if not match:
+        return None
+    expression = match["expr"].strip()
+
+    percent = _PERCENT_OF.fullmatch(expression)
+    if percent:
+        value = float(percent["pct"]) * float(percent["base"]) / 100
+        return LocalAnswer(f"{expression} = {_format_number(value)}", "arithmetic", 1.0)
+    # A bare number ("what is 42") is not a calculation
+    if not re.search(r"\d", expression) or not re.search(r"[+\-*/×÷^%(]|\d\s*x\s*\d", expression):
+        return None
+    try:
+        value = safe_eval(expression)
+    except ZeroDivisionError:
+        return LocalAnswer(f"{expression} is undefined (division by zero).", "arithmetic", 0.95)
+    except (ValueError, TypeError, OverflowError):
+        return None
+    return LocalAnswer(f"{expression} = {_format_number(value)}", "arithmetic", 1.0)
+
+
+def answer_locally(prompt: str, min_confidence: Optional[float] = None) -> Optional[LocalAnswer]:
+    """
+    Answer a prompt without an LLM call when a local rule is confident enough
+
+    Args:
+        prompt: User prompt
+        min_confidence: Threshold (defaults to LOCAL_ANSWER_MIN_CONFIDENCE)
+
+    Returns:
+        LocalAnswer, or None to defer to the LLM
+    """
+    if len(prompt) > MAX_LOCAL_PROMPT_CHARS:
+        return None
+    threshold = settings.LOCAL_ANSWER_MIN_CONFIDENCE if min_confidence is None else min_confidence
+    text = re.sub(r"\s+", " ", prompt).strip().rstrip("?!. ").strip()
+    if not text:
+        return None
+
+    answer = None
+    for kind, pattern, response, confidence in _COMPILED_RULES:
+        if pattern.fullmatch(text):
+            answer = LocalAnswer(response, kind, confidence)
+            break
+    else:
+        answer = _answer_arithmetic(text)
+
+    if answer is None or answer.confidence < threshold:
+        return None
+    return answer
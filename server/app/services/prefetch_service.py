@@ -0,0 +1,189 @@
+"""
+VynceAI Backend - Prefetch Service
+Low-priority background warming of page summaries and indexes
+
+The extension reports each page load to /api/v1/ai/prefetch. Pages are
+queued (bounded, newest dropped when full, duplicates skipped by session
+and content hash) and processed by a small worker pool that only starts a
+job while no interactive AI request (HTTP or WebSocket) is in flight. A job normalizes the page, indexes it
+into the session's cross-tab retrieval store when a session ID is given,
+and optionally runs the exact /summarize prompt through the response
+cache, so a later summarize of the same content returns instantly.
+"""
+
+import asyncio
+import contextvars
+import hashlib
+from typing import Any, Dict, List, NamedTuple, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.core.metrics import PREFETCH_JOBS, REQUESTS_IN_FLIGHT, WS_REQUESTS_IN_FLIGHT
+from app.core.scheduler import priority
+from app.services.ai_service import build_summary_prompt, cached_ai_query, normalize_page_content, response_cache, response_cache_key
+from app.services.retrieval_service import retrieval_store
+
+logger = get_logger(__name__)
+
+# In-flight gauge labels (path prefixes) of user-facing AI routes, the only
+# HTTP requests that hold prefetch back; prefetch submissions, job polls,
+# utils and debug endpoints do no interactive AI work
+_INTERACTIVE_ROUTES = frozenset((
+    "/api/v1/ai/chat", "/api/v1/ai/tabs", "/api/v1/ai/query", "/api/v1/ai/summarize", "/api/v1/ai/analyze",
+    "/api/v1/command/run", "/api/v1/command/parse", "/api/v1/command/plan"
+))
+
+
+class PrefetchJob(NamedTuple):
+    """One page to warm"""
+    content_hash: str
+    content: str
+    url: Optional[str]
+    title: Optional[str]
+    model: str
+    session_id: Optional[str]
+    summarize: bool
+
+
+def content_hash(content: str) -> str:
+    """Hash of a page's normalized content"""
+    return hashlib.sha256(normalize_page_content(content).encode("utf-8")).hexdigest()
+
+
+def interactive_in_flight() -> int:
+    """User-facing AI requests currently being served, over HTTP or the WebSocket channel"""
+    http = sum(value for (route,), value in REQUESTS_IN_FLIGHT.values.items() if route in _INTERACTIVE_ROUTES)
+    return int(http + WS_REQUESTS_IN_FLIGHT.get())
+
+
+class PrefetchQueue:
+    """Bounded queue of prefetch jobs with a lazily started worker pool"""
+
+    def __init__(self, maxsize: int, workers: int, idle_poll: float):
+        self.maxsize = maxsize
+        self.workers = workers
+        self.idle_poll = idle_poll
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        # (session ID, content hash): the same page still gets indexed for each session
+        self._pending: Set[Tuple[Optional[str], str]] = set()
+
+    @property
+    def size(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    def submit(self, job: PrefetchJob) -> str:
+        """
+        Queue a job without waiting
+
+        Returns:
+            "queued", "duplicate" (same content already pending for the
+            session), "cached"
+            (summary already cached), "skipped" (nothing requested) or
+            "full" (dropped)
+        """
+        if (job.session_id, job.content_hash) in self._pending:
+            result = "duplicate"
+        elif not job.session_id and not job.summarize:
+            result = "skipped"
+        elif not job.session_id and self._summary_cached(job):
+            result = "cached"
+        else:
+            self._ensure_workers()
+            try:
+                self._queue.put_nowait(job)
+                self._pending.add((job.session_id, job.content_hash))
+                result = "queued"
+            except asyncio.QueueFull:
+                result = "full"
+        PREFETCH_JOBS.inc(result)
+        return result
+
+    async def stop(self) -> None:
+        """Cancel the workers and drop queued jobs"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        self._pending.clear()
+
+    def _summary_cached(self, job: PrefetchJob) -> bool:
+        prompt = build_summary_prompt(job.content, job.url, job.title)
+        return response_cache.get(response_cache_key(prompt, job.model)) is not None
+
+    def _ensure_workers(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._tasks and self._tasks[0].get_loop() is loop and not all(t.done() for t in self._tasks):
+            return
+        # First use, or a new event loop (tests, reloads): start fresh
+        self._queue = asyncio.Queue(maxsize=self.maxsize)
+        self._pending.clear()
+        # Workers outlive the request that starts them: run them in an empty
+        # context so jobs never inherit its trace (request ID) or priority
+        self._tasks = [loop.create_task(self._worker(), context=contextvars.Context()) for _ in range(self.workers)]
+
+    async def _wait_until_idle(self) -> None:
+        while interactive_in_flight() > 0:
+            await asyncio.sleep(self.idle_poll)
+
+    async def _worker(self) -> None:
+        queue = self._queue
+        while True:
+            job = await queue.get()
+            try:
+                await self._wait_until_idle()
+                # Lowest upstream priority, one shared client for all pages
+                with priority("prefetch", "prefetch"):
+                    await self._run(job)
+                PREFETCH_JOBS.inc("done")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                PREFETCH_JOBS.inc("failed")
+                logger.warning("Prefetch of %s failed: %s", job.url, e)
+            finally:
+                self._pending.discard((job.session_id, job.content_hash))
+                queue.task_done()
+
+    async def _run(self, job: PrefetchJob) -> None:
+        if job.session_id:
+            passages = retrieval_store.get_or_create(job.session_id).add(job.url or job.content_hash, job.title, job.content)
+            logger.debug("Prefetch indexed %s passages for %s", passages, job.url)
+        if job.summarize:
+            await self._wait_until_idle()
+            _, cached = await cached_ai_query(build_summary_prompt(job.content, job.url, job.title), job.model)
+            logger.info("Prefetched summary for %s (already cached: %s)", job.url, cached)
+
+
+# Singleton instance
+prefetch_queue = PrefetchQueue(
+    settings.PREFETCH_QUEUE_SIZE,
+    settings.PREFETCH_WORKERS,
+    settings.PREFETCH_IDLE_POLL_SECONDS
+)
+
+
+def submit_prefetch(
+    content: str,
+    url: Optional[str] = None,
+    title: Optional[str] = None,
+    model: str = "gemini-2.5-flash",
+    session_id: Optional[str] = None,
+    summarize: Optional[bool] = None
+) -> Dict[str, Any]:
+    """
+    Queue a page for background warming
+
+    Returns:
+        {"status": queued | duplicate | cached | skipped | full | disabled, "content_hash", "queued"}
+    """
+    digest = content_hash(content)
+    if not settings.PREFETCH_ENABLED:
+        return {"status": "disabled", "content_hash": digest, "queued": 0}
+    job = PrefetchJob(
+        digest, content, url, title, model, session_id,
+        settings.PREFETCH_SUMMARIZE if summarize is None else summarize
+    )
+    status = prefetch_queue.submit(job)
+    return {"status": status, "content_hash": digest, "queued": prefetch_queue.size}
@@ -0,0 +1,237 @@
+"""
+VynceAI Backend - Retrieval Service
+Per-session multi-page index for questions spanning several open tabs
+
+Pages are split into passages and embedded with a hashing vectorizer into
+NumPy matrices. A question is scored against every passage of every tab in
+one matrix-vector product, so comparing N tabs costs a single LLM call.
+"""
+
+import re
+import zlib
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n{2,}")
+
+_STOPWORDS = frozenset("""
+a an and are as at be but by for from has have in is it its of on or that the
+this to was were will with what which who how why when where do does can you your
+""".split())
+
+
+@lru_cache(maxsize=65536)
+def _bucket(token: str, n_features: int) -> int:
+    """Stable hash bucket for a token (crc32 is not salted per process)"""
+    return zlib.crc32(token.encode("utf-8")) % n_features
+
+
+class HashingVectorizer:
+    """Stateless bag-of-words embedder with log-scaled, L2-normalized rows"""
+
+    def __init__(self, n_features: int):
+        self.n_features = n_features
+
+    def tokens(self, text: str) -> List[str]:
+        """Lowercase alphanumeric tokens without stopwords"""
+        return [t for t in _TOKEN_RE.findall(text.lower()) if t not in _STOPWORDS and len(t) > 1]
+
+    def embed(self, texts: List[str]) -> np.ndarray:
+        """
+        Embed texts into a (len(texts), n_features) float32 matrix
+
+        Args:
+            texts: Texts to embed
+
+        Returns:
+            Matrix with unit-length rows (all-zero rows for empty texts)
+        """
+        rows: List[int] = []
+        cols: List[int] = []
+        for row, text in enumerate(texts):
+            buckets = [_bucket(t, self.n_features) for t in self.tokens(text)]
+            rows.extend([row] * len(buckets))
+            cols.extend(buckets)
+
+        matrix = np.zeros((len(texts), self.n_features), dtype=np.float32)
+        if cols:
+            np.add.at(matrix, (np.asarray(rows), np.asarray(cols)), 1.0)
+            np.log1p(matrix, out=matrix)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+
+def split_passages(content: str, target_chars: int, max_passages: int) -> List[str]:
+    """
+    Split page content into passages of roughly target_chars
+
+    Sentences are packed greedily; overlong sentences are hard-split.
+    """
+    passages: List[str] = []
+    current = ""
+    for sentence in _SENTENCE_RE.split(content):
+        sentence = " ".join(sentence.split())
+        while len(sentence) > target_chars:
+            passages.append(sentence[:target_chars])
+            sentence = sentence[target_chars:]
+        if current and len(current) + len(sentence) + 1 > target_chars:
+            passages.append(current)
+            current = ""
+        current = f"{current} {sentence}".strip()
+        if len(passages) >= max_passages:
+            return passages[:max_passages]
+    if current:
+        passages.append(current)
+    return passages[:max_passages]
+
+
+class IndexedPage:
+    """Passages and their embedding matrix for one page"""
+
+    __slots__ = ("url", "title", "passages", "matrix")
+
+    def __init__(self, url: str, title: Optional[str], passages: List[str], matrix: np.ndarray):
+        self.url = url
+        self.title = title
+        self.passages = passages
+        self.matrix = matrix
+
+
+class PageIndex:
+    """LRU index of pages for a single session"""
+
+    def __init__(self, vectorizer: HashingVectorizer, max_docs: int):
+        self._vectorizer = vectorizer
+        self._max_docs = max_docs
+        self._pages: "OrderedDict[str, IndexedPage]" = OrderedDict()
+        # Concatenated view over all pages, rebuilt lazily after changes
+        self._matrix: Optional[np.ndarray] = None
+        self._owners: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._pages)
+
+    def add(self, url: str, title: Optional[str], content: str) -> int:
+        """
+        Index (or re-index) a page
+
+        Returns:
+            Number of passages indexed
+        """
+        passages = split_passages(
+            content,
+            settings.RETRIEVAL_PASSAGE_CHARS,
+            settings.RETRIEVAL_MAX_PASSAGES_PER_DOC
+        )
+        if title:
+            # Title is strong evidence for which tab a question refers to
+            passages = [f"{title}. {p}" for p in passages] or [title]
+        if not passages:
+            return 0
+
+        self._pages.pop(url, None)
+        self._pages[url] = IndexedPage(url, title, passages, self._vectorizer.embed(passages))
+        while len(self._pages) > self._max_docs:
+            evicted, _ = self._pages.popitem(last=False)
+            logger.debug("Page evicted from index: %s", evicted)
+
+        self._matrix = None
+        return len(passages)
+
+    def pages(self) -> List[Dict[str, Any]]:
+        """Indexed pages, least recently added first"""
+        return [
+            {"url": p.url, "title": p.title, "passages": len(p.passages)}
+            for p in self._pages.values()
+        ]
+
+    def search(self, query: str, top_k: int) -> List[Dict[str, Any]]:
+        """
+        Retrieve the top passages across all pages in one vectorized pass
+
+        The best passage of every page is always included so comparison
+        questions see each tab, then the remaining slots go to the highest
+        scoring passages overall.
+
+        Args:
+            query: User question
+            top_k: Number of passages to return (at least one per page)
+
+        Returns:
+            Passages ordered by page, then by position within the page
+        """
+        if not self._pages:
+            return []
+
+        pages = list(self._pages.values())
+        if self._matrix is None:
+            self._matrix = np.vstack([p.matrix for p in pages])
+            self._owners = np.repeat(np.arange(len(pages)), [len(p.passages) for p in pages])
+
+        scores = self._matrix @ self._vectorizer.embed([query])[0]
+        offsets = np.concatenate(([0], np.cumsum([len(p.passages) for p in pages])))
+
+        # Sort by (page, -score): the first entry of each page segment is its best passage
+        by_page = np.lexsort((-scores, self._owners))
+        chosen = set(by_page[offsets[:-1]].tolist())
+
+        for idx in np.argsort(-scores, kind="stable"):
+            if len(chosen) >= top_k:
+                break
+            chosen.add(int(idx))
+
+        results = []
+        for idx in sorted(chosen):
+            owner = int(self._owners[idx])
+            page = pages[owner]
+            results.append({
+                "tab": owner + 1,
+                "url": page.url,
+                "title": page.title,
+                "text": page.passages[idx - offsets[owner]],
+                "score": round(float(scores[idx]), 4)
+            })
+        return results
+
+
+class RetrievalStore:
+    """Per-session page indexes with an LRU over sessions"""
+
+    def __init__(self):
+        self._vectorizer = HashingVectorizer(settings.RETRIEVAL_FEATURES)
+        self._indexes: "OrderedDict[str, PageIndex]" = OrderedDict()
+
+    def get(self, session_id: str) -> Optional[PageIndex]:
+        """Get a session's page index without creating it"""
+        index = self._indexes.get(session_id)
+        if index is not None:
+            self._indexes.move_to_end(session_id)
+        return index
+
+    def get_or_create(self, session_id: str) -> PageIndex:
+        """Get a session's page index, creating it if needed"""
+        index = self.get(session_id)
+        if index is None:
+            index = PageIndex(self._vectorizer, settings.RETRIEVAL_MAX_DOCS)
+            self._indexes[session_id] = index
+            while len(self._indexes) > settings.RETRIEVAL_MAX_SESSIONS:
+                self._indexes.popitem(last=False)
+        return index
+
+    def clear(self, session_id: str) -> bool:
+        """Drop a session's index. Returns True if it existed."""
+        return self._indexes.pop(session_id, None) is not None
+
+
+# Singleton instance
+retrieval_store = RetrievalStore()
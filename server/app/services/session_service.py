@@ -0,0 +1,256 @@
+"""
+VynceAI Backend - Session Service
+Server-side conversation sessions with rolling summarization
+
+The extension only sends the newest turn together with a session ID. Recent
+turns are kept verbatim, older turns are folded into a rolling summary by a
+background task so summarization never sits on the request path.
+"""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class Turn:
+    """Compact record of a single user/assistant exchange"""
+
+    __slots__ = ("user", "bot", "ts")
+
+    def __init__(self, user: str, bot: str, ts: float):
+        self.user = user
+        self.bot = bot
+        self.ts = ts
+
+    def to_memory(self) -> Dict[str, Optional[str]]:
+        """Convert to the memory dict format used by the AI service"""
+        return {
+            "user": self.user,
+            "bot": self.bot,
+            "timestamp": datetime.fromtimestamp(self.ts).isoformat(timespec="seconds")
+        }
+
+
+class Session:
+    """Conversation state for one session ID"""
+
+    __slots__ = ("session_id", "summary", "turns", "pending", "summarizing", "last_access", "folding")
+
+    def __init__(self, session_id: str):
+        self.session_id = session_id
+        self.summary = ""
+        self.turns: deque = deque()
+        self.pending: List[Turn] = []
+        self.summarizing: List[Turn] = []  # Batch being folded, until its summary is stored
+        self.last_access = time.monotonic()
+        self.folding = False
+
+    def has_history(self) -> bool:
+        """Whether the session holds any turns or summary"""
+        return bool(self.summary or self.turns or self.pending or self.summarizing)
+
+    def recent_memory(self) -> List[Dict[str, Optional[str]]]:
+        """Turns not yet folded into the summary (including the batch being folded), oldest first"""
+        return [turn.to_memory() for turn in (*self.summarizing, *self.pending, *self.turns)]
+
+
+Summarizer = Callable[[str, List[Turn]], Awaitable[str]]
+
+
+def local_fold(summary: str, turns: List[Turn]) -> str:
+    """
+    Fold turns into the summary without an LLM call
+
+    Used when the upstream summarizer fails so older context is never lost.
+    """
+    lines = [summary] if summary else []
+    for turn in turns:
+        lines.append(f"User asked: {turn.user[:160]} | Assistant answered: {turn.bot[:160]}")
+    return "\n".join(lines)
+
+
+async def llm_summarize(summary: str, turns: List[Turn]) -> str:
+    """
+    Update the rolling summary with older turns using the LLM client
+
+    Args:
+        summary: Current rolling summary (may be empty)
+        turns: Turns to fold into the summary
+
+    Returns:
+        Updated summary text
+    """
+    from app.services.llm_client import is_error_response, llm_client
+
+    transcript = "\n".join(f"User: {t.user}\nAssistant: {t.bot}" for t in turns)
+    prompt = f"""Update the running summary of a conversation between a user and VynceAI.
+
+Current summary:
+{summary or '(empty)'}
+
+New exchanges:
+{transcript}
+
+Write the updated summary in at most {settings.SESSION_SUMMARY_MAX_CHARS // 6} words.
+Keep names, facts, decisions and open questions. Do not use emojis."""
+
+    result = await llm_client.generate(prompt=prompt)
+    if is_error_response(result):
+        raise RuntimeError(result)
+    return result
+
+
+class SessionStore:
+    """
+    In-memory session store keyed by session ID
+
+    - LRU bounded by SESSION_MAX_SESSIONS
+    - Sessions idle longer than SESSION_IDLE_TTL_SECONDS are evicted
+    - Only SESSION_RECENT_TURNS turns are kept verbatim, the rest is summarized
+    """
+
+    def __init__(self, summarizer: Optional[Summarizer] = None):
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._summarizer = summarizer or llm_summarize
+        self._tasks: set = set()
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get(self, session_id: str) -> Optional[Session]:
+        """Get a live session without creating it"""
+        self._evict_idle()
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.last_access = time.monotonic()
+            self._sessions.move_to_end(session_id)
+        return session
+
+    def get_or_create(self, session_id: str) -> Session:
+        """Get a session, creating it if needed"""
+        session = self.get(session_id)
+        if session is None:
+            session = Session(session_id)
+            self._sessions[session_id] = session
+            while len(self._sessions) > settings.SESSION_MAX_SESSIONS:
+                evicted_id, _ = self._sessions.popitem(last=False)
+                logger.debug("Session evicted (capacity): %s", evicted_id)
+        return session
+
+    def get_history(self, session_id: str) -> Tuple[str, List[Dict[str, Optional[str]]]]:
+        """
+        Get prompt history for a session
+
+        Returns:
+            Tuple of (rolling summary, recent memory dicts)
+        """
+        session = self.get_or_create(session_id)
+        return session.summary, session.recent_memory()
+
+    def history_for_request(
+        self,
+        session_id: str,
+        memory: Optional[List[Dict[str, Optional[str]]]] = None
+    ) -> Tuple[str, List[Dict[str, Optional[str]]]]:
+        """
+        Get prompt history for a request, seeding from client memory if given
+
+        Returns:
+            Tuple of (rolling summary, recent memory dicts)
+        """
+        if memory:
+            self.seed(session_id, memory)
+        return self.get_history(session_id)
+
+    def seed(self, session_id: str, memory: List[Dict[str, Optional[str]]]) -> None:
+        """Seed a fresh session from client-side memory (legacy clients)"""
+        session = self.get_or_create(session_id)
+        if session.has_history():
+            return
+        for item in memory:
+            self.record_turn(session_id, item.get("user", ""), item.get("bot", ""))
+
+    def record_turn(self, session_id: str, user: str, bot: str) -> None:
+        """
+        Append a completed turn and schedule folding of older turns
+
+        Args:
+            session_id: Session ID
+            user: User message
+            bot: Assistant response
+        """
+        session = self.get_or_create(session_id)
+        limit = settings.SESSION_MAX_TURN_CHARS
+        session.turns.append(Turn(user[:limit], bot[:limit], time.time()))
+
+        while len(session.turns) > settings.SESSION_RECENT_TURNS:
+            session.pending.append(session.turns.popleft())
+
+        if len(session.pending) >= settings.SESSION_SUMMARY_BATCH and not session.folding:
+            self._schedule_fold(session)
+
+    def clear(self, session_id: str) -> bool:
+        """Drop a session. Returns True if it existed."""
+        return self._sessions.pop(session_id, None) is not None
+
+    def stats(self) -> Dict[str, int]:
+        """Store statistics for status endpoints"""
+        return {
+            "sessions": len(self._sessions),
+            "folding": len(self._tasks)
+        }
+
+    def _evict_idle(self) -> None:
+        """Evict idle sessions (oldest first, stops at the first live one)"""
+        cutoff = time.monotonic() - settings.SESSION_IDLE_TTL_SECONDS
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.last_access >= cutoff:
+                break
+            self._sessions.popitem(last=False)
+            logger.debug("Session evicted (idle): %s", session_id)
+
+    def _schedule_fold(self, session: Session) -> None:
+        """Start a background fold task for the session"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            # No loop (sync caller) - fold locally so pending turns stay bounded
+            session.summary = local_fold(session.summary, session.pending)[-settings.SESSION_SUMMARY_MAX_CHARS:]
+            session.pending = []
+            return
+
+        session.folding = True
+        task = loop.create_task(self._fold(session))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _fold(self, session: Session) -> None:
+        """Fold pending turns into the rolling summary until none are left"""
+        try:
+            while session.pending:
+                # The batch stays in recent_memory() until its summary is stored
+                session.summarizing, session.pending = session.pending, []
+                try:
+                    summary = await self._summarizer(session.summary, session.summarizing)
+                except Exception as e:
+                    logger.warning("Session summarization failed, folding locally: %s", e)
+                    summary = local_fold(session.summary, session.summarizing)
+                session.summary = summary.strip()[-settings.SESSION_SUMMARY_MAX_CHARS:]
+                session.summarizing = []
+        finally:
+            # Cancelled mid-fold: the batch goes back to pending, not lost
+            session.pending = session.summarizing + session.pending
+            session.summarizing = []
+            session.folding = False
+
+
+# Singleton instance
+session_store = SessionStore()
@@ -0,0 +1,69 @@
+"""
+VynceAI Backend - Warmup Service
+Opt-in startup warmup and the readiness state derived from it
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.logger import get_logger
+from app.services.llm_client import llm_client
+
+logger = get_logger(__name__)
+
+
+class WarmupState:
+    """Progress of the startup warmup"""
+
+    def __init__(self):
+        self.status = "pending"  # pending -> running -> done | timeout | failed
+        self.steps: Dict[str, str] = {}
+        self.duration_ms: Optional[float] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("done", "timeout", "failed")
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"status": self.status, "steps": self.steps, "duration_ms": self.duration_ms}
+
+
+warmup_state = WarmupState()
+
+
+async def run_warmup() -> None:
+    """
+    Warm upstream connections and model handles (see LLMClient.warmup)
+
+    Bounded by WARMUP_TIMEOUT_SECONDS. A failed or timed-out warmup still
+    finishes: the worker then serves cold rather than never becoming ready.
+    """
+    warmup_state.status = "running"
+    start = time.perf_counter()
+    logger.info("🔥 Warming up upstream connections (probe: %s)", settings.WARMUP_PROBE)
+
+    try:
+        warmup_state.steps = await asyncio.wait_for(
+            llm_client.warmup(probe=settings.WARMUP_PROBE),
+            timeout=settings.WARMUP_TIMEOUT_SECONDS
+        )
+        warmup_state.status = "done"
+    except asyncio.TimeoutError:
+        warmup_state.status = "timeout"
+        logger.warning("Warmup timed out after %ss", settings.WARMUP_TIMEOUT_SECONDS)
+    except Exception as e:
+        warmup_state.status = "failed"
+        logger.error("Warmup failed: %s", e)
+    finally:
+        warmup_state.duration_ms = round((time.perf_counter() - start) * 1000, 1)
+
+    logger.info("Warmup %s in %s ms: %s", warmup_state.status, warmup_state.duration_ms, warmup_state.steps)
+
+
+def is_ready() -> bool:
+    """Whether this worker should receive traffic"""
+    if settings.WARMUP_ENABLED:
+        return warmup_state.finished
+    return llm_client.initialized
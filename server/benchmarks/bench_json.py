@@ -0,0 +1,83 @@
+"""
+Benchmark: default vs orjson (FAST_JSON) serialization on /api/v1/ai/chat
+
+Runs the FastAPI app in-process over ASGI with the LLM call replaced by a
+constant response, so only decoding, validation, routing and encoding are
+measured. Reports requests/second and CPU time per request for 2 KB and
+500 KB page bodies.
+
+Usage:
+    python benchmarks/bench_json.py [--requests 200]
+"""
+
+import argparse
+import asyncio
+import sys
+import os
+import time
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+
+from app.core.config import settings
+from app.services.llm_client import llm_client
+from main import app
+
+
+async def _fake_generate(prompt, model=None, context=None, temperature=None, max_tokens=None):
+    return "This is a constant benchmark response. " * 20
+
+
+def _payload(page_bytes: int) -> dict:
+    return {
+        "prompt": "What is this page about?",
+        "model": "gemini-2.5-flash",
+        "context": {
+            "url": "https://example.com/article",
+            "title": "Benchmark Page",
+            "pageContent": ("Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * (page_bytes // 57 + 1))[:page_bytes]
+        },
+        "memory": [{"user": "hi", "bot": "hello", "timestamp": "2025-11-10T12:00:00"}] * 3
+    }
+
+
+async def _run(fast: bool, page_bytes: int, requests: int) -> tuple:
+    settings.FAST_JSON = fast
+    payload = _payload(page_bytes)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warmup
+        for _ in range(5):
+            await client.post("/api/v1/ai/chat", json=payload)
+
+        wall_start = time.perf_counter()
+        cpu_start = time.process_time()
+        for _ in range(requests):
+            response = await client.post("/api/v1/ai/chat", json=payload)
+            assert response.status_code == 200, response.text
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+
+    return requests / wall, cpu / requests * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=200)
+    args = parser.parse_args()
+
+    llm_client.generate = _fake_generate
+
+    print(f"{'body':>8} {'mode':>8} {'req/s':>10} {'cpu ms/req':>12}")
+    print("-" * 42)
+    for page_bytes in (2 * 1024, 500 * 1024):
+        for fast in (False, True):
+            rps, cpu_ms = asyncio.run(_run(fast, page_bytes, args.requests))
+            label = f"{page_bytes // 1024}KB"
+            print(f"{label:>8} {'orjson' if fast else 'default':>8} {rps:>10.1f} {cpu_ms:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
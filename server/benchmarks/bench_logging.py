@@ -0,0 +1,115 @@
+"""
+Benchmark: event-loop overhead of synchronous vs queued logging
+
+Simulates request handlers that log several INFO lines each while a ticker
+task measures event-loop lag. The output stream sleeps briefly on every
+write to mimic a slow stdout pipe (container log driver, terminal).
+
+Reports, for each backend:
+- total wall time for all handlers
+- mean / max event-loop lag seen by the ticker
+- cost of a disabled DEBUG call with f-string vs %-style arguments
+
+Usage:
+    python benchmarks/bench_logging.py [--handlers 500] [--lines 8] [--write-us 50]
+"""
+
+import argparse
+import asyncio
+import logging
+import sys
+import os
+import queue
+import time
+import timeit
+from logging.handlers import QueueListener
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.logger import DeferredQueueHandler
+
+
+class SlowStream:
+    """Stream whose writes block for a fixed time"""
+
+    def __init__(self, write_us: int):
+        self.delay = write_us / 1_000_000
+
+    def write(self, text: str) -> int:
+        time.sleep(self.delay)
+        return len(text)
+
+    def flush(self) -> None:
+        pass
+
+
+def _make_logger(name: str, handler: logging.Handler) -> logging.Logger:
+    logger = logging.getLogger(name)
+    logger.handlers.clear()
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+    logger.addHandler(handler)
+    return logger
+
+
+async def _measure(logger: logging.Logger, handlers: int, lines: int) -> tuple:
+    lags = []
+    stop = asyncio.Event()
+
+    async def ticker():
+        interval = 0.001
+        while not stop.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - start - interval)
+
+    async def handler(i: int):
+        for j in range(lines):
+            logger.info("Request %s step %s - prompt length: %s", i, j, 1234)
+            await asyncio.sleep(0)
+
+    tick = asyncio.create_task(ticker())
+    start = time.perf_counter()
+    await asyncio.gather(*(handler(i) for i in range(handlers)))
+    wall = time.perf_counter() - start
+    stop.set()
+    await tick
+
+    lags = lags or [0.0]
+    return wall, sum(lags) / len(lags), max(lags)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--handlers", type=int, default=500)
+    parser.add_argument("--lines", type=int, default=8)
+    parser.add_argument("--write-us", type=int, default=50)
+    args = parser.parse_args()
+
+    print(f"{args.handlers} handlers x {args.lines} lines, {args.write_us}us per write\n")
+    print(f"{'backend':>8} {'wall ms':>10} {'mean lag ms':>12} {'max lag ms':>11}")
+    print("-" * 44)
+
+    sync_logger = _make_logger("bench.sync", logging.StreamHandler(SlowStream(args.write_us)))
+    wall, mean_lag, max_lag = asyncio.run(_measure(sync_logger, args.handlers, args.lines))
+    print(f"{'sync':>8} {wall * 1000:>10.1f} {mean_lag * 1000:>12.3f} {max_lag * 1000:>11.3f}")
+
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, logging.StreamHandler(SlowStream(args.write_us)))
+    listener.start()
+    queued_logger = _make_logger("bench.queued", DeferredQueueHandler(log_queue))
+    wall, mean_lag, max_lag = asyncio.run(_measure(queued_logger, args.handlers, args.lines))
+    print(f"{'queued':>8} {wall * 1000:>10.1f} {mean_lag * 1000:>12.3f} {max_lag * 1000:>11.3f}")
+    listener.stop()
+
+    # Disabled-level cost: f-strings are built even when DEBUG is off
+    prompt = "What is this page about? " * 40
+    fstring = timeit.timeit(lambda: queued_logger.debug(f"Prompt: {prompt[:100]}... ({len(prompt)} chars)"), number=200_000)
+    deferred = timeit.timeit(lambda: queued_logger.debug("Prompt: %s... (%s chars)", prompt, len(prompt)), number=200_000)
+    print(f"\nDisabled DEBUG call: f-string {fstring / 200_000 * 1e9:.0f} ns, %-style {deferred / 200_000 * 1e9:.0f} ns")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: worker startup cost
+
+Measures, in fresh interpreters:
+- import time of `main` (what every new worker pays before serving)
+- import time of `app.services` (tests, CLI tools)
+- time from process spawn to the first 200 from /api/v1/utils/health
+  under uvicorn (what an autoscaler waits for)
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 5] [--port 8765]
+"""
+
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _import_time(module: str) -> float:
+    code = f"import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=SERVER_DIR, capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def _port_free(port: int) -> bool:
+    with socket.socket() as sock:
+        return sock.connect_ex(("127.0.0.1", port)) != 0
+
+
+def _time_to_healthy(port: int, timeout: float = 30.0) -> float:
+    url = f"http://127.0.0.1:{port}/api/v1/utils/health"
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=SERVER_DIR, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(url, timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - start
+            except OSError:
+                time.sleep(0.01)
+        raise TimeoutError("Server did not become healthy")
+    finally:
+        proc.terminate()
+        proc.wait()
+        while not _port_free(port):
+            time.sleep(0.05)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    results = {
+        "import main": [_import_time("main") for _ in range(args.runs)],
+        "import app.services": [_import_time("app.services") for _ in range(args.runs)],
+        "spawn -> healthy": [_time_to_healthy(args.port) for _ in range(args.runs)],
+    }
+
+    print(f"{args.runs} runs each (median / min, ms)\n")
+    for name, values in results.items():
+        print(f"{name:>22} {statistics.median(values) * 1000:>8.0f} {min(values) * 1000:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
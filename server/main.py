@@ -3,22 +3,70 @@ VynceAI Backend - Main FastAPI Application
 Backend for the VynceAI Chrome Extension - Local AI Web Assistant
 """
 
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.v1 import routes_ai, routes_utils, routes_command
+from app.api.v1 import routes_ai, routes_utils, routes_command, routes_debug
 from app.core.config import settings
+from app.core.limits import BodyLimitMiddleware
+from app.core.loop_monitor import loop_monitor
+from app.core.memory import MemoryBudgetMiddleware
+from app.core.metrics import MetricsMiddleware
+from app.core.scheduler import PriorityMiddleware
+from app.core.tracing import TracingMiddleware
 from app.core.logger import get_logger
+from app.services.job_service import job_store
+from app.services.llm_client import llm_client
+from app.services.prefetch_service import prefetch_queue
+from app.services.warmup_service import run_warmup
 
 # Initialize logger
 logger = get_logger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Application lifespan: startup, optional background monitors, shutdown"""
+    await startup_event()
+    # Import provider SDKs (and warm up if enabled) in the background;
+    # health checks answer meanwhile, /ready reports when it is done
+    if settings.WARMUP_ENABLED:
+        init_task = asyncio.create_task(run_warmup())
+    else:
+        init_task = asyncio.create_task(asyncio.to_thread(llm_client.initialize))
+    if settings.LOOP_MONITOR_ENABLED:
+        loop_monitor.start()
+    try:
+        yield
+    finally:
+        if settings.LOOP_MONITOR_ENABLED:
+            await loop_monitor.stop()
+        await prefetch_queue.stop()
+        await job_store.stop()
+        await asyncio.gather(init_task, return_exceptions=True)
+        await llm_client.close()
+        await shutdown_event()
+
 # Create FastAPI application
 app = FastAPI(
     title="VynceAI Backend",
     description="Backend for the VynceAI Chrome Extension - Local AI Web Assistant",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
+# Tag requests with their upstream priority class and client ID
+app.add_middleware(PriorityMiddleware)
+
+# Reserve each request's estimated memory from the worker budget
+# (innermost, so oversized bodies are rejected with 413 before reserving)
+app.add_middleware(MemoryBudgetMiddleware)
+
+# Reject oversized bodies while they stream in, before parsing/validation
+# (added first so CORS headers are still applied to 413 responses)
+app.add_middleware(BodyLimitMiddleware)
+
 # CORS setup for extension
 app.add_middleware(
     CORSMiddleware,
@@ -34,24 +82,30 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Request metrics (so rejected and failed requests are counted too)
+app.add_middleware(MetricsMiddleware)
+
+# Request IDs and Server-Timing headers (outermost, so total covers everything)
+app.add_middleware(TracingMiddleware)
+
 # Include routers
 app.include_router(routes_ai.router, prefix="/api/v1/ai", tags=["AI"])
 app.include_router(routes_utils.router, prefix="/api/v1/utils", tags=["Utils"])
 app.include_router(routes_command.router, prefix="/api/v1/command", tags=["Command"])
+app.include_router(routes_debug.router, prefix="/api/v1/debug", tags=["Debug"])
 
-@app.on_event("startup")
 async def startup_event():
     """Application startup handler"""
     logger.info("=" * 70)
     logger.info("🚀 VynceAI Backend Starting...")
-    logger.info(f"📦 Version: {settings.APP_VERSION}")
+    logger.info("📦 Version: %s", settings.APP_VERSION)
     logger.info("=" * 70)
     
     # Validate API keys
     api_keys = settings.validate_api_keys()
     logger.info("🔑 API Keys Configuration:")
-    logger.info(f"  Gemini (site-specific): {'✓ Configured' if api_keys['gemini'] else '✗ Not configured'}")
-    logger.info(f"  Groq/Llama (general): {'✓ Configured' if api_keys['groq'] else '✗ Not configured'}")
+    logger.info("  Gemini (site-specific): %s", '✓ Configured' if api_keys['gemini'] else '✗ Not configured')
+    logger.info("  Groq/Llama (general): %s", '✓ Configured' if api_keys['groq'] else '✗ Not configured')
     
     # Check if at least one API key is configured
     if not any(api_keys.values()):
@@ -60,22 +114,21 @@ async def startup_event():
     
     # List available models
     models = settings.get_available_models()
-    logger.info(f"\n🤖 Available AI Models: {len(models)}")
+    logger.info("\n🤖 Available AI Models: %s", len(models))
     for model in models:
-        logger.info(f"  • {model['name']} ({model['id']}) - {model['provider']}")
+        logger.info("  • %s (%s) - %s", model['name'], model['id'], model['provider'])
     
     # Show provider mode
-    logger.info(f"\n🔀 LLM Provider Mode: {settings.LLM_PROVIDER}")
+    logger.info("\n🔀 LLM Provider Mode: %s", settings.LLM_PROVIDER)
     if settings.LLM_PROVIDER == "dual":
         logger.info("   Intelligent routing between Gemini (site) and Llama (general)")
     
     logger.info("\n" + "=" * 70)
     logger.info("✅ Server ready!")
-    logger.info(f"📖 API Documentation: http://127.0.0.1:{settings.PORT}/docs")
-    logger.info(f"🏥 Health Check: http://127.0.0.1:{settings.PORT}/api/v1/utils/health")
+    logger.info("📖 API Documentation: http://127.0.0.1:%s/docs", settings.PORT)
+    logger.info("🏥 Health Check: http://127.0.0.1:%s/api/v1/utils/health", settings.PORT)
     logger.info("=" * 70)
 
-@app.on_event("shutdown")
 async def shutdown_event():
     """Application shutdown handler"""
     logger.info("=" * 70)
@@ -92,6 +145,7 @@ def home():
         "endpoints": {
             "docs": "/docs",
             "health": "/api/v1/utils/health",
+            "ready": "/api/v1/utils/ready",
             "status": "/api/v1/utils/status",
             "ai_chat": "/api/v1/ai/chat",
             "commands": "/api/v1/command/commands"
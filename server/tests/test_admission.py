@@ -0,0 +1,160 @@
+"""
+Test script for admission control
+Tests delay prediction from scheduler state and latency, shedding
+decisions, Retry-After and the guarded endpoints (LLM stubbed)
+"""
+
+import sys
+import os
+import asyncio
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.core.admission import AdmissionController, admission
+from app.core.scheduler import FairScheduler
+from app.services import ai_service
+from app.services.llm_client import llm_client
+from main import app
+
+
+PAGE = """Solar panels convert sunlight into electricity using photovoltaic cells.
+Modern photovoltaic cells convert around twenty percent of sunlight into electricity.
+Installing solar panels on a roof lowers electricity bills for most households."""
+
+
+def _controller(latency: float = 2.0) -> AdmissionController:
+    scheduler = FairScheduler(2, {"interactive": 3.0, "bulk": 1.0}, max_wait=0)
+    return AdmissionController(scheduler, {"bulk": 5.0}, initial_latency=latency, alpha=0.5)
+
+
+async def _with_backlog(controller: AdmissionController, queued: dict, check):
+    """Fill every slot, queue calls per class, then run check()"""
+    scheduler = controller.scheduler
+    gate = asyncio.Event()
+
+    async def call(request_class: str):
+        async with scheduler.slot(request_class, "c"):
+            await gate.wait()
+
+    tasks = [asyncio.create_task(call("interactive")) for _ in range(scheduler.capacity)]
+    for request_class, count in queued.items():
+        tasks += [asyncio.create_task(call(request_class)) for _ in range(count)]
+    await asyncio.sleep(0)
+    try:
+        return check()
+    finally:
+        gate.set()
+        await asyncio.gather(*tasks)
+
+
+def test_prediction_follows_queue_and_latency():
+    """Queued calls ahead (weighted by class) and latency drive the prediction"""
+    controller = _controller()
+    assert controller.predict("bulk") == (0.0, 2.0)
+
+    # 2 running + 4 interactive waiting: at weights 3:1 about 3 of the
+    # interactive calls start before a new bulk call
+    wait, completion = asyncio.run(_with_backlog(controller, {"interactive": 4}, lambda: controller.predict("bulk")))
+    assert wait == (2 + 3 - 2 + 1) / 2 * 2.0 and completion == wait + 2.0
+    # An interactive call only queues behind its own class (and a third of bulk)
+    wait, _ = asyncio.run(_with_backlog(controller, {"bulk": 3}, lambda: controller.predict("interactive")))
+    assert abs(wait - (2 + 1 / 3 - 2 + 1) / 2 * 2.0) < 1e-9
+
+    controller.record_latency(4.0)
+    assert controller.latency == 3.0
+
+
+def test_shedding_decisions():
+    """Low-priority work past its deadline is shed; idle servers always admit"""
+    controller = _controller(latency=60.0)
+    # Nothing queued: admitted however slow the estimate is
+    assert controller.check("bulk") is None
+
+    decisions = asyncio.run(_with_backlog(controller, {"bulk": 2}, lambda: (
+        controller.check("bulk"),
+        controller.check("interactive"),
+        controller.check("interactive", deadline=10.0),
+    )))
+    bulk, interactive, interactive_deadline = decisions
+    assert bulk is not None and 1 <= bulk <= 120
+    assert interactive is None
+    assert interactive_deadline is not None
+
+
+def _overloaded(scenario):
+    """Run scenario() with the global controller predicting a long backlog"""
+    original = admission.predict
+    admission.predict = lambda request_class: (40.0, 45.0)
+    try:
+        return scenario()
+    finally:
+        admission.predict = original
+
+
+def test_endpoints_shed_with_retry_after():
+    """Guarded endpoints answer 503 + Retry-After before doing any work"""
+    async def unexpected(*args, **kwargs):
+        raise AssertionError("shed requests must not call the LLM")
+
+    async def fake_generate(prompt, model=None, context=None, temperature=None, max_tokens=None):
+        return "chat answer"
+
+    context = {"url": "https://example.com/solar", "title": "Solar", "pageContent": PAGE}
+    original = llm_client.generate
+    client = TestClient(app)
+
+    def scenario():
+        llm_client.generate = unexpected
+        analyze = client.post("/api/v1/ai/analyze", json={"prompt": "Analyze", "context": context})
+        chat_deadline = client.post("/api/v1/ai/chat", json={"prompt": "tell me a story about the sea"},
+                                    headers={"X-Deadline-Seconds": "5"})
+        llm_client.generate = fake_generate
+        chat = client.post("/api/v1/ai/chat", json={"prompt": "tell me a story about the sea"})
+        return analyze, chat_deadline, chat
+
+    try:
+        analyze, chat_deadline, chat = _overloaded(scenario)
+    finally:
+        llm_client.generate = original
+
+    assert analyze.status_code == 503 and int(analyze.headers["retry-after"]) >= 1
+    assert chat_deadline.status_code == 503
+    assert chat.status_code == 200 and chat.json()["response"] == "chat answer"
+
+
+def test_summarize_falls_back_when_overloaded():
+    """An overloaded summarize answers extractively instead of queuing"""
+    async def unexpected(*args, **kwargs):
+        raise AssertionError("overloaded summarize must not call the LLM")
+
+    original = llm_client.generate
+    llm_client.generate = unexpected
+    ai_service.response_cache.clear()
+    try:
+        data = _overloaded(lambda: TestClient(app).post("/api/v1/ai/summarize", json={
+            "prompt": "Summarize this page",
+            "context": {"url": "https://example.com/solar", "title": "Solar", "pageContent": PAGE},
+        }).json())
+    finally:
+        llm_client.generate = original
+    assert data["source"] == "extractive" and data["fallback"] is True
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("VynceAI Admission Control Tests")
+    print("=" * 60)
+
+    test_prediction_follows_queue_and_latency()
+    test_shedding_decisions()
+    test_endpoints_shed_with_retry_after()
+    test_summarize_falls_back_when_overloaded()
+
+    print("\n✅ All admission tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,171 @@
+"""
+Test script for the cache tiers
+Tests LRU/TTL behaviour, the shared SQLite tier across processes, L1 promotion
+and the response cache on /summarize (LLM calls stubbed)
+"""
+
+import sys
+import os
+import sqlite3
+import subprocess
+import tempfile
+import time
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.core.cache import LRUCache, SQLiteCache, TieredCache
+from app.services.ai_service import response_cache
+from app.services.llm_client import llm_client
+from main import app
+
+SERVER_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_lru_eviction_and_ttl():
+    """Least recently used entries are evicted and expired ones are not returned"""
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+
+    cache.set("short", "x", ttl=0.01)
+    time.sleep(0.02)
+    assert cache.get("short", "gone") == "gone"
+
+
+def test_sqlite_shared_between_processes():
+    """A value written by one process is visible to another"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite3")
+        code = (
+            "from app.core.cache import SQLiteCache; "
+            f"SQLiteCache({path!r}, 'responses').set('k', {{'response': 'hello'}})"
+        )
+        subprocess.run([sys.executable, "-c", code], cwd=SERVER_DIR, check=True, capture_output=True)
+
+        cache = SQLiteCache(path, "responses")
+        assert cache.get("k") == {"response": "hello"}
+        assert SQLiteCache(path, "other").get("k") is None
+
+
+def test_sqlite_ttl_and_eviction():
+    """Expired entries are hidden and the oldest are purged past max_entries"""
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = SQLiteCache(os.path.join(tmp, "cache.sqlite3"), max_entries=3, purge_every=1)
+        cache.set("expired", 1, ttl=0.01)
+        time.sleep(0.02)
+        assert cache.get("expired") is None
+
+        for i in range(5):
+            cache.set(f"k{i}", i)
+        assert len(cache) == 3
+        assert cache.get("k0") is None
+        assert cache.get("k4") == 4
+
+
+def test_tiered_promotes_l2_hits():
+    """An L2 hit is copied into L1"""
+    with tempfile.TemporaryDirectory() as tmp:
+        l2 = SQLiteCache(os.path.join(tmp, "cache.sqlite3"))
+        l2.set("k", "v")
+        cache = TieredCache(LRUCache(8), l2)
+        assert cache.get("k") == "v"
+        assert cache.l1.get("k") == "v"
+
+
+def test_tiered_promotion_keeps_l2_expiry():
+    """Promoted entries expire from L1 with the L2 entry, not a fresh TTL"""
+    with tempfile.TemporaryDirectory() as tmp:
+        l2 = SQLiteCache(os.path.join(tmp, "cache.sqlite3"))
+        l2.set("k", "v", ttl=0.2)
+        cache = TieredCache(LRUCache(8, ttl=3600), l2)
+        assert cache.get("k") == "v"
+        time.sleep(0.25)
+        assert cache.l1.get("k") is None and cache.get("k") is None
+
+
+def test_shared_only_sees_other_writers():
+    """Without L1 every read reflects the latest write of another worker"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite3")
+        cache = TieredCache(None, SQLiteCache(path, "jobs"))
+        other_worker = SQLiteCache(path, "jobs")
+        cache.set("job", {"status": "queued"})
+        assert cache.get("job") == {"status": "queued"}
+        other_worker.set("job", {"status": "done"})
+        assert cache.get("job") == {"status": "done"}
+        cache.delete("job")
+        assert other_worker.get("job") is None
+
+
+def test_tiered_survives_a_locked_shared_cache():
+    """A write-locked L2 stalls the caller only briefly and never raises"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "cache.sqlite3")
+        cache = TieredCache(LRUCache(8), SQLiteCache(path, busy_timeout=0.05))
+        cache.set("k", "v")
+        other = sqlite3.connect(path, isolation_level=None)
+        other.execute("BEGIN IMMEDIATE")
+        try:
+            start = time.perf_counter()
+            cache.set("k2", "v2")
+            cache.delete("k")
+            cache.clear()
+            elapsed = time.perf_counter() - start
+        finally:
+            other.execute("ROLLBACK")
+            other.close()
+        assert elapsed < 1.0
+        assert cache.get("k2") is None and cache.l2.get("k") == "v"
+
+
+def test_summarize_uses_response_cache():
+    """A repeated summarize request is answered without a second LLM call"""
+    calls = []
+
+    async def fake_generate(prompt, model=None, context=None, temperature=None, max_tokens=None):
+        calls.append(prompt)
+        return "A short summary."
+
+    original = llm_client.generate
+    llm_client.generate = fake_generate
+    response_cache.clear()
+    try:
+        client = TestClient(app)
+        body = {"prompt": "summarize", "context": {"url": "https://example.com", "pageContent": "Some page text."}}
+        first = client.post("/api/v1/ai/summarize", json=body).json()
+        second = client.post("/api/v1/ai/summarize", json=body).json()
+    finally:
+        llm_client.generate = original
+
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert second["response"] == "A short summary."
+    assert len(calls) == 1
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("VynceAI Cache Tests")
+    print("=" * 60)
+
+    test_lru_eviction_and_ttl()
+    test_sqlite_shared_between_processes()
+    test_sqlite_ttl_and_eviction()
+    test_tiered_promotes_l2_hits()
+    test_tiered_promotion_keeps_l2_expiry()
+    test_shared_only_sees_other_writers()
+    test_tiered_survives_a_locked_shared_cache()
+    test_summarize_uses_response_cache()
+
+    print("\n✅ All cache tests passed!")
+
+
+if __name__ == "__main__":
+    main()
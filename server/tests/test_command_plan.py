@@ -0,0 +1,146 @@
+"""
+Test script for multi-step command planning
+Tests clause splitting, batched LLM fallback, validation and plan caching (LLM stubbed)
+"""
+
+import sys
+import os
+import asyncio
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.services import command_service
+from app.services.command_service import plan_commands, split_instruction, validate_step
+from app.services.llm_client import llm_client
+from main import app
+
+
+def _stub_generate(answer: str, calls: list):
+    async def fake_generate(prompt, model=None, context=None, temperature=None, max_tokens=None):
+        calls.append(prompt)
+        return answer
+    return fake_generate
+
+
+def _reset_caches():
+    command_service._parse_cache.clear()
+    command_service._plan_cache.clear()
+
+
+def test_split_instruction():
+    """Commas, semicolons and 'then' split clauses; a bare 'and' does not"""
+    assert split_instruction("go to example.com, click login, then submit the form") == [
+        "go to example.com", "click login", "submit the form"]
+    assert split_instruction("scroll down; go back and then reload") == ["scroll down", "go back", "reload"]
+    assert split_instruction("search youtube for rock and roll") == ["search youtube for rock and roll"]
+
+
+def test_grammar_plan_needs_no_llm():
+    """A fully grammar-parseable instruction is planned without the LLM"""
+    calls = []
+    original = llm_client.generate
+    llm_client.generate = _stub_generate("[]", calls)
+    _reset_caches()
+    try:
+        plan = asyncio.run(plan_commands(["fill form with name: John, email: j@x.com, then submit the form"]))
+    finally:
+        llm_client.generate = original
+
+    assert plan["success"] and not calls
+    assert [step["action"] for step in plan["steps"]] == ["google_form_fill", "submit_form"]
+    assert plan["steps"][0]["params"]["formData"] == {"name": "John", "email": "j@x.com"}
+    assert [step["step"] for step in plan["steps"]] == [1, 2]
+
+
+def test_unparsed_steps_use_one_llm_call():
+    """Clauses the grammar misses are resolved together in a single LLM call"""
+    calls = []
+    answer = ('[{"action": "click", "params": {"selector": "contact form"}},'
+              ' {"action": "click", "params": {"selector": "newsletter checkbox"}}]')
+    original = llm_client.generate
+    llm_client.generate = _stub_generate(answer, calls)
+    _reset_caches()
+    try:
+        plan = asyncio.run(plan_commands(["open the contact form, tick the newsletter box, then submit"]))
+        again = asyncio.run(plan_commands(["open the contact form; tick the newsletter box then submit."]))
+    finally:
+        llm_client.generate = original
+
+    assert len(calls) == 1
+    assert plan["success"] and not plan["cached"]
+    assert [step["source"] for step in plan["steps"]] == ["llm", "llm", "grammar"]
+    assert again["cached"] and again["steps"] == plan["steps"]
+
+
+def test_invalid_steps_are_reported():
+    """Steps that fail to parse or validate make the plan unsuccessful and are not cached"""
+    calls = []
+    original = llm_client.generate
+    llm_client.generate = _stub_generate('[{"action": "fill", "params": {"selector": "name"}}]', calls)
+    _reset_caches()
+    try:
+        plan = asyncio.run(plan_commands(["go back", "fill in my name"]))
+    finally:
+        llm_client.generate = original
+
+    assert not plan["success"]
+    assert plan["steps"][0]["valid"] and not plan["steps"][1]["valid"]
+    assert "value" in plan["steps"][1]["error"]
+    assert len(command_service._plan_cache) == 0
+    assert validate_step("teleport", {}) == "Unsupported action: teleport"
+
+
+def test_cache_keeps_case_and_skips_field_values():
+    """Plans are keyed case-sensitively and typed values are never cached"""
+    _reset_caches()
+    first = asyncio.run(plan_commands(["search youtube for Lofi"]))
+    second = asyncio.run(plan_commands(["search youtube for lofi"]))
+    assert first["steps"][0]["params"] == {"query": "Lofi"}
+    assert second["steps"][0]["params"] == {"query": "lofi"} and not second["cached"]
+
+    calls = []
+    original = llm_client.generate
+    llm_client.generate = _stub_generate('[{"action": "fill", "params": {"selector": "password", "value": "Hunter2"}}]', calls)
+    try:
+        plan = asyncio.run(plan_commands(["go back", "put my secret Hunter2 as the password"]))
+        again = asyncio.run(plan_commands(["go back", "put my secret Hunter2 as the password"]))
+    finally:
+        llm_client.generate = original
+
+    assert plan["success"] and not again["cached"]
+    assert len(calls) == 2
+    assert len(command_service._plan_cache) == 2 and len(command_service._parse_cache) == 0
+
+
+def test_plan_endpoint():
+    """The endpoint accepts a single instruction or a list"""
+    _reset_caches()
+    client = TestClient(app)
+    single = client.post("/api/v1/command/plan", json={"instruction": "scroll down then go back"}).json()
+    assert single["success"] is True
+    assert [step["action"] for step in single["steps"]] == ["scroll", "navigate"]
+
+    many = client.post("/api/v1/command/plan", json={"instruction": ["scroll down", "go back"]}).json()
+    assert many["steps"] == single["steps"] and many["cached"] is True
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("VynceAI Command Plan Tests")
+    print("=" * 60)
+
+    test_split_instruction()
+    test_grammar_plan_needs_no_llm()
+    test_unparsed_steps_use_one_llm_call()
+    test_invalid_steps_are_reported()
+    test_cache_keeps_case_and_skips_field_values()
+    test_plan_endpoint()
+
+    print("\n✅ All command plan tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Test script for LLM-free structured extraction
+Tests typed extractors, tables, limits, speed and the extract endpoints
+"""
+
+import sys
+import os
+import asyncio
+import time
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.services.command_service import _EXTRACT_TARGETS, EXTRACT_TARGETS, extract_structured, parse_command, run_extract, validate_step
+from main import app
+
+
+PAGE = """Contact Sales@Example.com or support@example.co.uk, call +1 (555) 123-4567 or 020 7946 0958.
+Docs at https://example.com/docs, changelog at http://example.com/log?page=2.
+Released 2024-03-15, renewal 15/04/2024, next review March 3rd, 2025.
+Pro plan $1,299.99 per year, Basic €49, India 999 INR. Order 12345 shipped.
+Name\tPlan\tPrice
+Alice\tPro\t$10
+Bob\tBasic\t$5
+"""
+
+
+def test_token_extractors():
+    """Emails, phones, links, dates and prices come back typed and de-duplicated"""
+    results = extract_structured(PAGE + PAGE)
+    assert results["emails"] == ["sales@example.com", "support@example.co.uk"]
+    assert [p["number"] for p in results["phones"]] == ["+15551234567", "02079460958"]
+    assert results["links"] == ["https://example.com/docs", "http://example.com/log?page=2"]
+    assert [d["iso"] for d in results["dates"]] == ["2024-03-15", "2024-04-15", "2025-03-03"]
+    assert results["prices"][0] == {"text": "$1,299.99", "amount": 1299.99, "currency": "USD"}
+    assert {(p["currency"], p["amount"]) for p in results["prices"]} >= {("EUR", 49.0), ("INR", 999.0)}
+
+
+def test_tables():
+    """Tab- and pipe-separated rows become header/rows tables"""
+    tables = extract_structured(PAGE + "\n| a | b |\n|---|---|\n| 1 | 2 |\n", ["tables"])["tables"]
+    assert tables[0] == {"headers": ["Name", "Plan", "Price"], "rows": [["Alice", "Pro", "$10"], ["Bob", "Basic", "$5"]]}
+    assert tables[1] == {"headers": ["a", "b"], "rows": [["1", "2"]]}
+
+
+def test_targets_and_limit():
+    """Only requested targets are returned, each capped at the limit"""
+    results = extract_structured(PAGE, ["emails", "prices"], limit=1)
+    assert set(results) == {"emails", "prices"}
+    assert len(results["emails"]) == 1 and len(results["prices"]) == 1
+
+
+def test_large_page_is_fast():
+    """A 40k-character page is scanned in milliseconds"""
+    prose = "Lorem ipsum dolor sit amet, consectetur adipiscing elit, sed do eiusmod tempor. " * 4
+    page = ((PAGE + prose) * 100)[:40_000]
+    start = time.perf_counter()
+    extract_structured(page)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"40k-char page: {elapsed_ms:.1f} ms")
+    assert elapsed_ms < 200
+
+
+def test_grammar_targets_are_executable():
+    """Every target the grammar can produce is one run_extract supports"""
+    for phrase in [f"{name}s" for name in _EXTRACT_TARGETS]:
+        parsed = parse_command(f"extract all {phrase} from this page")
+        assert parsed is not None and parsed["action"] == "extract", phrase
+        target = parsed["params"]["target"]
+        assert target in EXTRACT_TARGETS and validate_step("extract", parsed["params"]) is None, phrase
+        asyncio.run(run_extract({"pageContent": PAGE, "target": target}))
+
+    assert parse_command("extract all images") is None
+    assert validate_step("extract", {"target": "images"}) == "Unsupported extract target: images"
+
+
+def test_extract_endpoints():
+    """/extract and /run with the extract command return structured data"""
+    client = TestClient(app)
+    data = client.post("/api/v1/command/extract", json={"pageContent": PAGE, "targets": ["emails"]}).json()
+    assert data["success"] is True
+    assert data["results"] == {"emails": ["sales@example.com", "support@example.co.uk"]}
+    assert data["counts"] == {"emails": 2}
+
+    bad = client.post("/api/v1/command/extract", json={"pageContent": PAGE, "targets": ["images"]}).json()
+    assert bad["success"] is False and "images" in bad["error"]
+
+    run = client.post("/api/v1/command/run", json={"command": "extract", "params": {"pageContent": PAGE, "target": "phones"}}).json()
+    assert run["success"] is True and run["action"] == "extract"
+    assert run["data"]["counts"] == {"phones": 2}
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("VynceAI Structured Extraction Tests")
+    print("=" * 60)
+
+    test_token_extractors()
+    test_tables()
+    test_targets_and_limit()
+    test_large_page_is_fast()
+    test_grammar_targets_are_executable()
+    test_extract_endpoints()
+
+    print("\n✅ All extraction tests passed!")
+
+
+if __name__ == "__main__":
+    main()
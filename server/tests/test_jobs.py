@@ -0,0 +1,237 @@
+"""
+Test script for background analysis jobs
+Tests partial results, subscriptions, bounded concurrency, timeouts,
+cancellation, result TTL and the job endpoints (LLM stubbed)
+"""
+
+import sys
+import os
+import asyncio
+import tempfile
+import time
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.core import cache as cache_module
+from app.core.config import settings
+from app.core.scheduler import current_priority, priority
+from app.core.tracing import Trace, _current_trace, current_request_id
+from app.services import ai_service, job_service
+from app.services.job_service import JobStore, QueueFullError
+from app.services.llm_client import llm_client
+from main import app
+
+
+PAGE = "Job test page.\n\nIt describes how long analyses run in the background."
+
+
+def _stub_stream(calls: list, delay: float = 0.0):
+    async def fake_stream(prompt, model=None, context=None, temperature=None, max_tokens=None):
+        calls.append(prompt)
+        for chunk in ("Main ", "topics: ", "jobs."):
+            await asyncio.sleep(delay)
+            yield chunk
+    return fake_stream
+
+
+def _with_stream(calls: list, scenario, delay: float = 0.0):
+    original = llm_client.generate_stream
+    llm_client.generate_stream = _stub_stream(calls, delay)
+    ai_service.response_cache.clear()
+    try:
+        return asyncio.run(scenario())
+    finally:
+        llm_client.generate_stream = original
+
+
+def _analysis(job):
+    return ai_service.analyze_page_content(PAGE, "https://example.com/jobs", "Jobs", on_delta=job.emit)
+
+
+def test_subscriber_gets_partials_then_result():
+    """Subscribers see each chunk as it streams, then the final result"""
+    calls = []
+    store = JobStore(workers=2, queue_size=10, timeout=5, result_ttl=60)
+
+    async def scenario():
+        job = store.submit("analyze", _analysis)
+        events = [event async for event in store.subscribe(job.id)]
+        again = store.submit("analyze", _analysis)
+        await asyncio.sleep(0.05)
+        second = store.snapshot(again.id)
+        await store.stop()
+        return job.id, events, store.snapshot(job.id), second
+
+    job_id, events, final, second = _with_stream(calls, scenario, delay=0.01)
+    deltas = "".join(e["delta"] for e in events if e["type"] == "delta")
+    assert deltas == "Main topics: jobs."
+    assert events[-1]["status"] == "done" and events[-1]["result"]["response"] == "Main topics: jobs."
+    # Finished jobs are answered from the result store
+    assert final["job_id"] == job_id and final["status"] == "done"
+    # The same page again comes from the response cache
+    assert second["result"]["cached"] is True and len(calls) == 1
+
+
+def test_concurrency_is_bounded_and_queue_rejects():
+    """No more than JOB_WORKERS jobs run at once; a full queue rejects"""
+    store = JobStore(workers=2, queue_size=2, timeout=5, result_ttl=60)
+    running, peak = [0], [0]
+
+    async def work(job):
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        await asyncio.sleep(0.05)
+        running[0] -= 1
+        return {"ok": True}
+
+    async def scenario():
+        jobs = [store.submit("test", work), store.submit("test", work)]
+        await asyncio.sleep(0)  # workers pick up the first two
+        jobs += [store.submit("test", work), store.submit("test", work)]
+        try:
+            store.submit("test", work)
+            rejected = False
+        except QueueFullError:
+            rejected = True
+        while not all(job.finished for job in jobs):
+            await asyncio.sleep(0.01)
+        await store.stop()
+        return rejected, [job.status for job in jobs]
+
+    rejected, statuses = asyncio.run(scenario())
+    assert rejected and statuses == ["done"] * 4
+    assert peak[0] == 2
+
+
+def test_timeout_cancel_and_ttl():
+    """Slow jobs fail, cancelled jobs stop, and results expire"""
+    store = JobStore(workers=2, queue_size=10, timeout=0.05, result_ttl=0.2)
+
+    async def slow(job):
+        job.emit("partial")
+        await asyncio.sleep(1)
+        return {}
+
+    async def scenario():
+        timed_out = store.submit("test", slow)
+        cancelled = store.submit("test", slow)
+        await asyncio.sleep(0.01)
+        assert store.snapshot(cancelled.id)["partial"] == "partial"
+        assert store.cancel(cancelled.id)
+        await asyncio.sleep(0.1)
+        results = store.snapshot(timed_out.id), store.snapshot(cancelled.id)
+        await store.stop()
+        return timed_out.id, results
+
+    job_id, (timed_out, cancelled) = asyncio.run(scenario())
+    assert timed_out["status"] == "failed" and "Timed out" in timed_out["error"]
+    assert cancelled["status"] == "cancelled"
+    time.sleep(0.25)
+    assert store.snapshot(job_id) is None
+
+
+def test_other_workers_see_live_jobs():
+    """Queued and running jobs are visible through the shared store, in a clean context"""
+    accepting = JobStore(workers=1, queue_size=10, timeout=5, result_ttl=5)
+    other = JobStore(workers=1, queue_size=10, timeout=5, result_ttl=5)
+    seen = []
+
+    async def work(job):
+        seen.append((current_request_id(), current_priority()))
+        await asyncio.sleep(0.05)
+        return {"response": "ok"}
+
+    async def scenario():
+        token = _current_trace.set(Trace("submitting-request"))
+        try:
+            with priority("batch", "submitter"):
+                job = accepting.submit("test", work)
+        finally:
+            _current_trace.reset(token)
+        queued = other.snapshot(job.id)["status"]
+        await asyncio.sleep(0.01)
+        running = other.snapshot(job.id)["status"]
+        events = [event async for event in other.subscribe(job.id)]
+        await accepting.stop()
+        return queued, running, events
+
+    original = job_service.REMOTE_POLL_SECONDS
+    job_service.REMOTE_POLL_SECONDS = 0.01
+    try:
+        queued, running, events = asyncio.run(scenario())
+    finally:
+        job_service.REMOTE_POLL_SECONDS = original
+    assert (queued, running) == ("queued", "running")
+    assert [event["status"] for event in events] == ["running", "done"]
+    assert events[-1]["result"] == {"response": "ok"}
+    # The job keeps the submitter's class and client, not its trace
+    assert seen == [("-", ("batch", "submitter"))]
+
+
+def test_polls_follow_status_changes_in_the_shared_cache():
+    """With the SQLite backend, polls see every status another worker publishes"""
+    original = settings.CACHE_BACKEND, settings.CACHE_SQLITE_PATH, cache_module._caches.pop("jobs", None)
+    with tempfile.TemporaryDirectory() as tmp:
+        settings.CACHE_BACKEND, settings.CACHE_SQLITE_PATH = "sqlite", os.path.join(tmp, "cache.sqlite3")
+        try:
+            store = JobStore(workers=1, queue_size=10, timeout=5, result_ttl=5)
+            owner = cache_module.SQLiteCache(settings.CACHE_SQLITE_PATH, "jobs")
+            owner.set("remote-job", {"id": "remote-job", "status": "running"})
+            assert store.snapshot("remote-job")["status"] == "running"
+            owner.set("remote-job", {"id": "remote-job", "status": "done"})
+            assert store.snapshot("remote-job")["status"] == "done"
+        finally:
+            settings.CACHE_BACKEND, settings.CACHE_SQLITE_PATH = original[:2]
+            cache_module._caches.pop("jobs", None)
+            if original[2] is not None:
+                cache_module._caches["jobs"] = original[2]
+
+
+def test_job_endpoints():
+    """Submit returns 202 at once; poll and event stream deliver the result"""
+    calls = []
+    original = llm_client.generate_stream
+    llm_client.generate_stream = _stub_stream(calls, delay=0.05)
+    ai_service.response_cache.clear()
+    try:
+        with TestClient(app) as client:
+            submitted = client.post("/api/v1/ai/analyze/jobs", json={
+                "prompt": "Analyze",
+                "context": {"url": "https://example.com/jobs", "title": "Jobs", "pageContent": PAGE},
+            })
+            assert submitted.status_code == 202
+            job = submitted.json()
+
+            with client.stream("GET", job["events_url"]) as stream:
+                body = "".join(stream.iter_text())
+            polled = client.get(job["poll_url"]).json()
+            missing = client.get("/api/v1/ai/jobs/unknown")
+            no_content = client.post("/api/v1/ai/analyze/jobs", json={"prompt": "Analyze"})
+    finally:
+        llm_client.generate_stream = original
+
+    assert "event: delta" in body and body.rstrip().endswith("}")
+    assert polled["status"] == "done" and polled["result"]["response"] == "Main topics: jobs."
+    assert missing.status_code == 404 and no_content.status_code == 400
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("VynceAI Background Job Tests")
+    print("=" * 60)
+
+    test_subscriber_gets_partials_then_result()
+    test_concurrency_is_bounded_and_queue_rejects()
+    test_timeout_cancel_and_ttl()
+    test_other_workers_see_live_jobs()
+    test_polls_follow_status_changes_in_the_shared_cache()
+    test_job_endpoints()
+
+    print("\n✅ All job tests passed!")
+
+
+if __name__ == "__main__":
+    main()
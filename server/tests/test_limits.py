@@ -0,0 +1,102 @@
+"""
+Test script for request body limits and pageContent trimming
+Tests 413 rejection (declared and streamed) and truncation flags
+"""
+
+import sys
+import os
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.limits import BodyLimitMiddleware
+from app.models.schemas import AIRequest, PageContext
+from main import app
+
+
+def _client(limits, default=1000):
+    app = FastAPI()
+    app.add_middleware(BodyLimitMiddleware, limits=limits, default=default)
+
+    @app.post("/api/v1/ai/chat")
+    async def chat(request: Request):
+        return {"size": len(await request.body())}
+
+    @app.post("/other")
+    async def other(request: Request):
+        return {"size": len(await request.body())}
+
+    return TestClient(app)
+
+
+def test_declared_length_rejected():
+    """Content-Length above the route limit is rejected without reading"""
+    client = _client({"/api/v1/ai": 100})
+    response = client.post("/api/v1/ai/chat", content=b"x" * 101)
+    print(f"Declared oversize: {response.status_code} {response.json()}")
+    assert response.status_code == 413
+    assert client.post("/api/v1/ai/chat", content=b"x" * 100).status_code == 200
+
+
+def test_streamed_body_rejected():
+    """Chunked bodies are cut off once they cross the limit"""
+    client = _client({"/api/v1/ai": 100})
+
+    def chunks():
+        for _ in range(10):
+            yield b"x" * 50
+
+    response = client.post("/api/v1/ai/chat", content=chunks())
+    print(f"Streamed oversize: {response.status_code}")
+    assert response.status_code == 413
+
+
+def test_streamed_body_rejected_on_real_route():
+    """A streamed oversize body to the real chat route gets 413, not a parse error"""
+    def chunks():
+        for _ in range(30):
+            yield b"x" * 50_000
+
+    response = TestClient(app).post("/api/v1/ai/chat", content=chunks(), headers={"content-type": "application/json"})
+    print(f"Streamed oversize (app): {response.status_code}")
+    assert response.status_code == 413
+
+
+def test_default_limit_applies():
+    """Routes without a prefix entry use the default limit"""
+    client = _client({"/api/v1/ai": 100}, default=500)
+    assert client.post("/other", content=b"x" * 400).status_code == 200
+    assert client.post("/other", content=b"x" * 501).status_code == 413
+
+
+def test_page_content_truncated():
+    """Overlong pageContent is trimmed during validation and flagged"""
+    limit = settings.PAGE_CONTENT_MAX_CHARS
+    req = AIRequest(prompt="Summarize", context={"pageContent": "a" * (limit + 10)})
+    assert len(req.context.page_content) == limit
+    assert req.context.truncated is True
+
+    short = PageContext(pageContent="short")
+    assert short.truncated is False
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("VynceAI Request Limit Tests")
+    print("=" * 60)
+
+    test_declared_length_rejected()
+    test_streamed_body_rejected()
+    test_streamed_body_rejected_on_real_route()
+    test_default_limit_applies()
+    test_page_content_truncated()
+
+    print("\n✅ All limit tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Test script for the local answer engine
+Tests templates, the safe arithmetic evaluator, the confidence threshold
+and that answered prompts never reach a provider
+"""
+
+import sys
+import os
+import asyncio
+import time
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.services.llm_client import llm_client
+from app.services.local_answers import answer_locally, safe_eval
+from main import app
+
+
+def test_templates():
+    """Greetings and identity questions are answered from templates"""
+    for prompt in ["hi", "Hello there!", "good morning", "how are you?", "thanks!"]:
+        assert answer_locally(prompt).kind == "greeting", prompt
+    for prompt in ["who are you?", "What's your name", "what can you do"]:
+        assert answer_locally(prompt).kind == "identity", prompt
+
+
+def test_arithmetic():
+    """Plain arithmetic is evaluated locally"""
+    assert answer_locally("calculate 12 * (3 + 4)").text == "12 * (3 + 4) = 84"
+    assert answer_locally("what is 2^10?").text == "2^10 = 1024"
+    assert answer_locally("what is 15% of 200").text == "15% of 200 = 30"
+    assert answer_locally("what is 7 x 6").text == "7 x 6 = 42"
+    assert "division by zero" in answer_locally("solve 10 / 0").text
+
+
+def test_unsafe_and_open_questions_defer():
+    """Anything that is not plain arithmetic or a known phrase goes to the LLM"""
+    for prompt in ["what is machine learning", "what is 42", "hi, summarize this page",
+                   "solve x + 2 = 5", "9**9**9", "__import__('os').getcwd()", "(1).__class__"]:
+        assert answer_locally(prompt) is None, prompt
+    try:
+        safe_eval("[1, 2]")
+        assert False, "lists must be rejected"
+    except ValueError:
+        pass
+
+
+def test_confidence_threshold():
+    """Vague matches only answer locally when the threshold allows it"""
+    assert answer_locally("help me") is None
+    assert answer_locally("help me", min_confidence=0.7).kind == "help"
+
+
+def test_generate_skips_providers():
+    """generate() and generate_stream() answer locally without an upstream call"""
+    calls = []
+
+    async def fake_llama(*args, **kwargs):
+        calls.append(args)
+        return "upstream"
+
+    async def collect():
+        return [chunk async for chunk in llm_client.generate_stream("what is 2+2")]
+
+    original = llm_client._generate_with_llama
+    llm_client._generate_with_llama = fake_llama
+    try:
+        start = time.perf_counter()
+        answer = asyncio.run(llm_client.generate("hello"))
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        chunks = asyncio.run(collect())
+        upstream = asyncio.run(llm_client.generate("tell me a story about dragons"))
+    finally:
+        llm_client._generate_with_llama = original
+
+    print(f"Local answer: {elapsed_ms:.3f} ms (including event loop setup)")
+    assert answer.startswith("Hello! I'm VynceAI")
+    assert chunks == ["2+2 = 4"]
+    assert upstream == "upstream" and len(calls) == 1
+
+
+def test_chat_endpoint_with_context():
+    """The chat endpoint answers greetings locally even with page context"""
+    client = TestClient(app)
+    data = client.post("/api/v1/ai/chat", json={
+        "prompt": "who are you?",
+        "context": {"url": "https://example.com", "title": "Example", "pageContent": "Example page"},
+    }).json()
+    assert data["response"].startswith("I'm VynceAI")
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("VynceAI Local Answer Tests")
+    print("=" * 60)
+
+    test_templates()
+    test_arithmetic()
+    test_unsafe_and_open_questions_defer()
+    test_confidence_threshold()
+    test_generate_skips_providers()
+    test_chat_endpoint_with_context()
+
+    print("\n✅ All local answer tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""
+Test script for the queued logging backend
+Tests sampling and deferred message formatting
+"""
+
+import logging
+import sys
+import os
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.logger import DeferredQueueHandler, JsonFormatter, SamplingFilter
+
+
+def _record(level=logging.INFO, msg="value: %s", args=(1,)):
+    return logging.LogRecord("test", level, __file__, 1, msg, args, None)
+
+
+def test_sampling_keeps_one_in_n():
+    """INFO records are sampled, warnings always pass"""
+    sampler = SamplingFilter(0.25)
+    kept = sum(sampler.filter(_record()) for _ in range(100))
+    assert kept == 25
+    assert all(sampler.filter(_record(logging.WARNING)) for _ in range(10))
+    assert not SamplingFilter(0).filter(_record())
+
+
+def test_queue_handler_defers_formatting():
+    """Records are queued unformatted; args are merged by the listener"""
+    handler = DeferredQueueHandler(None)
+    record = handler.prepare(_record())
+    assert record.msg == "value: %s" and record.args == (1,)
+    assert '"msg": "value: 1"' in JsonFormatter().format(record)
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("VynceAI Logger Tests")
+    print("=" * 60)
+
+    test_sampling_keeps_one_in_n()
+    test_queue_handler_defers_formatting()
+
+    print("\n✅ All logger tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Test script for the event loop monitor
+Tests lag measurement and capture of the blocking call's stack
+"""
+
+import sys
+import os
+import asyncio
+import time
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.loop_monitor import LoopMonitor
+from app.core.metrics import LOOP_LAG
+
+
+def _blocking_call(seconds: float):
+    time.sleep(seconds)
+
+
+def test_blocking_call_is_captured():
+    """A sync sleep on the loop is recorded with its own stack"""
+    async def scenario():
+        monitor = LoopMonitor(interval=0.01, threshold=0.05, max_events=10)
+        monitor.start()
+        await asyncio.sleep(0.05)
+        _blocking_call(0.3)
+        await asyncio.sleep(0.05)
+        await monitor.stop()
+        return monitor
+
+    before = LOOP_LAG.count()
+    monitor = asyncio.run(scenario())
+
+    events = monitor.snapshot()
+    print(f"Captured {len(events)} event(s): {[e['lag_ms'] for e in events]}")
+    assert len(events) == 1
+    assert any("_blocking_call" in line for line in events[0]["stack"])
+    assert LOOP_LAG.count() > before
+    assert not monitor.running
+
+
+def test_idle_loop_has_no_events():
+    """No events are recorded when nothing blocks the loop"""
+    async def scenario():
+        monitor = LoopMonitor(interval=0.01, threshold=0.1, max_events=10)
+        monitor.start()
+        await asyncio.sleep(0.2)
+        await monitor.stop()
+        return monitor
+
+    assert asyncio.run(scenario()).snapshot() == []
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("VynceAI Event Loop Monitor Tests")
+    print("=" * 60)
+
+    test_blocking_call_is_captured()
+    test_idle_loop_has_no_events()
+
+    print("\n✅ All event loop monitor tests passed!")
+
+
+if __name__ == "__main__":
+    main()
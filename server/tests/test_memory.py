@@ -0,0 +1,143 @@
+"""
+Test script for request memory accounting
+Tests the in-flight byte budget, FIFO admission, the 503 backpressure path
+and the allocation trace endpoint
+"""
+
+import sys
+import os
+import asyncio
+import tracemalloc
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.memory import MemoryBudget, MemoryBudgetMiddleware, top_allocations_by_route
+from main import app
+
+
+def test_waiter_admitted_on_release():
+    """A request waits for capacity and is admitted when bytes are released"""
+    async def scenario():
+        budget = MemoryBudget(100)
+        assert await budget.acquire(80, timeout=1)
+        waiter = asyncio.create_task(budget.acquire(50, timeout=1))
+        await asyncio.sleep(0.01)
+        assert not waiter.done()
+        budget.release(80)
+        assert await waiter
+        return budget.in_flight
+
+    assert asyncio.run(scenario()) == 50
+
+
+def test_timeout_rejects_and_unblocks_queue():
+    """A timed-out head waiter is removed so smaller requests behind it proceed"""
+    async def scenario():
+        budget = MemoryBudget(100)
+        assert await budget.acquire(60, timeout=1)
+        large = asyncio.create_task(budget.acquire(90, timeout=0.05))
+        await asyncio.sleep(0)
+        small = asyncio.create_task(budget.acquire(30, timeout=1))
+        assert not await large
+        assert await small
+        return budget.in_flight
+
+    assert asyncio.run(scenario()) == 90
+
+
+def test_oversized_request_admitted_alone():
+    """A request larger than the whole budget runs once nothing else is in flight"""
+    async def scenario():
+        budget = MemoryBudget(100)
+        return await budget.acquire(500, timeout=0.01)
+
+    assert asyncio.run(scenario())
+
+
+def test_middleware_returns_503_when_exhausted():
+    """Requests that cannot be admitted in time get 503 with Retry-After"""
+    async def scenario():
+        budget = MemoryBudget(10)
+        await budget.acquire(10, timeout=1)
+        sent = []
+
+        async def downstream(scope, receive, send):
+            raise AssertionError("Should not be called")
+
+        async def send(message):
+            sent.append(message)
+
+        original = settings.MEMORY_ADMISSION_TIMEOUT_SECONDS
+        settings.MEMORY_ADMISSION_TIMEOUT_SECONDS = 0.01
+        try:
+            scope = {"type": "http", "method": "POST", "path": "/api/v1/ai/chat", "headers": [(b"content-length", b"100")]}
+            await MemoryBudgetMiddleware(downstream, budget)(scope, None, send)
+        finally:
+            settings.MEMORY_ADMISSION_TIMEOUT_SECONDS = original
+        return sent
+
+    start = asyncio.run(scenario())[0]
+    assert start["status"] == 503
+    assert (b"retry-after", b"1") in start["headers"]
+
+
+def test_allocations_grouped_by_route():
+    """Allocations made inside an endpoint are attributed to its route"""
+    client = TestClient(app)
+    tracemalloc.start(settings.MEMORY_PROFILE_FRAMES)
+    try:
+        client.get("/api/v1/utils/ping")
+        snapshot = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    report = top_allocations_by_route(snapshot, app.routes, limit=3)
+    print(f"Routes: {list(report)}")
+    assert "unattributed" in report
+    assert all(len(entry["top"]) <= 3 for entry in report.values())
+
+
+def test_memory_endpoint_runs_one_trace_at_a_time():
+    """A second allocation trace while one runs gets 409; tracing stops afterwards"""
+    async def scenario():
+        transport = httpx.ASGITransport(app=app)
+        headers = {"X-Debug-Token": "s3cret"}
+        async with httpx.AsyncClient(transport=transport, base_url="http://test", headers=headers) as client:
+            first = asyncio.create_task(client.get("/api/v1/debug/memory?seconds=0.3&top=3"))
+            await asyncio.sleep(0.1)
+            second = await client.get("/api/v1/debug/memory?seconds=0&top=3")
+            return await first, second
+
+    original = settings.DEBUG_TOKEN
+    settings.DEBUG_TOKEN = "s3cret"
+    try:
+        first, second = asyncio.run(scenario())
+    finally:
+        settings.DEBUG_TOKEN = original
+    assert first.status_code == 200 and "routes" in first.json()
+    assert second.status_code == 409
+    assert not tracemalloc.is_tracing()
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("VynceAI Memory Accounting Tests")
+    print("=" * 60)
+
+    test_waiter_admitted_on_release()
+    test_timeout_rejects_and_unblocks_queue()
+    test_oversized_request_admitted_alone()
+    test_middleware_returns_503_when_exhausted()
+    test_allocations_grouped_by_route()
+    test_memory_endpoint_runs_one_trace_at_a_time()
+
+    print("\n✅ All memory accounting tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""
+Test script for the in-process metrics registry
+Tests counters, histograms and Prometheus text output
+"""
+
+import sys
+import os
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.core.metrics import MetricsMiddleware, MetricsRegistry
+from main import app
+
+
+def test_histogram_buckets_are_cumulative():
+    """Bucket counts are cumulative and le bounds are inclusive"""
+    registry = MetricsRegistry()
+    histogram = registry.histogram("test_latency_seconds", "Test latency", ("route",), buckets=(0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 5.0):
+        histogram.observe(value, "/chat")
+
+    text = registry.render()
+    print(text)
+    assert 'test_latency_seconds_bucket{route="/chat",le="0.1"} 2' in text
+    assert 'test_latency_seconds_bucket{route="/chat",le="1"} 3' in text
+    assert 'test_latency_seconds_bucket{route="/chat",le="+Inf"} 4' in text
+    assert 'test_latency_seconds_count{route="/chat"} 4' in text
+
+
+def test_counter_label_escaping():
+    """Label values are escaped in the exposition format"""
+    registry = MetricsRegistry()
+    registry.counter("test_total", "Test counter", ("type",)).inc('bad "value"')
+    assert 'test_total{type="bad \\"value\\""} 1' in registry.render()
+
+
+def test_metrics_endpoint():
+    """Requests are recorded per route template and exposed on /metrics"""
+    client = TestClient(app)
+    client.get("/api/v1/utils/ping")
+    response = client.get("/api/v1/utils/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert 'vynce_http_requests_total{route="/api/v1/utils/ping",method="GET",status="200"}' in response.text
+
+
+def test_in_flight_labels_are_bounded():
+    """Only prefixes of real routes become in-flight labels"""
+    middleware = MetricsMiddleware(None)
+
+    def label(path: str) -> str:
+        return middleware.in_flight_route({"path": path, "app": app})
+
+    assert label("/api/v1/ai/chat") == "/api/v1/ai/chat"
+    assert label("/api/v1/ai/session/abc123") == "/api/v1/ai/session"
+    assert label("/api/v1/ai/jobs/xyz/events") == "/api/v1/ai/jobs"
+    assert label("/api/v1/random-scan-1234/x") == "unmatched"
+    assert label("/api/v9/ai/chat") == "unmatched"
+    assert label("/docs") == "other"
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("VynceAI Metrics Tests")
+    print("=" * 60)
+
+    test_histogram_buckets_are_cumulative()
+    test_counter_label_escaping()
+    test_metrics_endpoint()
+    test_in_flight_labels_are_bounded()
+
+    print("\n✅ All metrics tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,245 @@
+"""
+Test script for background page prefetch
+Tests cache warming, idle gating, queue bounds, de-duplication and
+single-flight upstream calls (LLM stubbed)
+"""
+
+import sys
+import os
+import asyncio
+import time
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.core.metrics import REQUESTS_IN_FLIGHT, WS_REQUESTS_IN_FLIGHT
+from app.core.scheduler import current_priority, priority
+from app.core.tracing import Trace, _current_trace, current_request_id
+from app.services import ai_service
+from app.services.llm_client import llm_client
+from app.services.prefetch_service import (
+    PrefetchJob, PrefetchQueue, content_hash, interactive_in_flight, prefetch_queue, submit_prefetch
+)
+from app.services.retrieval_service import retrieval_store
+from main import app
+
+
+PAGE = "Prefetch test page.\n\nIt explains how   background warming makes summaries instant."
+
+
+def _stub_generate(calls: list, delay: float = 0.0):
+    async def fake_generate(prompt, model=None, context=None, temperature=None, max_tokens=None):
+        calls.append(prompt)
+        await asyncio.sleep(delay)
+        return f"summary #{len(calls)}"
+    return fake_generate
+
+
+def _with_stub(calls: list, scenario, delay: float = 0.0):
+    original = llm_client.generate
+    llm_client.generate = _stub_generate(calls, delay)
+    ai_service.response_cache.clear()
+    try:
+        return asyncio.run(scenario())
+    finally:
+        llm_client.generate = original
+
+
+def test_prefetch_makes_summarize_instant():
+    """A prefetched page is summarized from the cache without a second call"""
+    calls = []
+
+    async def scenario():
+        queued = submit_prefetch(PAGE, "https://example.com/a", "A", summarize=True)
+        await prefetch_queue._queue.join()
+        # Whitespace differences do not change the content hash
+        summary = await ai_service.summarize_page_content(PAGE.replace("   ", " "), "https://example.com/a", "A")
+        again = submit_prefetch(PAGE, "https://example.com/a", "A", summarize=True)
+        await prefetch_queue.stop()
+        return queued, summary, again
+
+    queued, summary, again = _with_stub(calls, scenario)
+    assert queued["status"] == "queued"
+    assert summary["cached"] is True and summary["response"] == "summary #1"
+    assert again["status"] == "cached"
+    assert len(calls) == 1
+
+
+def test_prefetch_waits_for_interactive_requests():
+    """No prefetch work starts while an interactive request is in flight"""
+    calls = []
+
+    async def scenario():
+        REQUESTS_IN_FLIGHT.inc("/api/v1/ai/chat")
+        try:
+            submit_prefetch(PAGE + " busy", "https://example.com/b", "B", summarize=True)
+            await asyncio.sleep(0.2)
+            during = len(calls)
+        finally:
+            REQUESTS_IN_FLIGHT.dec("/api/v1/ai/chat")
+        await prefetch_queue._queue.join()
+        await prefetch_queue.stop()
+        return during
+
+    during = _with_stub(calls, scenario)
+    assert during == 0 and len(calls) == 1
+
+
+def test_only_ai_routes_and_ws_chats_count_as_interactive():
+    """Utils and debug requests do not hold prefetch back; WebSocket chats do"""
+    before = interactive_in_flight()
+    for route in ("/api/v1/utils/health", "/api/v1/debug/profile", "/api/v1/ai/jobs", "unmatched"):
+        REQUESTS_IN_FLIGHT.inc(route)
+    try:
+        assert interactive_in_flight() == before
+        WS_REQUESTS_IN_FLIGHT.inc()
+        try:
+            assert interactive_in_flight() == before + 1
+        finally:
+            WS_REQUESTS_IN_FLIGHT.dec()
+    finally:
+        for route in ("/api/v1/utils/health", "/api/v1/debug/profile", "/api/v1/ai/jobs", "unmatched"):
+            REQUESTS_IN_FLIGHT.dec(route)
+
+
+def test_workers_do_not_inherit_the_first_request():
+    """Jobs never run under the trace or client of the request that started the workers"""
+    seen = []
+
+    async def scenario():
+        async def record(prompt, model=None, context=None, temperature=None, max_tokens=None):
+            seen.append((current_request_id(), current_priority()))
+            return "summary"
+
+        llm_client.generate = record
+        token = _current_trace.set(Trace("first-request"))
+        try:
+            with priority("interactive", "first-client"):
+                submit_prefetch(PAGE + " context", "https://example.com/e", "E", summarize=True)
+        finally:
+            _current_trace.reset(token)
+        await prefetch_queue._queue.join()
+        await prefetch_queue.stop()
+
+    _with_stub([], scenario)
+    assert seen == [("-", ("prefetch", "prefetch"))]
+
+
+def test_queue_is_bounded_and_deduplicated():
+    """Full queues drop new pages and pending pages are not queued twice"""
+    queue = PrefetchQueue(maxsize=2, workers=1, idle_poll=0.01)
+
+    def job(text: str) -> PrefetchJob:
+        return PrefetchJob(content_hash(text), text, None, None, "gemini-2.5-flash", "s1", False)
+
+    async def scenario():
+        results = [queue.submit(job(f"page {i}")) for i in range(3)]
+        results.append(queue.submit(job("page 0")))
+        await queue.stop()
+        return results
+
+    assert asyncio.run(scenario()) == ["queued", "queued", "full", "duplicate"]
+
+    async def two_sessions():
+        first = queue.submit(PrefetchJob(content_hash("shared"), "shared", None, None, "gemini-2.5-flash", "s1", False))
+        second = queue.submit(PrefetchJob(content_hash("shared"), "shared", None, None, "gemini-2.5-flash", "s2", False))
+        await queue.stop()
+        return first, second
+
+    # The same page opened in another session still gets indexed there
+    assert asyncio.run(two_sessions()) == ("queued", "queued")
+
+
+def test_prefetch_indexes_session_pages():
+    """With a session ID the page is chunked into the cross-tab index"""
+    async def scenario():
+        submit_prefetch(PAGE, "https://example.com/c", "C", session_id="prefetch-session", summarize=False)
+        await prefetch_queue._queue.join()
+        await prefetch_queue.stop()
+
+    asyncio.run(scenario())
+    assert retrieval_store.get("prefetch-session").pages()[0]["url"] == "https://example.com/c"
+    retrieval_store.clear("prefetch-session")
+
+
+def test_concurrent_identical_queries_share_one_call():
+    """A summarize arriving while the same prompt is generating joins that call"""
+    calls = []
+
+    async def scenario():
+        return await asyncio.gather(*(ai_service.cached_ai_query("same prompt") for _ in range(3)))
+
+    results = _with_stub(calls, scenario, delay=0.05)
+    assert len(calls) == 1
+    assert [response for response, _ in results] == ["summary #1"] * 3
+
+
+def test_higher_priority_caller_does_not_wait_for_prefetch():
+    """A summarize joining a queued prefetch call races its own call instead of waiting"""
+    calls = []
+
+    async def fake_generate(prompt, model=None, context=None, temperature=None, max_tokens=None):
+        request_class = current_priority()[0]
+        calls.append(request_class)
+        # Stands in for a prefetch call stuck behind busy upstream slots
+        await asyncio.sleep(2.0 if request_class == "prefetch" else 0.01)
+        return f"{request_class} answer"
+
+    async def scenario():
+        with priority("prefetch", "prefetch"):
+            background = asyncio.ensure_future(ai_service.cached_ai_query("inverted prompt"))
+        await asyncio.sleep(0)
+        start = time.perf_counter()
+        with priority("bulk", "user"):
+            answer = await ai_service.cached_ai_query("inverted prompt")
+        return answer, await background, time.perf_counter() - start
+
+    original = llm_client.generate
+    llm_client.generate = fake_generate
+    ai_service.response_cache.clear()
+    try:
+        answer, background, seconds = asyncio.run(scenario())
+    finally:
+        llm_client.generate = original
+    assert answer == background == ("bulk answer", False)
+    assert calls == ["prefetch", "bulk"] and seconds < 1.0
+
+
+def test_prefetch_endpoint_accepts():
+    """The endpoint answers 202 immediately; summaries are opt-in"""
+    client = TestClient(app)
+    response = client.post("/api/v1/ai/prefetch", json={
+        "context": {"url": "https://example.com/d", "title": "D", "pageContent": PAGE},
+        "summarize": False,
+    })
+    assert response.status_code == 202
+    assert response.json()["status"] == "skipped"
+
+    default = client.post("/api/v1/ai/prefetch", json={
+        "context": {"url": "https://example.com/d", "title": "D", "pageContent": PAGE},
+    })
+    assert default.status_code == 202 and default.json()["status"] == "skipped"
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("VynceAI Prefetch Tests")
+    print("=" * 60)
+
+    test_prefetch_makes_summarize_instant()
+    test_prefetch_waits_for_interactive_requests()
+    test_only_ai_routes_and_ws_chats_count_as_interactive()
+    test_workers_do_not_inherit_the_first_request()
+    test_queue_is_bounded_and_deduplicated()
+    test_prefetch_indexes_session_pages()
+    test_concurrent_identical_queries_share_one_call()
+    test_higher_priority_caller_does_not_wait_for_prefetch()
+    test_prefetch_endpoint_accepts()
+
+    print("\n✅ All prefetch tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Test script for the sampling profiler
+Tests that worker threads are sampled and the collapsed-stack output format
+"""
+
+import sys
+import os
+import threading
+import time
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.profiler import ProfilerBusy, _profile_lock, render_collapsed, sample_profile
+from main import app
+
+
+def _busy_worker(stop: threading.Event):
+    while not stop.is_set():
+        sum(i * i for i in range(1000))
+
+
+def test_samples_other_threads():
+    """Stacks of worker threads are captured, rooted at the thread name"""
+    stop = threading.Event()
+    worker = threading.Thread(target=_busy_worker, args=(stop,), name="busy-worker")
+    worker.start()
+    try:
+        stacks = sample_profile(0.2, 0.005)
+    finally:
+        stop.set()
+        worker.join()
+
+    worker_stacks = [stack for stack in stacks if stack.startswith("busy-worker;")]
+    print(f"{len(stacks)} unique stacks, {len(worker_stacks)} from busy-worker")
+    assert worker_stacks
+    assert any("_busy_worker (test_profiler.py:" in stack for stack in worker_stacks)
+
+
+def test_render_collapsed_format():
+    """Each line is `stack count`, most frequent first"""
+    text = render_collapsed({"main;a;b": 2, "main;a;c": 5})
+    assert text.splitlines() == ["main;a;c 5", "main;a;b 2"]
+
+
+def test_concurrent_profile_rejected():
+    """Only one profile can run at a time"""
+    with _profile_lock:
+        try:
+            sample_profile(0.01)
+        except ProfilerBusy:
+            pass
+        else:
+            raise AssertionError("Expected ProfilerBusy")
+
+
+def test_profile_endpoint():
+    """The endpoint returns collapsed stacks behind the debug token"""
+    client = TestClient(app)
+    original = settings.DEBUG_TOKEN
+    try:
+        settings.DEBUG_TOKEN = "s3cret"
+        start = time.perf_counter()
+        response = client.get(
+            "/api/v1/debug/profile?seconds=0.1&interval_ms=5",
+            headers={"X-Debug-Token": "s3cret"}
+        )
+        assert response.status_code == 200
+        assert time.perf_counter() - start < 5
+        first_line = response.text.splitlines()[0]
+        assert first_line.rsplit(" ", 1)[1].isdigit()
+    finally:
+        settings.DEBUG_TOKEN = original
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("VynceAI Profiler Tests")
+    print("=" * 60)
+
+    test_samples_other_threads()
+    test_render_collapsed_format()
+    test_concurrent_profile_rejected()
+    test_profile_endpoint()
+
+    print("\n✅ All profiler tests passed!")
+
+
+if __name__ == "__main__":
+    main()
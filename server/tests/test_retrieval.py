@@ -0,0 +1,92 @@
+"""
+Test script for the cross-tab retrieval index
+Tests passage splitting, hashing embeddings and multi-page search
+"""
+
+import sys
+import os
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from app.core.config import settings
+from app.services.retrieval_service import HashingVectorizer, PageIndex, split_passages
+
+PYTHON_PAGE = (
+    "Python is a programming language. It has dynamic typing and garbage collection. "
+    "The Python package index hosts many libraries. "
+) * 10
+RUST_PAGE = (
+    "Rust is a systems language focused on memory safety. The borrow checker prevents data races. "
+    "Cargo is the Rust package manager. "
+) * 10
+COOKING_PAGE = "Preheat the oven. Mix flour, sugar and butter. Bake the cake for forty minutes. " * 10
+
+
+def test_embeddings_are_normalized():
+    """Rows are unit length, empty text stays zero"""
+    vectorizer = HashingVectorizer(settings.RETRIEVAL_FEATURES)
+    matrix = vectorizer.embed(["memory safety in rust", ""])
+    assert matrix.shape == (2, settings.RETRIEVAL_FEATURES)
+    assert abs(float(np.linalg.norm(matrix[0])) - 1.0) < 1e-5
+    assert not matrix[1].any()
+
+
+def test_split_passages_respects_limits():
+    """Passages stay near the target size and are capped in count"""
+    passages = split_passages(PYTHON_PAGE * 20, 200, 5)
+    assert len(passages) == 5
+    assert all(len(p) <= 200 for p in passages)
+
+
+def test_search_covers_every_tab():
+    """Each indexed tab contributes at least its best passage"""
+    index = PageIndex(HashingVectorizer(settings.RETRIEVAL_FEATURES), max_docs=8)
+    index.add("https://python.org", "Python", PYTHON_PAGE)
+    index.add("https://rust-lang.org", "Rust", RUST_PAGE)
+    index.add("https://recipes.example", "Cake", COOKING_PAGE)
+
+    results = index.search("compare the package managers", top_k=4)
+    print(f"Results: {[(r['tab'], r['score']) for r in results]}")
+    assert {r["tab"] for r in results} == {1, 2, 3}
+    assert len(results) == 4
+
+
+def test_search_ranks_relevant_tab_first():
+    """The most relevant passage comes from the matching tab"""
+    index = PageIndex(HashingVectorizer(settings.RETRIEVAL_FEATURES), max_docs=8)
+    index.add("https://python.org", "Python", PYTHON_PAGE)
+    index.add("https://rust-lang.org", "Rust", RUST_PAGE)
+
+    results = index.search("borrow checker data races", top_k=2)
+    best = max(results, key=lambda r: r["score"])
+    assert best["url"] == "https://rust-lang.org"
+
+
+def test_lru_over_documents():
+    """Oldest page is evicted beyond max_docs"""
+    index = PageIndex(HashingVectorizer(settings.RETRIEVAL_FEATURES), max_docs=2)
+    index.add("a", "A", PYTHON_PAGE)
+    index.add("b", "B", RUST_PAGE)
+    index.add("c", "C", COOKING_PAGE)
+    assert [p["url"] for p in index.pages()] == ["b", "c"]
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("VynceAI Cross-Tab Retrieval Tests")
+    print("=" * 60)
+
+    test_embeddings_are_normalized()
+    test_split_passages_respects_limits()
+    test_search_covers_every_tab()
+    test_search_ranks_relevant_tab_first()
+    test_lru_over_documents()
+
+    print("\n✅ All retrieval tests passed!")
+
+
+if __name__ == "__main__":
+    main()
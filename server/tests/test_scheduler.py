@@ -0,0 +1,170 @@
+"""
+Test script for the upstream scheduler
+Tests class weights, per-client fairness, starvation protection,
+cancellation and the request tagging middleware (LLM stubbed)
+"""
+
+import sys
+import os
+import asyncio
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.metrics import SCHEDULER_QUEUE_WAIT
+from app.core.scheduler import FairScheduler, PriorityMiddleware, current_priority, priority, upstream_scheduler
+from app.services.llm_client import llm_client
+
+
+WEIGHTS = {"interactive": 3.0, "prefetch": 1.0}
+
+
+async def _run_order(scheduler: FairScheduler, calls: list) -> list:
+    """Queue calls behind a held slot and return the order they were served in"""
+    order = []
+    gate = asyncio.Event()
+
+    async def call(request_class: str, client: str):
+        async with scheduler.slot(request_class, client):
+            order.append((request_class, client))
+            await asyncio.sleep(0.001)
+
+    async def blocker():
+        async with scheduler.slot("interactive", "blocker"):
+            await gate.wait()
+
+    held = asyncio.create_task(blocker())
+    await asyncio.sleep(0)
+    tasks = []
+    for request_class, client in calls:
+        tasks.append(asyncio.create_task(call(request_class, client)))
+        await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(held, *tasks)
+    return order
+
+
+def test_classes_share_by_weight():
+    """Under contention interactive calls get three slots per prefetch slot"""
+    scheduler = FairScheduler(1, WEIGHTS, max_wait=0)
+    calls = [("prefetch", "p")] * 6 + [("interactive", "i")] * 6
+    order = asyncio.run(_run_order(scheduler, calls))
+    first_eight = [request_class for request_class, _ in order[:8]]
+    assert first_eight.count("interactive") == 6, first_eight
+    assert first_eight.count("prefetch") == 2, first_eight
+
+
+def test_clients_share_within_class():
+    """A client arriving behind a heavy client is not stuck behind all its calls"""
+    scheduler = FairScheduler(1, WEIGHTS, max_wait=0)
+    calls = [("interactive", "heavy")] * 8 + [("interactive", "light")] * 2
+    order = asyncio.run(_run_order(scheduler, calls))
+    light = [i for i, (_, client) in enumerate(order) if client == "light"]
+    assert light == [1, 3], order
+
+
+def test_starvation_protection():
+    """A call waiting past max_wait is served next even with a tiny weight"""
+    scheduler = FairScheduler(1, {"interactive": 1000.0, "prefetch": 0.001}, max_wait=0.01)
+
+    async def scenario():
+        order = []
+
+        async def call(request_class: str, delay: float):
+            async with scheduler.slot(request_class, request_class):
+                order.append(request_class)
+                await asyncio.sleep(delay)
+
+        tasks = [asyncio.create_task(call("interactive", 0.005))]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(call("prefetch", 0)))
+        await asyncio.sleep(0)
+        tasks += [asyncio.create_task(call("interactive", 0.005)) for _ in range(10)]
+        await asyncio.gather(*tasks)
+        return order
+
+    order = asyncio.run(scenario())
+    # Without aging prefetch would run last; the first grant after 10 ms goes to it
+    assert order.index("prefetch") <= 4, order
+
+
+def test_cancelled_waiters_release_their_place():
+    """Callers that give up while queued do not leak slots"""
+    scheduler = FairScheduler(1, WEIGHTS, max_wait=0)
+
+    async def scenario():
+        async def hold():
+            async with scheduler.slot("interactive", "a"):
+                await asyncio.sleep(0.02)
+
+        async def wait_briefly():
+            async with scheduler.slot("prefetch", "b"):
+                pass
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0)
+        try:
+            await asyncio.wait_for(wait_briefly(), 0.005)
+        except asyncio.TimeoutError:
+            pass
+        await holder
+        return scheduler.active, scheduler.waiting
+
+    assert asyncio.run(scenario()) == (0, 0)
+
+
+def test_middleware_and_client_use_slots():
+    """Routes map to classes and LLM calls run inside a scheduler slot"""
+    middleware = PriorityMiddleware(None, {"/api/v1/ai/analyze": "bulk", "/api/v1/ai/analyze/jobs": "batch"})
+    assert middleware.class_for("/api/v1/ai/analyze/jobs") == "batch"
+    assert middleware.class_for("/api/v1/ai/analyze") == "bulk"
+    assert middleware.class_for("/api/v1/ai/chat") == "interactive"
+
+    seen = []
+
+    async def fake_llama(prompt, model=None, context=None, temperature=None, max_tokens=None):
+        seen.append((upstream_scheduler.active, current_priority()))
+        return "ok"
+
+    async def scenario():
+        with priority("bulk", "tester"):
+            return await llm_client.generate("tell me a long story about tea")
+
+    before = SCHEDULER_QUEUE_WAIT.count("bulk")
+    original = llm_client._generate_with_llama
+    llm_client._generate_with_llama = fake_llama
+    try:
+        assert asyncio.run(scenario()) == "ok"
+    finally:
+        llm_client._generate_with_llama = original
+    assert seen == [(1, ("bulk", "tester"))]
+    assert SCHEDULER_QUEUE_WAIT.count("bulk") == before + 1
+    assert upstream_scheduler.active == 0
+
+
+def test_client_id_is_advisory():
+    """X-Client-Id keys fairness only while it is trusted, which is off by default"""
+    scope = {"headers": [(b"x-client-id", b"user-1")], "client": ("10.0.0.5", 5000)}
+    assert PriorityMiddleware(None, {}, trust_client_id=True).client_for(scope) == "user-1"
+    assert PriorityMiddleware(None, {}, trust_client_id=False).client_for(scope) == "10.0.0.5"
+    assert PriorityMiddleware(None, {}).client_for(scope) == "10.0.0.5"
+    assert PriorityMiddleware(None, {}, trust_client_id=True).client_for({"headers": [], "client": None}) == "anonymous"
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("VynceAI Upstream Scheduler Tests")
+    print("=" * 60)
+
+    test_classes_share_by_weight()
+    test_clients_share_within_class()
+    test_starvation_protection()
+    test_cancelled_waiters_release_their_place()
+    test_middleware_and_client_use_slots()
+    test_client_id_is_advisory()
+
+    print("\n✅ All scheduler tests passed!")
+
+
+if __name__ == "__main__":
+    main()
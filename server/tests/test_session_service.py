@@ -0,0 +1,133 @@
+"""
+Test script for server-side conversation sessions
+Tests turn storage, rolling summarization and eviction (no API keys needed)
+"""
+
+import asyncio
+import sys
+import os
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.core.config import settings
+from app.services.ai_service import _build_enhanced_prompt
+from app.services.session_service import SessionStore
+
+
+async def fake_summarizer(summary, turns):
+    """Deterministic summarizer used instead of the LLM"""
+    return (summary + " " + " ".join(t.user for t in turns)).strip()
+
+
+async def failing_summarizer(summary, turns):
+    raise RuntimeError("upstream down")
+
+
+def test_recent_turns_kept_verbatim():
+    """Only SESSION_RECENT_TURNS turns stay verbatim, older ones are folded"""
+    async def run():
+        store = SessionStore(summarizer=fake_summarizer)
+        for i in range(settings.SESSION_RECENT_TURNS + settings.SESSION_SUMMARY_BATCH):
+            store.record_turn("s1", f"q{i}", f"a{i}")
+        await asyncio.gather(*store._tasks)
+        return store.get_history("s1")
+
+    summary, memory = asyncio.run(run())
+    print(f"Summary: {summary}")
+    print(f"Memory: {[m['user'] for m in memory]}")
+    assert len(memory) == settings.SESSION_RECENT_TURNS
+    assert "q0" in summary
+    assert memory[-1]["user"] == f"q{settings.SESSION_RECENT_TURNS + settings.SESSION_SUMMARY_BATCH - 1}"
+
+
+def test_failed_summarizer_folds_locally():
+    """A failing summarizer must not lose older turns"""
+    async def run():
+        store = SessionStore(summarizer=failing_summarizer)
+        for i in range(settings.SESSION_RECENT_TURNS + settings.SESSION_SUMMARY_BATCH):
+            store.record_turn("s1", f"question {i}", f"answer {i}")
+        await asyncio.gather(*store._tasks)
+        return store.get_history("s1")
+
+    summary, _ = asyncio.run(run())
+    print(f"Local summary: {summary}")
+    assert "question 0" in summary
+
+
+def test_batch_being_folded_stays_visible():
+    """Turns handed to the summarizer stay in memory until the summary is stored"""
+    release = asyncio.Event()
+
+    async def slow_summarizer(summary, turns):
+        await release.wait()
+        return await fake_summarizer(summary, turns)
+
+    async def run():
+        store = SessionStore(summarizer=slow_summarizer)
+        for i in range(settings.SESSION_RECENT_TURNS + settings.SESSION_SUMMARY_BATCH):
+            store.record_turn("s1", f"q{i}", f"a{i}")
+        await asyncio.sleep(0)
+        during = store.get_history("s1")
+        release.set()
+        await asyncio.gather(*store._tasks)
+        return during, store.get_history("s1")
+
+    (summary, memory), (after_summary, after_memory) = asyncio.run(run())
+    total = settings.SESSION_RECENT_TURNS + settings.SESSION_SUMMARY_BATCH
+    assert summary == "" and [m["user"] for m in memory] == [f"q{i}" for i in range(total)]
+    assert "q0" in after_summary and len(after_memory) == settings.SESSION_RECENT_TURNS
+
+
+def test_prompt_holds_every_unsummarized_turn_within_budget():
+    """All memory turns reach the prompt, newest first when over the budget"""
+    memory = [{"user": f"question {i}", "bot": f"answer {i}"} for i in range(6)]
+    prompt = _build_enhanced_prompt("next?", memory=memory, summary="Earlier: tea")
+    assert "Earlier: tea" in prompt
+    assert all(f"User: question {i}" in prompt for i in range(6))
+
+    long_turn = "x" * (settings.PROMPT_MEMORY_MAX_CHARS // 2)
+    memory = [{"user": "oldest", "bot": long_turn}, {"user": "older", "bot": long_turn}, {"user": "newest", "bot": "ok"}]
+    prompt = _build_enhanced_prompt("next?", memory=memory)
+    assert "User: newest" in prompt and "User: older" in prompt and "User: oldest" not in prompt
+
+
+def test_capacity_and_idle_eviction():
+    """LRU cap and idle TTL both evict sessions"""
+    store = SessionStore(summarizer=fake_summarizer)
+    for i in range(settings.SESSION_MAX_SESSIONS + 5):
+        store.get_or_create(f"s{i}")
+    assert len(store) == settings.SESSION_MAX_SESSIONS
+    assert store.get("s0") is None
+
+    store.get_or_create("idle").last_access -= settings.SESSION_IDLE_TTL_SECONDS + 1
+    store._sessions.move_to_end("idle", last=False)
+    assert store.get("idle") is None
+    print(f"✓ Sessions after eviction: {len(store)}")
+
+
+def test_turns_are_truncated():
+    """Stored turns respect SESSION_MAX_TURN_CHARS"""
+    store = SessionStore(summarizer=fake_summarizer)
+    store.record_turn("s1", "x" * (settings.SESSION_MAX_TURN_CHARS * 2), "ok")
+    _, memory = store.get_history("s1")
+    assert len(memory[0]["user"]) == settings.SESSION_MAX_TURN_CHARS
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("VynceAI Session Service Tests")
+    print("=" * 60)
+
+    test_recent_turns_kept_verbatim()
+    test_failed_summarizer_folds_locally()
+    test_batch_being_folded_stays_visible()
+    test_prompt_holds_every_unsummarized_turn_within_budget()
+    test_capacity_and_idle_eviction()
+    test_turns_are_truncated()
+
+    print("\n✅ All session tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Test script for the slow request log
+Tests slowest-N retention, window expiry, prompt redaction and the guarded endpoint
+"""
+
+import sys
+import os
+import time
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.core.slowlog import SlowRequestLog, slow_requests
+from app.core.tracing import Trace
+from main import app
+
+
+def _trace(seconds: float, **attrs) -> Trace:
+    trace = Trace("t")
+    trace.start -= seconds
+    trace.add("upstream_gemini", seconds / 2)
+    trace.attrs.update(attrs)
+    return trace
+
+
+def test_keeps_slowest_requests():
+    """Only the N slowest requests are kept, slowest first"""
+    log = SlowRequestLog(size=3, window_seconds=60)
+    for seconds in (0.1, 0.5, 0.2, 0.9, 0.05, 0.3):
+        log.record(_trace(seconds), "/api/v1/ai/chat", "POST", 200)
+
+    durations = [entry["duration_ms"] for entry in log.snapshot()]
+    print(f"Kept: {durations}")
+    assert len(durations) == 3
+    assert durations == sorted(durations, reverse=True)
+    assert durations[-1] >= 300
+
+
+def test_entries_expire_after_window():
+    """Entries older than the window are dropped"""
+    log = SlowRequestLog(size=3, window_seconds=60)
+    log.record(_trace(1.0), "/api/v1/ai/chat", "POST", 200)
+    log.snapshot()[0]["timestamp"] = time.time() - 120
+    assert log.snapshot() == []
+
+
+def test_expiry_follows_arrival_order_and_stays_bounded():
+    """Expired slow entries make room for newer faster ones; buffers stay bounded"""
+    log = SlowRequestLog(size=3, window_seconds=60)
+    for seconds in (0.9, 0.8, 0.7):
+        log.record(_trace(seconds), "/api/v1/ai/chat", "POST", 200)
+    for entry in log.snapshot():
+        entry["timestamp"] = time.time() - 120
+
+    for i in range(50):
+        log.record(_trace(0.01 * (i % 7)), "/api/v1/ai/chat", "POST", 200)
+    durations = [entry["duration_ms"] for entry in log.snapshot()]
+    assert len(log) == 3 and min(durations) >= 50
+    assert len(log._heap) <= 6 and len(log._order) <= 6
+
+
+def test_prompt_text_redacted_by_default():
+    """Prompt text is dropped unless SLOWLOG_CAPTURE_PROMPTS is set"""
+    log = SlowRequestLog(size=3, window_seconds=60)
+    log.record(_trace(0.2, prompt="secret question", prompt_chars=15, provider="gemini"), "/api/v1/ai/chat", "POST", 200)
+
+    entry = log.snapshot()[0]
+    assert "prompt" not in entry
+    assert entry["prompt_chars"] == 15
+    assert entry["provider"] == "gemini"
+    assert entry["stages"][0]["name"] == "upstream_gemini"
+    assert entry["retries"] == 0
+
+
+def test_retries_counted_per_provider():
+    """Concurrent speculative calls are not retries; repeated calls to one provider are"""
+    log = SlowRequestLog(size=3, window_seconds=60)
+    speculative = _trace(0.4)
+    speculative.add("upstream_llama", 0.1)
+    retried = _trace(0.6)
+    retried.add("upstream_gemini", 0.2)
+    log.record(speculative, "/api/v1/ai/chat", "POST", 200)
+    log.record(retried, "/api/v1/ai/chat", "POST", 200)
+    assert [entry["retries"] for entry in log.snapshot()] == [1, 0]
+
+
+def test_debug_endpoint_guard():
+    """The endpoint is hidden without a token and requires a matching header"""
+    client = TestClient(app)
+    original = settings.DEBUG_TOKEN
+    try:
+        settings.DEBUG_TOKEN = ""
+        assert client.get("/api/v1/debug/slow-requests").status_code == 404
+
+        settings.DEBUG_TOKEN = "s3cret"
+        assert client.get("/api/v1/debug/slow-requests").status_code == 403
+
+        slow_requests.clear()
+        client.get("/api/v1/utils/ping")
+        response = client.get("/api/v1/debug/slow-requests", headers={"X-Debug-Token": "s3cret"})
+        assert response.status_code == 200
+        routes = [entry["route"] for entry in response.json()["requests"]]
+        assert "/api/v1/utils/ping" in routes
+    finally:
+        settings.DEBUG_TOKEN = original
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("VynceAI Slow Request Log Tests")
+    print("=" * 60)
+
+    test_keeps_slowest_requests()
+    test_entries_expire_after_window()
+    test_expiry_follows_arrival_order_and_stays_bounded()
+    test_prompt_text_redacted_by_default()
+    test_retries_counted_per_provider()
+    test_debug_endpoint_guard()
+
+    print("\n✅ All slow request log tests passed!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Test script for the offline extractive summarizer
+Tests sentence ranking, the /summarize fallback (LLM stubbed), the preview
+endpoint and the WebSocket summarize frame
+"""
+
+import sys
+import os
+import asyncio
+import time
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.services import ai_service
+from app.services.llm_client import UpstreamError, llm_client
+from app.services.summarizer_service import extractive_summary, split_sentences
+from main import app
+
+
+PAGE = """Solar panels convert sunlight into electricity using photovoltaic cells.
+Cookie settings can be changed at any time from the footer.
+Modern photovoltaic cells convert around twenty percent of sunlight into electricity.
+Installing solar panels on a roof lowers electricity bills for most households.
+Subscribe to our newsletter for weekly deals on garden furniture.
+Solar electricity output depends on panel angle, sunlight hours and cell efficiency.
+Many countries pay households for surplus solar electricity fed into the grid.
+Follow us on social media to see photos from our latest company picnic."""
+
+
+def _request(content: str = PAGE) -> dict:
+    return {"prompt": "Summarize this page", "context": {"url": "https://example.com/solar", "title": "Solar", "pageContent": content}}
+
+
+def test_central_sentences_in_page_order():
+    """On-topic sentences win over boilerplate and keep their page order"""
+    summary = extractive_summary(PAGE, "Solar", max_sentences=3)
+    assert len(summary["sentences"]) == 3
+    assert all("solar" in s.lower() or "photovoltaic" in s.lower() for s in summary["sentences"]), summary
+    positions = [PAGE.index(s) for s in summary["sentences"]]
+    assert positions == sorted(positions)
+    assert summary["response"].startswith("Key points from Solar:")
+
+
+def test_short_pages_and_fragments():
+    """Menu fragments are dropped and short pages are returned whole"""
+    assert split_sentences("Home\nAbout\nThis sentence is long enough to be kept in a summary.") == [
+        "This sentence is long enough to be kept in a summary."]
+    assert extractive_summary("Too short.")["response"] == ""
+
+
+def test_speed():
+    """A 300-sentence page is summarized in tens of milliseconds"""
+    page = " ".join(f"Sentence number {i} talks about topic {i % 17} and detail {i % 5} of the page." for i in range(400))
+    start = time.perf_counter()
+    extractive_summary(page)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    print(f"Extractive summary: {elapsed_ms:.1f} ms")
+    assert elapsed_ms < 500
+
+
+def test_fallback_on_upstream_error():
+    """An LLM error is replaced by the extractive summary"""
+    async def failing_generate(prompt, model=None, context=None, temperature=None, max_tokens=None):
+        return UpstreamError("Error: 429 rate limited")
+
+    original = llm_client.generate
+    llm_client.generate = failing_generate
+    ai_service.response_cache.clear()
+    try:
+        data = TestClient(app).post("/api/v1/ai/summarize", json=_request()).json()
+    finally:
+        llm_client.generate = original
+
+    assert data["source"] == "extractive" and data["fallback"] is True
+    assert data["response"].startswith("Key points from Solar:")
+
+
+def test_answers_that_mention_errors_are_kept():
+    """An answer whose text starts like an error message is still an answer"""
+    async def generate(prompt, model=None, context=None, temperature=None, max_tokens=None):
+        return "Error rates of solar inverters are low; API errors are rare."
+
+    original = llm_client.generate
+    llm_client.generate = generate
+    ai_service.response_cache.clear()
+    try:
+        data = TestClient(app).post("/api/v1/ai/summarize", json=_request()).json()
+    finally:
+        llm_client.generate = original
+
+    assert data["source"] == "llm" and data["fallback"] is False
+    assert data["response"].startswith("Error rates of solar inverters")
+
+
+def test_fallback_on_timeout_fills_cache():
+    """A slow LLM misses the budget, then finishes into the response cache"""
+    async def slow_generate(prompt, model=None, context=None, temperature=None, max_tokens=None):
+        await asyncio.sleep(0.3)
+        return "LLM summary"
+
+    async def scenario():
+        first = await ai_service.summarize_page_content(PAGE, "https://example.com/solar", "Solar")
+        await asyncio.sleep(0.4)
+        second = await ai_service.summarize_page_content(PAGE, "https://example.com/solar", "Solar")
+        return first, second
+
+    original, original_budget = llm_client.generate, settings.SUMMARY_LLM_BUDGET_SECONDS
+    llm_client.generate = slow_generate
+    settings.SUMMARY_LLM_BUDGET_SECONDS = 0.05
+    ai_service.response_cache.clear()
+    try:
+        first, second = asyncio.run(scenario())
+    finally:
+        llm_client.generate, settings.SUMMARY_LLM_BUDGET_SECONDS = original, original_budget
+
+    assert first["source"] == "extractive" and first["fallback_reason"] == "timeout"
+    assert second == {"response": "LLM summary", "cached": True, "source": "llm", "fallback_reason": None}
+
+
+def test_preview_endpoint():
+    """The preview endpoint answers without touching the LLM"""
+    async def unexpected(*args, **kwargs):
+        raise AssertionError("preview must not call the LLM")
+
+    original = llm_client.generate
+    llm_client.generate = unexpected
+    try:
+        data = TestClient(app).post("/api/v1/ai/summarize/preview", json=_request()).json()
+    finally:
+        llm_client.generate = original
+    assert data["source"] == "extractive" and data["sentences"]
+
+
+def test_ws_summarize_sends_preview_first():
+    """The summarize frame sends a preview before the streamed LLM summary"""
+    async def fake_stream(prompt, model=None, context=None, temperature=None, max_tokens=None):
+        yield "LLM "
+        yield "summary"
+
+    original = llm_client.generate_stream
+    llm_client.generate_stream = fake_stream
+    ai_service.response_cache.clear()
+    try:
+        with TestClient(app).websocket_connect("/api/v1/ai/ws") as ws:
+            ws.send_json({"type": "summarize", "id": "s1", **_request()})
+            frames = [ws.receive_json() for _ in range(4)]
+    finally:
+        llm_client.generate_stream = original
+
+    assert [f["type"] for f in frames] == ["preview", "token", "token", "done"]
+    assert frames[0]["response"].startswith("Key points from Solar:")
+    assert frames[-1]["response"] == "LLM summary" and frames[-1]["source"] == "llm"
+
+
+def test_ws_summarize_falls_back_on_a_stream_error():
+    """An error chunk after partial output still swaps in the preview"""
+    async def failing_stream(prompt, model=None, context=None, temperature=None, max_tokens=None):
+        yield "LLM "
+        yield UpstreamError("Gemini API error: stream reset")
+
+    original = llm_client.generate_stream
+    llm_client.generate_stream = failing_stream
+    ai_service.response_cache.clear()
+    try:
+        with TestClient(app).websocket_connect("/api/v1/ai/ws") as ws:
+            ws.send_json({"type": "summarize", "id": "s2", **_request()})
+            frames = [ws.receive_json() for _ in range(4)]
+    finally:
+        llm_client.generate_stream = original
+
+    assert frames[-1]["type"] == "done" and frames[-1]["source"] == "extractive"
+    assert frames[-1]["response"] == frames[0]["response"]
+    assert len(ai_service.response_cache) == 0
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("VynceAI Extractive Summarizer Tests")
+    print("=" * 60)
+
+    test_central_sentences_in_page_order()
+    test_short_pages_and_fragments()
+    test_speed()
+    test_fallback_on_upstream_error()
+    test_answers_that_mention_errors_are_kept()
+    test_fallback_on_timeout_fills_cache()
+    test_preview_endpoint()
+    test_ws_summarize_sends_preview_first()
+    test_ws_summarize_falls_back_on_a_stream_error()
+
+    print("\n✅ All summarizer tests passed!")
+
+
+if __name__ == "__main__":
+    main()
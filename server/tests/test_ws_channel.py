@@ -0,0 +1,97 @@
+"""
+Test script for the WebSocket chat channel
+Tests multiplexed streaming, cancellation acks and timeouts (LLM streaming stubbed)
+"""
+
+import asyncio
+import sys
+import os
+
+# Add the server directory to the path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi.testclient import TestClient
+
+from app.core.config import settings
+from app.services.llm_client import llm_client
+from main import app
+
+
+async def fake_stream(prompt, model=None, context=None, temperature=None, max_tokens=None):
+    """Stream a fixed reply slowly enough to interleave requests"""
+    for chunk in ["Hello", " from", " VynceAI"]:
+        await asyncio.sleep(0.02)
+        yield chunk
+
+
+def _collect(ws, count):
+    return [ws.receive_json() for _ in range(count)]
+
+
+def test_multiplexed_streams():
+    """Two requests on one connection both stream to completion"""
+    original = llm_client.generate_stream
+    llm_client.generate_stream = fake_stream
+    try:
+        with TestClient(app).websocket_connect("/api/v1/ai/ws") as ws:
+            ws.send_json({"type": "chat", "id": "a", "prompt": "hi"})
+            ws.send_json({"type": "chat", "id": "b", "prompt": "hello"})
+            frames = _collect(ws, 8)
+    finally:
+        llm_client.generate_stream = original
+
+    done = {f["id"]: f for f in frames if f["type"] == "done"}
+    print(f"Done frames: {list(done)}")
+    assert set(done) == {"a", "b"}
+    assert done["a"]["response"] == "Hello from VynceAI"
+
+
+def test_cancel_ack():
+    """Cancelling an in-flight request is acknowledged"""
+    original = llm_client.generate_stream
+    llm_client.generate_stream = fake_stream
+    try:
+        with TestClient(app).websocket_connect("/api/v1/ai/ws") as ws:
+            ws.send_json({"type": "chat", "id": "a", "prompt": "hi"})
+            ws.send_json({"type": "cancel", "id": "a"})
+            ws.send_json({"type": "cancel", "id": "missing"})
+            ws.send_json({"type": "ping"})
+            frames = _collect(ws, 3)
+    finally:
+        llm_client.generate_stream = original
+
+    print(f"Frames: {frames}")
+    assert {"type": "cancelled", "id": "a", "reason": "client"} in frames
+    assert {"type": "cancelled", "id": "missing", "reason": "unknown_id"} in frames
+
+
+def test_server_timeout_cancels():
+    """Requests exceeding WS_REQUEST_TIMEOUT_SECONDS are cancelled by the server"""
+    original_stream, original_timeout = llm_client.generate_stream, settings.WS_REQUEST_TIMEOUT_SECONDS
+    llm_client.generate_stream = fake_stream
+    settings.WS_REQUEST_TIMEOUT_SECONDS = 0.01
+    try:
+        with TestClient(app).websocket_connect("/api/v1/ai/ws") as ws:
+            ws.send_json({"type": "chat", "id": "slow", "prompt": "hi"})
+            frame = ws.receive_json()
+    finally:
+        llm_client.generate_stream = original_stream
+        settings.WS_REQUEST_TIMEOUT_SECONDS = original_timeout
+
+    assert frame == {"type": "cancelled", "id": "slow", "reason": "timeout"}
+
+
+def main():
+    print("\n" + "=" * 60)
+    print("VynceAI WebSocket Channel Tests")
+    print("=" * 60)
+
+    test_multiplexed_streams()
+    test_cancel_ack()
+    test_server_timeout_cancels()
+
+    print("\n✅ All WebSocket channel tests passed!")
+
+
+if __name__ == "__main__":
+    main()